@@ -1,9 +1,10 @@
 from Player import Player
+from Card import SEVEN, rankOf
+from Rules import BOMB_SIZE, SPECIAL_RANKS, playableRankMask
+from EndgameSolver import EndgameSolver, PICK_UP
+from InformationSetMCTS import InformationSetMCTS
 import random
 
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-VALUES = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-
 class AIPlayer(Player):
     '''
     Initializes the AIPlayer class, sets up the difficulty level, and inherits 
@@ -12,24 +13,25 @@ class AIPlayer(Player):
     @param self - The instance of the AIPlayer class
     @param name (str) - The name of the AI player
     @param difficulty (str) - The difficulty level of the AI player
+    @param rng (Random) - Optional random source, seeded by simulations for reproducible runs
+    @param solver (EndgameSolver) - Optional endgame solver for impossible mode, a time-limited one by default
+    @param searcher (InformationSetMCTS) - Optional tree search for impossible mode, a time-limited one by default
 
     @return None
 
     @author Mike
     '''
-    def __init__(self, name, difficulty='medium', is_next_player_ai=False):
+    def __init__(self, name, difficulty='medium', rng=None, solver=None, searcher=None):
         super().__init__(name)
         self.difficulty = difficulty
-        self.is_next_player_ai = is_next_player_ai
+        self.rng = rng if rng is not None else random.Random()
+        if solver is None and difficulty == 'impossible':
+            solver = EndgameSolver()
+        self.solver = solver
+        if searcher is None and difficulty == 'impossible':
+            searcher = InformationSetMCTS()
+        self.searcher = searcher
 
-    def isCardPlayable(self, card, pile):
-        if not pile:
-            return True
-        topCard = pile[-1]
-        if self.sevenSwitch:
-            return VALUES[card[0]] <= 7 or card[0] in ['2', '10']
-        return card[0] == '2' or card[0] == '10' or VALUES[card[0]] >= VALUES[topCard[0]]
-    
     '''
     Determines the AI player's move based on the difficulty level and the 
     state of the game.
@@ -38,12 +40,16 @@ class AIPlayer(Player):
     @param pile (list) - The pile to play cards onto
     @param deckSize (int) - The number of cards remaining in the deck
     @param playerTopCards (list) - The top cards of the player
+    @param pileRun (int) - How many cards of the top rank are in a row on top of the pile
+    @param numPlayers (int) - The number of players in the game
+    @param engine (GameEngine) - The game being played, for the impossible AI's tree search
 
     @return (list) - The cards to play or -1 if the AI should pick up the pile
 
     @author Mike
     '''
-    def playTurn(self, pile, deckSize, playerTopCards, playerHand=None, playerBottomCards=None):
+    def playTurn(self, pile, deckSize, playerTopCards, playerHand=None, playerBottomCards=None, pileRun=0,
+                 numPlayers=2, engine=None):
         if self.difficulty == 'easy':
             return self.playEasy(pile)
         elif self.difficulty == 'medium':
@@ -51,7 +57,8 @@ class AIPlayer(Player):
         elif self.difficulty == 'hard':
             return self.playHard(pile, deckSize, playerTopCards)
         elif self.difficulty == 'impossible':
-            return self.playImpossible(pile, deckSize, playerHand, playerTopCards, playerBottomCards)
+            return self.playImpossible(pile, deckSize, playerHand, playerTopCards, playerBottomCards, pileRun,
+                                       numPlayers, engine)
     
     '''
     Determines the AI player's move in easy mode by playing the lowest ranked 
@@ -65,24 +72,18 @@ class AIPlayer(Player):
     @author Mike
     '''
     def playEasy(self, pile):
-        if not pile:
-            nonSpecialCards = [card for card in self.hand if card[0] not in ['2', '10']]
-            if nonSpecialCards:
-                return [min(nonSpecialCards, key=lambda card: VALUES[card[0]])]
-            return [min(self.hand, key=lambda card: VALUES[card[0]])]
+        if self.isBlind():
+            return [self.rng.choice(self.bottomCards)]
 
-        if all(card[3] for card in self.hand):
-            return [random.choice(self.hand)]
-
-        validCards = [card for card in self.hand if self.isCardPlayable(card, pile)]
-        if not validCards:
+        ranks = self.activeRanks()
+        validMask = ranks.mask & playableRankMask(self.sevenSwitch, pile)
+        if not validMask:
             return -1
 
-        nonSpecialCards = [card for card in validCards if card[0] not in ['2', '10']]
-        if nonSpecialCards:
-            return [min(nonSpecialCards, key=lambda card: VALUES[card[0]])]
-
-        return [min(validCards, key=lambda card: VALUES[card[0]])]
+        rank = ranks.lowestRank(validMask & ~SPECIAL_RANKS)
+        if rank < 0:
+            rank = ranks.lowestRank(validMask)
+        return ranks.cardsOfRank(rank)[:1]
 
     '''
     Determines the AI player's move in medium mode by playing the most 
@@ -98,33 +99,29 @@ class AIPlayer(Player):
     @author Mike
     '''
     def playMedium(self, pile, deckSize, playerTopCards):
-        if not pile:
-            nonSpecialCards = [card for card in self.hand if card[0] not in ['2', '10']]
-            if nonSpecialCards:
-                return [min(nonSpecialCards, key=lambda card: VALUES[card[0]])]
-            return [min(self.hand, key=lambda card: VALUES[card[0]])]
-
-        if all(card[3] for card in self.hand):
-            return [random.choice(self.hand)]
+        if self.isBlind():
+            return [self.rng.choice(self.bottomCards)]
 
-        validCards = [card for card in self.hand if self.isCardPlayable(card, pile)]
-        if not validCards:
+        ranks = self.activeRanks()
+        validMask = ranks.mask & playableRankMask(self.sevenSwitch, pile)
+        if not validMask:
             return -1
 
-        nonSpecialCards = [card for card in validCards if card[0] not in ['2', '10']]
-        if nonSpecialCards:
-            validCards = nonSpecialCards
+        if not pile:
+            rank = ranks.lowestRank(validMask & ~SPECIAL_RANKS)
+            return ranks.cardsOfRank(rank if rank >= 0 else ranks.lowestRank(validMask))[:1]
 
-        validCards.sort(key=lambda card: VALUES[card[0]])
+        if validMask & ~SPECIAL_RANKS:
+            validMask &= ~SPECIAL_RANKS
 
-        sevens = [card for card in validCards if card[0] == '7']
-        if sevens:
-            return sevens
+        if validMask >> SEVEN & 1:
+            return ranks.cardsOfRank(SEVEN)
 
-        if len(validCards) > 1 and validCards[0][0] == validCards[1][0]:
-            return [card for card in validCards if card[0] == validCards[0][0]]
+        rank = ranks.lowestRank(validMask)
+        if ranks.count(rank) > 1:
+            return ranks.cardsOfRank(rank)
 
-        return [validCards[0]]
+        return ranks.cardsOfRank(rank)[:1]
 
     '''
     Determines the AI player's move in hard mode by playing the most strategic 
@@ -141,95 +138,72 @@ class AIPlayer(Player):
     @author Mike
     '''
     def playHard(self, pile, deckSize, playerTopCards):
-        if not pile:
-            nonSpecialCards = [card for card in self.hand if card[0] not in ['2', '10']]
-            if nonSpecialCards:
-                return [min(nonSpecialCards, key=lambda card: VALUES[card[0]])]
-            return [min(self.hand, key=lambda card: VALUES[card[0]])]
-
-        if all(card[3] for card in self.hand):
-            return [random.choice(self.hand)]
-
-        validCards = [card for card in self.hand if self.isCardPlayable(card, pile)]
-        if not validCards:
-            return -1
-
-        nonSpecialCards = [card for card in validCards if card[0] not in ['2', '10']]
-        if nonSpecialCards:
-            validCards = nonSpecialCards
-
-        validCards.sort(key=lambda card: VALUES[card[0]])
-
-        sevens = [card for card in validCards if card[0] == '7']
-        if sevens:
-            return sevens
-
-        if len(validCards) > 1 and validCards[0][0] == validCards[1][0]:
-            return [card for card in validCards if card[0] == validCards[0][0]]
-
-        return [validCards[0]]
+        return self.playMedium(pile, deckSize, playerTopCards)
 
     '''
     Determines the AI player's move in impossible mode by always playing the 
-    most optimal card to maximize winning chances.
+    most optimal card to maximize winning chances. Once the deck is empty in
+    a 2-player game it hands the choice to the EndgameSolver. Otherwise it
+    searches with InformationSetMCTS when it has one and is given the
+    engine, and it falls back to the heuristic if neither has an answer.
+
+    The heuristic finishes a bomb when it holds enough of the top rank,
+    and otherwise plays the lowest non-special rank above the top of the
+    pile, then one equal to it, then a 2 or a 10. Before zones were indexed
+    by rank it played the first such card in hand order, which depended on
+    the order the cards were dealt in.
 
     @param self - The instance of the AIPlayer class
     @param pile (list) - The pile to play cards onto
     @param deckSize (int) - The number of cards remaining in the deck
     @param playerTopCards (list) - The top cards of the player
+    @param pileRun (int) - How many cards of the top rank are in a row on top of the pile
+    @param numPlayers (int) - The number of players in the game
+    @param engine (GameEngine) - The game being played, None to skip the tree search
 
     @return (list) - The card to play or -1 if the AI should pick up the pile
 
     @author Mike
     '''
-    def playImpossible(self, pile, deckSize, playerHand, playerTopCards, playerBottomCards):
-        if not pile:
-            nonSpecialCards = [card for card in self.hand if card[0] not in ['2', '10']]
-            if nonSpecialCards:
-                return [min(nonSpecialCards, key=lambda card: VALUES[card[0]])]
-            return [min(self.hand, key=lambda card: VALUES[card[0]])]
+    def playImpossible(self, pile, deckSize, playerHand, playerTopCards, playerBottomCards, pileRun=0,
+                       numPlayers=2, engine=None):
+        if self.isBlind():
+            return [self.rng.choice(self.bottomCards)]
 
-        if all(card[3] for card in self.hand):
-            return [random.choice(self.hand)]
-
-        validCards = [card for card in self.hand if self.isCardPlayable(card, pile)]
-        if not validCards:
+        ranks = self.activeRanks()
+        validMask = ranks.mask & playableRankMask(self.sevenSwitch, pile)
+        if not validMask:
             return -1
 
-        validNonSpecialCards = [card for card in validCards if card[0] not in ['2', '10']]
-        if validNonSpecialCards:
-            highCards = [card for card in validNonSpecialCards if VALUES[card[0]] > VALUES[pile[-1][0]]]
-            if highCards:
-                return [highCards[0]]
-
-        lowNonSpecialCards = [card for card in validCards if card[0] not in ['2', '10']]
-        if lowNonSpecialCards:
-            return [lowNonSpecialCards[0]]
-
-        if self.is_next_player_ai:
-            return [min(validCards, key=lambda card: VALUES[card[0]])]
-
-        return [validCards[0]]
-
-    '''
-    Checks if a card is playable based on the top card of the pile and the 
-    sevenSwitch flag.
+        move = None
+        if self.solver is not None and not deckSize and numPlayers == 2 and playerHand is not None:
+            move = self.solver.chooseMove(self.hand, self.topCards, self.bottomCards, playerHand, playerTopCards,
+                                          playerBottomCards, pile, self.sevenSwitch)
+        if move is None and self.searcher is not None and engine is not None:
+            move = self.searcher.chooseMove(engine)
+        if move == PICK_UP:
+            return -1
+        if move is not None:
+            rank, count = move
+            return ranks.cardsOfRank(rank)[:count]
 
-    @param self - The instance of the AIPlayer class
-    @param card (tuple) - The card to check
-    @param pile (list) - The current pile of cards
+        if not pile:
+            rank = ranks.lowestRank(validMask & ~SPECIAL_RANKS)
+            return ranks.cardsOfRank(rank if rank >= 0 else ranks.lowestRank(validMask))[:1]
 
-    @return (bool) - True if the card is playable, False otherwise
+        # Finish a bomb if enough of the top rank is held to clear the pile and go again
+        topRank = rankOf(pile[-1])
+        nonSpecialMask = validMask & ~SPECIAL_RANKS
+        if nonSpecialMask >> topRank & 1 and ranks.count(topRank) >= BOMB_SIZE - pileRun:
+            return ranks.cardsOfRank(topRank)
 
-    @author Mike
-    '''
-    def isCardPlayable(self, card, pile):
-        topCard = pile[-1] if pile else None
-        if self.sevenSwitch:
-            return VALUES[card[0]] <= 7 or card[0] in ['2', '10']
-        if not topCard:
-            return True
-        return card[0] == '2' or card[0] == '10' or VALUES[card[0]] >= VALUES[topCard[0]]
+        # Prefer a non-special card above the top of the pile, then one equal to it
+        rank = ranks.lowestRank(nonSpecialMask & -2 << topRank)
+        if rank < 0:
+            rank = ranks.lowestRank(nonSpecialMask)
+        if rank < 0:
+            rank = ranks.lowestRank(validMask)
+        return ranks.cardsOfRank(rank)[:1]
 
     '''
     AI player selects the top three cards to place face-up.
@@ -241,7 +215,4 @@ class AIPlayer(Player):
     @author Mike
     '''
     def chooseTopCards(self):
-        sortedHand = sorted(self.hand, key=lambda card: VALUES[card[0]])
-        for card in sortedHand[:3]:
-            self.topCards.append((card[0], card[1], True, False))
-        self.hand = sortedHand[3:]
\ No newline at end of file
+        self.moveToTopCards(sorted(self.hand)[:3])
\ No newline at end of file
@@ -0,0 +1,115 @@
+from PySide6.QtCore import QObject, QRunnable, Signal
+from AIPlayer import AIPlayer
+
+class AIMoveSignals(QObject):
+    '''
+    Carries a finished AI move from a worker thread back to the GUI thread.
+    It is created on the GUI thread, so queued connections to it are run by
+    the GUI event loop. moveReady sends the turn token the move was asked
+    for and the move, or the exception raised while choosing it. batchDone
+    sends the token of a fast-forward batch and the moves it chose, or the
+    exception raised while choosing them.
+
+    @author Mike
+    '''
+    moveReady = Signal(int, object)
+    batchDone = Signal(int, object)
+
+class AIMoveTask(QRunnable):
+    '''
+    Initializes the AIMoveTask class, which asks the current AI player for
+    its move on a QThreadPool thread so a slow search never blocks the
+    window. The move is chosen on a snapshot of the game, so a task that
+    is still thinking after fast forward starts never reads the real
+    engine while it changes; the move is applied on the GUI thread once it
+    is sent back.
+
+    @param self - The instance of the AIMoveTask class
+    @param engine (GameEngine) - A snapshot of the game, with an AI player to move, owned by the task
+    @param token (int) - Identifies the request, so a stale move can be ignored
+    @param signals (AIMoveSignals) - Where to send the move
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, engine, token, signals):
+        super().__init__()
+        self.engine = engine
+        self.token = token
+        self.signals = signals
+
+    '''
+    Chooses the move and sends it back. An exception is sent back in place
+    of the move so it can be raised on the GUI thread instead of being lost.
+
+    @param self - The instance of the AIMoveTask class
+
+    @return None
+
+    @author Mike
+    '''
+    def run(self):
+        try:
+            move = self.engine.chooseAIMove()
+        except Exception as error:
+            move = error
+        self.signals.moveReady.emit(self.token, move)
+
+class FastForwardTask(QRunnable):
+    '''
+    Initializes the FastForwardTask class, which works out a batch of AI
+    turns on a QThreadPool thread, with no pacing and no rendering. The
+    batch is played on a snapshot of the game, so the real engine is only
+    changed on the GUI thread, which applies the moves once they are sent
+    back. The batch ends after maxTurns turns, when the game is over, when
+    a human seat with no stand-in is to move, or as soon as stop is set, so
+    the human can take control back between any two moves.
+
+    @param self - The instance of the FastForwardTask class
+    @param engine (GameEngine) - A snapshot of the game, owned by the task
+    @param token (int) - Identifies the request, so a stale batch can be ignored
+    @param signals (AIMoveSignals) - Where to send the moves
+    @param maxTurns (int) - The most turns to play before sending the table back to be drawn
+    @param stop (Event) - Set to end the batch after the current move
+    @param standIn (AIPlayer) - Optional AI to play the human seats
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, engine, token, signals, maxTurns, stop, standIn=None):
+        super().__init__()
+        self.engine = engine
+        self.token = token
+        self.signals = signals
+        self.maxTurns = maxTurns
+        self.stop = stop
+        self.standIn = standIn
+
+    '''
+    Plays the batch on the snapshot and sends back the moves in the order
+    they were made, or the exception raised while choosing them.
+
+    @param self - The instance of the FastForwardTask class
+
+    @return None
+
+    @author Mike
+    '''
+    def run(self):
+        moves = []
+        try:
+            while len(moves) < self.maxTurns and not self.stop.is_set() and not self.engine.isTerminal():
+                if isinstance(self.engine.players[self.engine.currentPlayerIndex], AIPlayer):
+                    move = self.engine.chooseAIMove()
+                elif self.standIn is not None:
+                    move = self.engine.chooseAIMove(self.standIn)
+                else:
+                    break
+                self.engine.apply(move)
+                moves.append(move)
+            outcome = moves
+        except Exception as error:
+            outcome = error
+        self.signals.batchDone.emit(self.token, outcome)
@@ -0,0 +1,147 @@
+'''
+Resolves every image and icon the game loads through one lookup, so no
+module builds its own path to _internal/palaceData.
+
+Paths are resolved against the install directory instead of the working
+directory, with forward slashes, which Qt accepts on every platform. When
+a compiled resource bundle (palace.rcc) is present next to the assets, it
+is registered with Qt, which memory-maps it, and every asset is read from
+the bundle instead of being opened as a separate file. The bundle can be
+built ahead of time, for example before packaging:
+
+    python Assets.py
+
+Files the game generates and can rebuild, such as the card atlas and the
+stylesheet cache, live in the user's cache directory and are resolved with
+cachePath, so they never land in the install directory or a source
+checkout.
+'''
+import argparse
+import os
+import subprocess
+import sys
+from PySide6.QtCore import QDir, QFile, QResource, QStandardPaths
+from Card import DECK_SIZE, cardImageName
+
+if getattr(sys, 'frozen', False):
+    BASE_DIRECTORY = os.path.dirname(sys.executable)
+else:
+    BASE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DATA_DIRECTORY = QDir.fromNativeSeparators(os.path.join(BASE_DIRECTORY, "_internal", "palaceData"))
+BUNDLE_PATH = f"{DATA_DIRECTORY}/palace.rcc"
+RESOURCE_ROOT = ":/palaceData"
+ICON = "palace.ico"
+BACKGROUND = "background.png"
+CARD_DIRECTORY = "cards"
+CACHE_NAME = "Palace"  # The game's folder in the user's cache directory
+
+bundleRegistered = False
+
+'''
+Registers the resource bundle if there is one, so assets are read from it.
+
+@param bundlePath (str) - Where the compiled bundle is kept
+
+@return (bool) - True if assets are read from the bundle, False if from the data directory
+
+@author Mike
+'''
+def registerBundle(bundlePath=BUNDLE_PATH):
+    global bundleRegistered
+    if not bundleRegistered and os.path.isfile(bundlePath):
+        bundleRegistered = QResource.registerResource(bundlePath)
+    return bundleRegistered
+
+'''
+Gets the path Qt loads an asset from, in the bundle if it is registered.
+
+@param name (str) - The asset, relative to the data directory with forward slashes, e.g. "cards/back.png"
+
+@return (str) - The path to give QPixmap, QImage, QIcon or QFile
+
+@author Mike
+'''
+def assetPath(name):
+    return f"{RESOURCE_ROOT if bundleRegistered else DATA_DIRECTORY}/{name}"
+
+'''
+Gets the path of a file the game generates and can rebuild at any time.
+It lives in the user's cache directory, which is created if needed, or in
+the data directory on a system without one.
+
+@param name (str) - The file, relative to the game's cache directory
+
+@return (str) - The path
+
+@author Mike
+'''
+def cachePath(name):
+    directory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    directory = f"{QDir.fromNativeSeparators(directory)}/{CACHE_NAME}" if directory else DATA_DIRECTORY
+    QDir().mkpath(directory)
+    return f"{directory}/{name}"
+
+'''
+Lists every asset the game needs to run.
+
+@return (list) - The assets, relative to the data directory
+
+@author Mike
+'''
+def requiredAssets():
+    cards = [cardImageName(card) for card in range(DECK_SIZE)] + ["back"]
+    return [ICON, BACKGROUND] + [f"{CARD_DIRECTORY}/{name}.png" for name in cards]
+
+'''
+Checks that every required asset can be found, so a broken install fails
+at startup instead of drawing blank cards during a game.
+
+@return None
+
+@raises FileNotFoundError - If any asset is missing, listing all of them
+
+@author Mike
+'''
+def verifyAssets():
+    missing = [name for name in requiredAssets() if not QFile.exists(assetPath(name))]
+    if missing:
+        source = RESOURCE_ROOT if bundleRegistered else DATA_DIRECTORY
+        raise FileNotFoundError(f"{len(missing)} asset(s) missing from {source}: {', '.join(missing)}")
+
+'''
+Writes a .qrc listing every required asset and compiles it into a binary
+resource bundle with pyside6-rcc.
+
+@param bundlePath (str) - Where to write the bundle
+
+@return None
+
+@author Mike
+'''
+def buildBundle(bundlePath=BUNDLE_PATH):
+    qrcPath = f"{DATA_DIRECTORY}/palace.qrc"
+    files = "\n".join(f"        <file>{name}</file>" for name in requiredAssets())
+    with open(qrcPath, "w") as qrcFile:
+        qrcFile.write(f'<RCC>\n    <qresource prefix="/palaceData">\n{files}\n    </qresource>\n</RCC>\n')
+    try:
+        subprocess.run(["pyside6-rcc", "--binary", qrcPath, "-o", bundlePath], check=True)
+    finally:
+        os.remove(qrcPath)
+
+'''
+Parses the command line and builds the resource bundle.
+
+@return None
+
+@author Mike
+'''
+def main():
+    parser = argparse.ArgumentParser(description="Compile the game's assets into one Qt resource bundle.")
+    parser.add_argument("-o", "--output", default=BUNDLE_PATH, help="where to write the bundle")
+    args = parser.parse_args()
+    verifyAssets()
+    buildBundle(args.output)
+    print(f"Bundled {len(requiredAssets())} assets into {args.output}")
+
+if __name__ == '__main__':
+    main()
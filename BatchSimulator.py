@@ -0,0 +1,492 @@
+'''
+NumPy lockstep batch simulator for policy evaluation sweeps.
+
+Holds K games as arrays (deck order, per-player rank histograms, pile top
+rank and run length, sevenSwitch flags and zone counts) and steps every
+unfinished game one turn at a time with array operations. The AI policies
+only ever look at ranks, so rank histograms are enough to replay them
+exactly; suits never change the outcome of a game.
+
+Games are seeded and dealt exactly like Simulator.createGame, so for the
+same seed, game number and seat rotation the batch results match GameEngine
+turn for turn. The only per-game Python work is the deck shuffle and the
+blind bottom-card choice, which draws from the same per-player rng stream
+the AIPlayer would use.
+
+Heuristic policies sometimes lock into a stalemate that runs to the turn
+limit. The arrays are the whole game state and no rng is drawn unless a
+bottom card is played, so once a game's state repeats it will loop forever;
+such games are fast-forwarded by whole cycles to the turn limit (Brent's
+cycle detection on a snapshot taken at power-of-two turn counts) instead of
+being stepped ten thousand times. Use --check to replay a sample of games on the scalar engine and compare.
+
+    python BatchSimulator.py easy medium -n 100000
+    python BatchSimulator.py easy impossible -n 20000 --batch 8192 --check 500
+'''
+import argparse
+import random
+import time
+import numpy as np
+from Card import NUM_RANKS, DECK_SIZE, TWO, SEVEN, TEN
+from Rules import BOMB_SIZE, PLAYABLE, EMPTY_PILE
+from Simulator import DIFFICULTIES, SimulationStats, gameSeeds, playGame, printReport, seatOrderFor
+
+POLICY_CODES = {'easy': 0, 'medium': 1, 'hard': 1, 'impossible': 2}  # playHard is playMedium
+PLAYABLE_TABLE = np.array(PLAYABLE, dtype=bool)  # [sevenSwitch][topRank][cardRank]
+RANK_RANGE = np.arange(NUM_RANKS)
+SPECIAL = np.zeros(NUM_RANKS, dtype=bool)
+SPECIAL[[TWO, TEN]] = True
+CYCLE_CHECK_TURNS = 128  # Games older than this are checked for repeated states
+
+'''
+Gets the lowest set rank in each row of a boolean rank matrix.
+
+@param ranks (ndarray) - A [games, 13] boolean matrix
+
+@return (ndarray) - The lowest set rank of each row, or -1 for an empty row
+
+@author Mike
+'''
+def lowestRank(ranks):
+    return np.where(ranks.any(1), ranks.argmax(1), -1)
+
+class BatchSimulator:
+    '''
+    Initializes the BatchSimulator class and deals K games into arrays.
+
+    @param self - The instance of the BatchSimulator class
+    @param difficulties (list) - The difficulty of each configured seat
+    @param seed (int) - The base seed of the run
+    @param gameIndices (range) - The numbers of the games to deal
+    @param rotate (bool) - Whether to rotate which seat moves first
+    @param maxTurns (int) - Turn limit after which a game counts as unfinished
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, difficulties, seed, gameIndices, rotate=True, maxTurns=10000):
+        numGames = len(gameIndices)
+        numPlayers = len(difficulties)
+        self.numPlayers = numPlayers
+        self.maxTurns = maxTurns
+        self.hand = np.zeros((numGames, numPlayers, NUM_RANKS), dtype=np.int16)
+        self.top = np.zeros((numGames, numPlayers, NUM_RANKS), dtype=np.int16)
+        self.bottom = np.zeros((numGames, numPlayers, 3), dtype=np.int8)  # Ranks in dealt order, then play order
+        self.bottomCount = np.zeros((numGames, numPlayers), dtype=np.int8)
+        self.handSize = np.zeros((numGames, numPlayers), dtype=np.int16)
+        self.topSize = np.zeros((numGames, numPlayers), dtype=np.int16)
+        self.deck = np.zeros((numGames, DECK_SIZE), dtype=np.int8)  # Ranks in draw order
+        self.deckPos = np.zeros(numGames, dtype=np.int16)
+        self.deckEnd = np.zeros(numGames, dtype=np.int16)
+        self.pile = np.zeros((numGames, NUM_RANKS), dtype=np.int16)
+        self.pileTop = np.full(numGames, EMPTY_PILE, dtype=np.int8)
+        self.pileRun = np.zeros(numGames, dtype=np.int16)
+        self.pileSize = np.zeros(numGames, dtype=np.int16)
+        self.sevenSwitch = np.zeros((numGames, numPlayers), dtype=bool)
+        self.policy = np.zeros((numGames, numPlayers), dtype=np.int8)
+        self.seatOrder = np.zeros((numGames, numPlayers), dtype=np.int8)
+        self.current = np.zeros(numGames, dtype=np.int8)
+        self.winner = np.full(numGames, -1, dtype=np.int8)
+        self.turns = np.zeros(numGames, dtype=np.int32)
+        self.pickUps = np.zeros((numGames, numPlayers), dtype=np.int32)
+        self.bombs = np.zeros((numGames, numPlayers), dtype=np.int32)
+        self.snapTurn = np.zeros(numGames, dtype=np.int32)
+        self.snapState = None
+        self.snapPickUps = np.zeros((numGames, numPlayers), dtype=np.int32)
+        self.snapBombs = np.zeros((numGames, numPlayers), dtype=np.int32)
+        self.playerSeeds = []
+
+        cards = np.empty((numGames, DECK_SIZE), dtype=np.int8)
+        for game, gameIndex in enumerate(gameIndices):
+            self.seatOrder[game] = seatOrderFor(gameIndex, numPlayers, rotate)
+            playerSeeds, deckSeed = gameSeeds(seed, gameIndex, numPlayers)
+            self.playerSeeds.append(playerSeeds)
+            deck = list(range(DECK_SIZE))  # GameEngine.setupGame
+            random.Random(deckSeed).shuffle(deck)
+            cards[game] = deck
+        self.policy[:] = np.array([POLICY_CODES[difficulty] for difficulty in difficulties])[self.seatOrder]
+
+        # GameEngine.dealInitialCards gives each player 3 bottom cards then a 6 card
+        # hand, and AIPlayer.chooseTopCards puts the 3 lowest cards of the hand face up
+        dealt = cards[:, :9 * numPlayers].reshape(numGames, numPlayers, 9) >> 2
+        handRanks = np.sort(dealt[:, :, 3:], axis=2)
+        self.bottom[:] = dealt[:, :, :3]
+        self.bottomCount[:] = 3
+        self.handSize[:] = 3
+        self.topSize[:] = 3
+        self.top[:] = (handRanks[:, :, :3, None] == RANK_RANGE).sum(2)
+        self.hand[:] = (handRanks[:, :, 3:, None] == RANK_RANGE).sum(2)
+        self.deckEnd[:] = DECK_SIZE - 9 * numPlayers
+        self.deck[:, :DECK_SIZE - 9 * numPlayers] = cards[:, 9 * numPlayers:] >> 2
+
+    '''
+    Plays every game to the end.
+
+    @param self - The instance of the BatchSimulator class
+
+    @return None
+
+    @author Mike
+    '''
+    def run(self):
+        while self.step():
+            pass
+
+    '''
+    Plays one turn in every unfinished game.
+
+    @param self - The instance of the BatchSimulator class
+
+    @return (bool) - False once every game has finished
+
+    @author Mike
+    '''
+    def step(self):
+        games = np.flatnonzero((self.winner < 0) & (self.turns < self.maxTurns))
+        if not games.size:
+            return False
+        players = self.current[games].astype(np.intp)
+        self.turns[games] += 1
+
+        handSize = self.handSize[games, players]
+        handEmpty = handSize == 0
+        blind = handEmpty & (self.topSize[games, players] == 0)
+        zone = self.hand[games, players]
+        zone[handEmpty] = self.top[games[handEmpty], players[handEmpty]]
+        sevenSwitch = self.sevenSwitch[games, players]
+        pileTop = self.pileTop[games].astype(np.intp)
+        valid = (zone > 0) & PLAYABLE_TABLE[sevenSwitch.astype(np.intp), pileTop]
+        rank, count = self.choosePlays(zone, valid, pileTop, self.pileRun[games], self.policy[games, players])
+
+        # Bottom cards are chosen blind with each AI's own rng, as in AIPlayer
+        blindFailed = np.zeros(games.size, dtype=bool)
+        blindIndex = np.flatnonzero(blind)
+        blindGames, blindPlayers = games[blindIndex], players[blindIndex]
+        bottomCount = self.bottomCount[blindGames, blindPlayers]
+        first = bottomCount == 3
+        if first.any():
+            self.orderBottomCards(blindGames[first], blindPlayers[first])
+        blindRank = self.bottom[blindGames, blindPlayers, 3 - bottomCount]
+        self.bottomCount[blindGames, blindPlayers] -= 1
+        rank[blindIndex] = blindRank
+        count[blindIndex] = 1
+        blindFailed[blindIndex] = ~PLAYABLE_TABLE[sevenSwitch[blindIndex].astype(np.intp), pileTop[blindIndex], blindRank]
+
+        pickUp = blindFailed | (~blind & (rank < 0))
+        play = ~pickUp
+        playGames, playPlayers = games[play], players[play]
+        playRank, playCount = rank[play].astype(np.intp), count[play]
+
+        fromHand = ~handEmpty[play]
+        fromTop = handEmpty[play] & ~blind[play]
+        handGames, handPlayers, handCount = playGames[fromHand], playPlayers[fromHand], playCount[fromHand]
+        topGames, topPlayers, topCount = playGames[fromTop], playPlayers[fromTop], playCount[fromTop]
+        self.hand[handGames, handPlayers, playRank[fromHand]] -= handCount
+        self.handSize[handGames, handPlayers] -= handCount
+        self.top[topGames, topPlayers, playRank[fromTop]] -= topCount
+        self.topSize[topGames, topPlayers] -= topCount
+        self.pushToPile(games[blindFailed], rank[blindFailed].astype(np.intp), 1)
+        self.pushToPile(playGames, playRank, playCount)
+
+        # Draw cards if fewer than 3 in hand
+        draws = np.minimum(3 - self.handSize[playGames, playPlayers], self.deckEnd[playGames] - self.deckPos[playGames])
+        for drawn in range(3):
+            drawing = draws > drawn
+            drawGames, drawPlayers = playGames[drawing], playPlayers[drawing]
+            if not drawGames.size:
+                break
+            self.hand[drawGames, drawPlayers, self.deck[drawGames, self.deckPos[drawGames]]] += 1
+            self.handSize[drawGames, drawPlayers] += 1
+            self.deckPos[drawGames] += 1
+
+        bombed = self.pileRun[playGames] >= 4
+        cleared = bombed | (~bombed & (playRank == TEN))
+        two = ~bombed & (playRank == TWO)
+        passes = ~cleared & ~two
+        self.clearPile(playGames[cleared])
+        self.bombs[playGames[cleared], playPlayers[cleared]] += 1
+        self.sevenSwitch[playGames[cleared | two], playPlayers[cleared | two]] = False
+        nextPlayers = (playPlayers + 1) % self.numPlayers
+        self.sevenSwitch[playGames[passes], nextPlayers[passes]] = playRank[passes] == SEVEN
+
+        out = ((self.handSize[playGames, playPlayers] == 0) & (self.topSize[playGames, playPlayers] == 0)
+               & (self.bottomCount[playGames, playPlayers] == 0) & (self.deckPos[playGames] == self.deckEnd[playGames]))
+        self.winner[playGames[out]] = playPlayers[out]
+
+        pickUpGames, pickUpPlayers = games[pickUp], players[pickUp]
+        self.hand[pickUpGames, pickUpPlayers] += self.pile[pickUpGames]
+        self.handSize[pickUpGames, pickUpPlayers] += self.pileSize[pickUpGames]
+        self.clearPile(pickUpGames)
+        self.pickUps[pickUpGames, pickUpPlayers] += 1
+
+        passes &= ~out
+        self.changeTurn(np.concatenate((playGames[passes], pickUpGames)),
+                        np.concatenate((playPlayers[passes], pickUpPlayers)))
+        self.skipCycles(games[(self.winner[games] < 0) & (self.turns[games] >= CYCLE_CHECK_TURNS)])
+        return True
+
+    '''
+    Gets the full state of some games as one row each, everything that decides
+    how the rest of a game plays out apart from the turn and stat counters.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The games to read
+
+    @return (ndarray) - [games, state] int16 rows
+
+    @author Mike
+    '''
+    def gameState(self, games):
+        return np.concatenate((self.hand[games].reshape(games.size, -1), self.top[games].reshape(games.size, -1),
+                               self.pile[games], self.bottomCount[games], self.sevenSwitch[games],
+                               np.stack((self.deckPos[games], self.pileTop[games], self.pileRun[games],
+                                         self.current[games]), axis=1)), axis=1, dtype=np.int16)
+
+    '''
+    Fast-forwards games whose state has repeated. A repeated state means the
+    game is in a stalemate cycle, so whole cycles are added to the turn,
+    pickup and bomb counters up to the turn limit and the rest of the last
+    cycle is stepped normally.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The unfinished games old enough to check
+
+    @return None
+
+    @author Mike
+    '''
+    def skipCycles(self, games):
+        if not games.size:
+            return
+        if self.snapState is None:
+            self.snapState = np.zeros((len(self.winner), self.gameState(games[:1]).shape[1]), dtype=np.int16)
+        state = self.gameState(games)
+        turns = self.turns[games]
+        repeated = (self.snapTurn[games] > 0) & (state == self.snapState[games]).all(1)
+        cycled = games[repeated]
+        if cycled.size:
+            cycleLength = turns[repeated] - self.snapTurn[cycled]
+            cycles = (self.maxTurns - turns[repeated]) // cycleLength
+            self.turns[cycled] += cycles * cycleLength
+            self.pickUps[cycled] += cycles[:, None] * (self.pickUps[cycled] - self.snapPickUps[cycled])
+            self.bombs[cycled] += cycles[:, None] * (self.bombs[cycled] - self.snapBombs[cycled])
+            self.snapTurn[cycled] = -1  # Fewer turns than a cycle are left, stop checking
+
+        snap = ~repeated & (turns & (turns - 1) == 0) & (self.snapTurn[games] >= 0)
+        snapGames = games[snap]
+        self.snapTurn[snapGames] = turns[snap]
+        self.snapState[snapGames] = state[snap]
+        self.snapPickUps[snapGames] = self.pickUps[snapGames]
+        self.snapBombs[snapGames] = self.bombs[snapGames]
+
+    '''
+    Puts the bottom cards of players who have just gone blind into the order
+    they will be played. AIPlayer draws from its rng only to pick a bottom
+    card, three times in a row, so the whole order is known up front.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The games of the players going blind
+    @param players (ndarray) - The players going blind
+
+    @return None
+
+    @author Mike
+    '''
+    def orderBottomCards(self, games, players):
+        orders = []
+        for game, player in zip(games.tolist(), players.tolist()):
+            rng = random.Random(self.playerSeeds[game][player])
+            positions = [0, 1, 2]
+            orders.append([positions.pop(rng.choice(range(len(positions)))) for _ in range(3)])
+        self.bottom[games, players] = np.take_along_axis(self.bottom[games, players], np.array(orders), 1)
+
+    '''
+    Chooses the rank and number of cards each game plays, following the
+    playEasy, playMedium and playImpossible policies of AIPlayer.
+
+    @param self - The instance of the BatchSimulator class
+    @param zone (ndarray) - [games, 13] rank counts of each active zone
+    @param valid (ndarray) - [games, 13] playable ranks held
+    @param pileTop (ndarray) - The rank on top of each pile, or EMPTY_PILE
+    @param pileRun (ndarray) - How many cards of the top rank are in a row on each pile
+    @param policy (ndarray) - The policy code of each current player
+
+    @return (tuple) - The rank to play (-1 to pick up) and how many cards
+
+    @author Mike
+    '''
+    def choosePlays(self, zone, valid, pileTop, pileRun, policy):
+        nonSpecial = valid & ~SPECIAL
+        hasNonSpecial = nonSpecial.any(1)
+        preferred = np.where(hasNonSpecial[:, None], nonSpecial, valid)
+        lowest = lowestRank(preferred)
+        rank = lowest.copy()
+        count = np.ones(rank.size, dtype=np.int16)
+        pileEmpty = pileTop == EMPTY_PILE
+
+        medium = (policy == 1) & ~pileEmpty & (lowest >= 0)
+        sevens = medium & preferred[:, SEVEN]
+        rank[sevens] = SEVEN
+        count[medium] = zone[medium, rank[medium]]
+
+        impossible = (policy == 2) & ~pileEmpty & hasNonSpecial
+        aboveTop = lowestRank(nonSpecial & (RANK_RANGE[None, :] > pileTop[:, None]))
+        useAbove = impossible & (aboveTop >= 0)
+        rank[useAbove] = aboveTop[useAbove]
+
+        # playImpossible finishes a bomb first when it holds enough of the top rank
+        rows = np.flatnonzero(impossible)
+        topRank = pileTop[rows]
+        held = zone[rows, topRank]
+        bombing = nonSpecial[rows, topRank] & (held >= BOMB_SIZE - pileRun[rows])
+        rank[rows[bombing]] = topRank[bombing]
+        count[rows[bombing]] = held[bombing]
+        return rank, count
+
+    '''
+    Pushes cards of one rank onto each pile and updates the top rank and the
+    length of the run of that rank on top.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The games to update
+    @param rank (ndarray) - The rank pushed in each game
+    @param count (ndarray) - How many cards were pushed
+
+    @return None
+
+    @author Mike
+    '''
+    def pushToPile(self, games, rank, count):
+        self.pile[games, rank] += count
+        self.pileSize[games] += count
+        self.pileRun[games] = np.where(self.pileTop[games] == rank, self.pileRun[games] + count, count)
+        self.pileTop[games] = rank
+
+    '''
+    Clears the piles of some games.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The games to clear
+
+    @return None
+
+    @author Mike
+    '''
+    def clearPile(self, games):
+        self.pile[games] = 0
+        self.pileSize[games] = 0
+        self.pileTop[games] = EMPTY_PILE
+        self.pileRun[games] = 0
+
+    '''
+    Passes the turn on, clearing the sevenSwitch of the player whose turn ends.
+
+    @param self - The instance of the BatchSimulator class
+    @param games (ndarray) - The games whose turn changes
+    @param players (ndarray) - The player whose turn ends in each game
+
+    @return None
+
+    @author Mike
+    '''
+    def changeTurn(self, games, players):
+        self.sevenSwitch[games, players] = False
+        self.current[games] = (players + 1) % self.numPlayers
+
+    '''
+    Collects the results into a SimulationStats keyed by configured seat.
+
+    @param self - The instance of the BatchSimulator class
+
+    @return stats (SimulationStats) - The results of the batch
+
+    @author Mike
+    '''
+    def stats(self):
+        stats = SimulationStats(self.numPlayers)
+        seats = self.seatOrder.astype(np.intp)
+        games = np.arange(len(self.winner))
+        finished = self.winner >= 0
+        stats.games = len(self.winner)
+        stats.unfinished = int((~finished).sum())
+        stats.turns = int(self.turns.sum())
+        stats.turnsSquared = int((self.turns.astype(np.int64) ** 2).sum())
+        winningSeats = seats[games[finished], self.winner[finished].astype(np.intp)]
+        for seat in range(self.numPlayers):
+            bySeat = seats == seat
+            pickUps = (self.pickUps * bySeat).sum(1).astype(np.int64)
+            bombs = (self.bombs * bySeat).sum(1).astype(np.int64)
+            stats.wins[seat] = int((winningSeats == seat).sum())
+            stats.pickUps[seat] = int(pickUps.sum())
+            stats.pickUpsSquared[seat] = int((pickUps ** 2).sum())
+            stats.bombs[seat] = int(bombs.sum())
+            stats.bombsSquared[seat] = int((bombs ** 2).sum())
+        return stats
+
+'''
+Replays games on the scalar GameEngine and compares them with a batch.
+
+@param batch (BatchSimulator) - A finished batch
+@param difficulties (list) - The difficulty of each configured seat
+@param seed (int) - The base seed of the run
+@param gameIndices (range) - The game numbers the batch was dealt with
+@param rotate (bool) - Whether seats were rotated
+@param numGames (int) - How many of the batch's games to replay
+
+@return mismatches (list) - The game numbers whose results differ
+
+@author Mike
+'''
+def compareWithEngine(batch, difficulties, seed, gameIndices, rotate, numGames):
+    mismatches = []
+    for game, gameIndex in enumerate(gameIndices[:numGames]):
+        engine, _ = playGame(difficulties, seed, gameIndex, rotate, batch.maxTurns)
+        winner = -1 if engine.winner is None else engine.winner
+        if (winner != batch.winner[game] or engine.turnCount != batch.turns[game]
+                or engine.pickUpCounts != batch.pickUps[game].tolist()
+                or engine.bombCounts != batch.bombs[game].tolist()):
+            mismatches.append(gameIndex)
+    return mismatches
+
+'''
+Parses the command line, runs the batches and prints the report.
+
+@return None
+
+@author Mike
+'''
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Palace games in NumPy lockstep batches.")
+    parser.add_argument("seats", nargs="+", choices=DIFFICULTIES,
+                        help="difficulty of each seat, 2 to 4 seats")
+    parser.add_argument("-n", "--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("-b", "--batch", type=int, default=4096, help="games stepped together")
+    parser.add_argument("--seed", type=int, default=0, help="base seed, matches Simulator.py for the same value")
+    parser.add_argument("--max-turns", type=int, default=10000, help="turn limit per game")
+    parser.add_argument("--no-rotate", action="store_true",
+                        help="always let seat 1 move first instead of rotating the first seat")
+    parser.add_argument("--check", type=int, default=0,
+                        help="replay this many games of the first batch on GameEngine and compare")
+    args = parser.parse_args()
+    if not 2 <= len(args.seats) <= 4:
+        parser.error("between 2 and 4 seats are required")
+
+    rotate = not args.no_rotate
+    stats = SimulationStats(len(args.seats))
+    startTime = time.perf_counter()
+    for start in range(0, args.games, args.batch):
+        gameIndices = range(start, min(start + args.batch, args.games))
+        batch = BatchSimulator(args.seats, args.seed, gameIndices, rotate, args.max_turns)
+        batch.run()
+        stats.merge(batch.stats())
+        if start == 0 and args.check:
+            checkStart = time.perf_counter()
+            mismatches = compareWithEngine(batch, args.seats, args.seed, gameIndices, rotate, args.check)
+            checked = min(args.check, len(gameIndices))
+            print(f"Checked {checked} games against GameEngine: {len(mismatches)} mismatches {mismatches[:10]}")
+            startTime += time.perf_counter() - checkStart  # Leave the check out of the reported speed
+    printReport(args.seats, stats, time.perf_counter() - startTime, 1)
+
+if __name__ == '__main__':
+    main()
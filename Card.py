@@ -0,0 +1,78 @@
+'''
+Compact card encoding. A card is a small int 0-51 where rank = card >> 2
+(0 is a 2, 12 is an Ace) and suit = card & 3, so the deck sorts by rank and
+no tuple is built when a card moves between zones. Whether a card is face
+up or face down is decided by the zone it sits in, not by the card itself.
+'''
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['diamonds', 'hearts', 'clubs', 'spades']
+NUM_RANKS = 13
+DECK_SIZE = 52
+
+# Rank indices of the special cards
+TWO = 0
+SEVEN = 5
+TEN = 8
+
+'''
+Builds a card from its rank and suit indices.
+
+@param rank (int) - The rank index, 0 for a 2 up to 12 for an Ace
+@param suit (int) - The suit index into SUITS
+
+@return (int) - The encoded card
+
+@author Mike
+'''
+def makeCard(rank, suit):
+    return rank << 2 | suit
+
+'''
+Gets the rank index of a card.
+
+@param card (int) - The encoded card
+
+@return (int) - The rank index, 0 for a 2 up to 12 for an Ace
+
+@author Mike
+'''
+def rankOf(card):
+    return card >> 2
+
+'''
+Gets the suit index of a card.
+
+@param card (int) - The encoded card
+
+@return (int) - The suit index into SUITS
+
+@author Mike
+'''
+def suitOf(card):
+    return card & 3
+
+'''
+Gets the readable name of a card, e.g. "10 of clubs".
+
+@param card (int) - The encoded card
+
+@return (str) - The card's name
+
+@author Mike
+'''
+def cardName(card):
+    return f"{RANKS[card >> 2]} of {SUITS[card & 3]}"
+
+'''
+Gets the image file name of a card without the extension, matching the
+files in _internal/palaceData/cards, e.g. "10_of_clubs".
+
+@param card (int) - The encoded card
+
+@return (str) - The card's image name
+
+@author Mike
+'''
+def cardImageName(card):
+    return f"{RANKS[card >> 2].lower()}_of_{SUITS[card & 3]}"
@@ -0,0 +1,251 @@
+import time
+from collections import deque
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QObject, QPoint, QPropertyAnimation, QVariantAnimation, QParallelAnimationGroup, \
+    QSequentialAnimationGroup, QEasingCurve
+from CardImageCache import BACK, UPRIGHT
+
+FLIGHT_MS = 250  # How long one card takes to move between zones
+STAGGER_MS = 40  # Gap between cards leaving together, shrunk so a flight group never starts cards over...
+MAX_STAGGER_MS = 400  # ...more than this after its first card
+FRAME_MS = 1000 / 60  # Frame time at 60 fps
+DROPPED_FRAME_MS = 1.5 * FRAME_MS  # A frame taking longer than this skipped at least one refresh
+
+class Flight:
+    '''
+    Initializes the Flight class, a set of cards moving from one point of
+    the window to another, such as the cards of a play going to the pile.
+
+    @param self - The instance of the Flight class
+    @param cards (list) - The cards to move, in the order they leave
+    @param source (QPoint) - Where the cards start, centre of the card in view coordinates
+    @param target (QPoint) - Where the cards end, centre of the card in view coordinates
+    @param faceDown (bool) - Flag to show the backs of the cards
+    @param rotation (int) - UPRIGHT, 90 or -90
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, cards, source, target, faceDown=False, rotation=UPRIGHT):
+        self.cards = cards
+        self.source = source
+        self.target = target
+        self.faceDown = faceDown
+        self.rotation = rotation
+
+class CardAnimator(QObject):
+    '''
+    Initializes the CardAnimator class, which moves cards between zones with
+    QPropertyAnimations on the event loop, so the window keeps drawing and
+    taking input while cards are in flight. Each card is drawn by a sprite
+    label over the view, taken from a pool that grows to the largest flight
+    and is then reused. Sprites use the shared CardImageCache, which is
+    filled before the first animation, so no image is decoded or scaled
+    mid-animation. Groups of flights are queued and run one after another,
+    and a callback runs when each group lands.
+
+    With showStats the frame time, dropped frames and queue depth are shown
+    in a corner of the view while cards move, and each group's worst frame
+    is printed when it lands.
+
+    @param self - The instance of the CardAnimator class
+    @param view (View) - The view the sprites are drawn over
+    @param durationMs (int) - How long one card takes to move, 0 to skip animations
+    @param showStats (bool) - Flag to show the frame time overlay
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, view, durationMs=FLIGHT_MS, showStats=False):
+        super().__init__(view)
+        self.view = view
+        self.durationMs = durationMs
+        self.sprites = []  # Every sprite label, free or in flight
+        self.queue = deque()  # (flights, onFinished) waiting for the running group to land
+        self.group = None  # The running QParallelAnimationGroup
+        self.onFinished = None
+        self.inFlight = []
+        self.lastFrame = None
+        self.frameTimes = []
+        self.droppedFrames = 0
+        self.statsLabel = None
+        if showStats:
+            self.statsLabel = QLabel(view)
+            self.statsLabel.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: #E4E7EB; padding: 4px;")
+            self.statsLabel.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+            self.statsLabel.move(8, 8)
+            self.statsLabel.hide()
+        self.clock = QVariantAnimation(self)  # Ticks once per animation frame while a group runs
+        self.clock.setStartValue(0.0)
+        self.clock.setEndValue(1.0)
+        self.clock.setLoopCount(-1)
+        self.clock.setDuration(1000)
+        self.clock.valueChanged.connect(self.recordFrame)
+        view.cardImages.preload()
+
+    '''
+    Queues a group of flights, which start together once every group queued
+    before them has landed.
+
+    @param self - The instance of the CardAnimator class
+    @param flights (list) - The Flights to run together
+    @param onFinished (function) - Called once every card of the group has landed
+
+    @return None
+
+    @author Mike
+    '''
+    def play(self, flights, onFinished):
+        flights = [flight for flight in flights if flight.cards]
+        if self.durationMs <= 0 or not flights:
+            if self.group is None and not self.queue:
+                onFinished()
+            else:
+                self.queue.append(([], onFinished))
+            return
+        self.queue.append((flights, onFinished))
+        if self.group is None:
+            self.startNext()
+
+    '''
+    Gets how many groups are waiting, counting the one in flight.
+
+    @param self - The instance of the CardAnimator class
+
+    @return (int) - The depth of the queue
+
+    @author Mike
+    '''
+    def queueDepth(self):
+        return len(self.queue) + (self.group is not None)
+
+    '''
+    Takes a free sprite from the pool, creating one if they are all in flight.
+
+    @param self - The instance of the CardAnimator class
+
+    @return sprite (QLabel) - A hidden sprite
+
+    @author Mike
+    '''
+    def takeSprite(self):
+        for sprite in self.sprites:
+            if sprite.isHidden():
+                return sprite
+        sprite = QLabel(self.view)
+        sprite.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        sprite.setStyleSheet("background-color: transparent;")
+        sprite.hide()
+        self.sprites.append(sprite)
+        return sprite
+
+    '''
+    Starts the next queued group, and runs the callbacks of any empty groups
+    in front of it.
+
+    @param self - The instance of the CardAnimator class
+
+    @return None
+
+    @author Mike
+    '''
+    def startNext(self):
+        while self.queue:
+            flights, onFinished = self.queue.popleft()
+            if flights:
+                break
+            onFinished()
+        else:
+            return
+
+        group = QParallelAnimationGroup(self)
+        for flight in flights:
+            stagger = min(STAGGER_MS, MAX_STAGGER_MS // len(flight.cards))
+            for order, card in enumerate(flight.cards):
+                sprite = self.takeSprite()
+                pixmap = self.view.cardImages.pixmap(BACK if flight.faceDown else card, flight.rotation)
+                size = pixmap.deviceIndependentSize().toSize()
+                sprite.setPixmap(pixmap)
+                sprite.resize(size)
+                offset = QPoint(size.width() // 2, size.height() // 2)
+                sprite.move(flight.source - offset)
+                sprite.show()
+                sprite.raise_()
+                self.inFlight.append(sprite)
+
+                movement = QPropertyAnimation(sprite, b"pos")
+                movement.setDuration(self.durationMs)
+                movement.setStartValue(flight.source - offset)
+                movement.setEndValue(flight.target - offset)
+                movement.setEasingCurve(QEasingCurve.Type.OutCubic)
+                if order:
+                    delayed = QSequentialAnimationGroup()
+                    delayed.addPause(order * stagger)
+                    delayed.addAnimation(movement)
+                    group.addAnimation(delayed)
+                else:
+                    group.addAnimation(movement)
+        group.finished.connect(self.groupFinished)
+        self.group = group
+        self.onFinished = onFinished
+        self.lastFrame = None
+        self.frameTimes = []
+        self.droppedFrames = 0
+        if self.statsLabel is not None:
+            self.statsLabel.show()
+            self.statsLabel.raise_()
+        self.clock.start()
+        group.start(QParallelAnimationGroup.DeletionPolicy.DeleteWhenStopped)
+
+    '''
+    Records the time since the last animation frame, and counts the
+    refreshes it skipped if it took longer than a 60 fps frame.
+
+    @param self - The instance of the CardAnimator class
+    @param value (float) - The clock's progress, unused
+
+    @return None
+
+    @author Mike
+    '''
+    def recordFrame(self, value):
+        now = time.perf_counter()
+        if self.lastFrame is not None:
+            frameMs = (now - self.lastFrame) * 1000
+            self.frameTimes.append(frameMs)
+            if frameMs > DROPPED_FRAME_MS:
+                self.droppedFrames += round(frameMs / FRAME_MS) - 1
+            if self.statsLabel is not None:
+                self.statsLabel.setText(f"Frame: {frameMs:.1f} ms\nDropped: {self.droppedFrames}\n"
+                                        f"Queue: {self.queueDepth()}")
+                self.statsLabel.adjustSize()
+        self.lastFrame = now
+
+    '''
+    Returns the sprites of a group that has landed to the pool, runs its
+    callback and starts the next group.
+
+    @param self - The instance of the CardAnimator class
+
+    @return None
+
+    @author Mike
+    '''
+    def groupFinished(self):
+        self.clock.stop()
+        for sprite in self.inFlight:
+            sprite.hide()
+        if self.statsLabel is not None:
+            self.statsLabel.hide()
+            if self.frameTimes:
+                print(f"Animated {len(self.inFlight)} cards: {len(self.frameTimes)} frames, "
+                      f"worst {max(self.frameTimes):.1f} ms, {self.droppedFrames} dropped")
+        self.inFlight = []
+        self.group = None
+        onFinished = self.onFinished
+        self.onFinished = None
+        onFinished()
+        if self.group is None:
+            self.startNext()
@@ -0,0 +1,156 @@
+'''
+Packs every card face and the card back into one atlas image at the size
+the View draws them, with a JSON index of where each card is.
+
+Loading the atlas is one PNG decode of about 1 MB instead of 53 decodes of
+about 4.9 MB, each followed by a smooth downscale. The index records the
+size and modification time of every source PNG and the card size the atlas
+was built for, so loadAtlas rebuilds it by itself when a card image is
+replaced or the card size changes. The atlas is kept in the user's cache
+directory, see Assets.cachePath, and can also be built ahead of time:
+
+    python CardAtlas.py
+    python CardAtlas.py --scale 1 1.5 2
+'''
+import argparse
+import json
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtCore import Qt, QDir, QFileInfo
+from Assets import CARD_DIRECTORY, assetPath, cachePath, registerBundle
+
+ATLAS_VERSION = 1  # Bump when the layout of the atlas or the index changes
+COLUMNS = 14
+
+'''
+Gets where the atlas and index for a card size are kept. Each size has its
+own files, so moving between screens with different pixel ratios does not
+rebuild the atlas every time.
+
+@param width (int) - The width of an upright card in pixels
+@param height (int) - The height of an upright card in pixels
+
+@return (tuple) - The atlas path and the index path
+
+@author Mike
+'''
+def atlasPaths(width, height):
+    return cachePath(f"cardAtlas{width}x{height}.png"), cachePath(f"cardAtlas{width}x{height}.json")
+
+'''
+Lists the source PNGs with their size and modification time, which change
+whenever an image is replaced. The directory may be in the resource bundle.
+
+@param directory (str) - The directory holding the card PNGs, the cards asset directory by default
+
+@return (dict) - The size and modification time of each image, by name without the extension
+
+@author Mike
+'''
+def sourceSignature(directory=None):
+    directory = directory or assetPath(CARD_DIRECTORY)
+    signature = {}
+    for fileName in QDir(directory).entryList(["*.png"], QDir.Filter.Files, QDir.SortFlag.Name):
+        info = QFileInfo(f"{directory}/{fileName}")
+        signature[fileName[:-4]] = [info.size(), info.lastModified().toMSecsSinceEpoch()]
+    return signature
+
+'''
+Scales every source PNG to the card size and packs them into a grid,
+then writes the atlas and its index.
+
+@param width (int) - The width of an upright card
+@param height (int) - The height of an upright card
+@param directory (str) - The directory holding the card PNGs, the cards asset directory by default
+@param atlasPath (str) - Where to write the atlas image, the path for the card size by default
+@param indexPath (str) - Where to write the index, the path for the card size by default
+
+@return (tuple) - The atlas QImage and the sub-rectangle (x, y, width, height) of each card name
+
+@author Mike
+'''
+def buildAtlas(width, height, directory=None, atlasPath=None, indexPath=None):
+    directory = directory or assetPath(CARD_DIRECTORY)
+    defaultAtlasPath, defaultIndexPath = atlasPaths(width, height)
+    atlasPath = atlasPath or defaultAtlasPath
+    indexPath = indexPath or defaultIndexPath
+    signature = sourceSignature(directory)
+    names = list(signature)
+    rows = (len(names) + COLUMNS - 1) // COLUMNS
+    atlas = QImage(COLUMNS * width, rows * height, QImage.Format.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.GlobalColor.transparent)
+    rects = {}
+    painter = QPainter(atlas)
+    for position, name in enumerate(names):
+        image = QImage(f"{directory}/{name}.png").scaled(
+            width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        x = position % COLUMNS * width
+        y = position // COLUMNS * height
+        painter.drawImage(x, y, image)
+        rects[name] = [x, y, image.width(), image.height()]
+    painter.end()
+
+    index = {"version": ATLAS_VERSION, "width": width, "height": height, "sources": signature, "rects": rects}
+    # A read-only install still gets the atlas built in memory for this run
+    if atlas.save(atlasPath):
+        try:
+            with open(indexPath, "w") as indexFile:
+                json.dump(index, indexFile)
+        except OSError:
+            pass
+    return atlas, rects
+
+'''
+Loads the atlas for a card size, rebuilding it first if it is missing,
+was built for another size, or any source PNG has changed since.
+
+@param width (int) - The width of an upright card
+@param height (int) - The height of an upright card
+@param directory (str) - The directory holding the card PNGs, the cards asset directory by default
+@param atlasPath (str) - Where the atlas image is kept, the path for the card size by default
+@param indexPath (str) - Where the index is kept, the path for the card size by default
+
+@return (tuple) - The atlas QImage and the sub-rectangle (x, y, width, height) of each card name
+
+@author Mike
+'''
+def loadAtlas(width, height, directory=None, atlasPath=None, indexPath=None):
+    defaultAtlasPath, defaultIndexPath = atlasPaths(width, height)
+    atlasPath = atlasPath or defaultAtlasPath
+    indexPath = indexPath or defaultIndexPath
+    try:
+        with open(indexPath) as indexFile:
+            index = json.load(indexFile)
+    except (OSError, ValueError):
+        index = None
+    if (index is not None and index.get("version") == ATLAS_VERSION and index.get("width") == width
+            and index.get("height") == height and index.get("sources") == sourceSignature(directory)):
+        atlas = QImage(atlasPath)
+        if not atlas.isNull():
+            return atlas, index["rects"]
+    return buildAtlas(width, height, directory, atlasPath, indexPath)
+
+'''
+Parses the command line and builds the atlas.
+
+@return None
+
+@author Mike
+'''
+def main():
+    from View import CARD_WIDTH, CARD_HEIGHT
+
+    registerBundle()
+    parser = argparse.ArgumentParser(description="Pack the card images into one atlas.")
+    parser.add_argument("--width", type=int, default=CARD_WIDTH, help="width of an upright card")
+    parser.add_argument("--height", type=int, default=CARD_HEIGHT, help="height of an upright card")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1.0],
+                        help="device pixel ratios to build for, e.g. 1 1.5 2")
+    args = parser.parse_args()
+    for scale in args.scale:
+        width, height = round(args.width * scale), round(args.height * scale)
+        atlas, rects = buildAtlas(width, height)
+        print(f"Packed {len(rects)} cards into a {atlas.width()}x{atlas.height()} atlas at "
+              f"{atlasPaths(width, height)[0]}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from PySide6.QtGui import QPixmap, QTransform
+from PySide6.QtCore import QRect
+from Card import DECK_SIZE, cardImageName
+from CardAtlas import loadAtlas
+
+BACK = -1  # Key for the card back
+UPRIGHT = 0
+ROTATIONS = (UPRIGHT, 90, -90)  # Degrees clockwise, AI 2 and AI 3 sit sideways
+MEMORY_BUDGET = 8 * 1024 * 1024  # Bytes of scaled pixmaps kept, about 2.5x every variant at 56x84
+
+class CardImageCache:
+    '''
+    Initializes the CardImageCache class, which keeps every card face and
+    the card back already scaled, and rotated for the side seats, so drawing
+    a card is a dictionary lookup with no disk I/O and no resampling. Cards
+    are cut from the CardAtlas, which is loaded with one decode the first
+    time any card is asked for. The sideways variants are exact quarter
+    turns of the upright one, so they need no resampling either. The least
+    recently used pixmaps are dropped once the memory budget is exceeded.
+
+    Sizes are in logical pixels. On a HiDPI screen the atlas is built at the
+    card size times the device pixel ratio and each pixmap is tagged with
+    that ratio, so Qt draws it 1:1 onto the physical pixels instead of
+    stretching a low resolution card.
+
+    @param self - The instance of the CardImageCache class
+    @param width (int) - The width of an upright card
+    @param height (int) - The height of an upright card
+    @param memoryBudget (int) - The most bytes of pixmaps to keep at this card size and a pixel ratio of 1
+    @param devicePixelRatio (float) - The pixel ratio of the screen the cards are drawn on
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, width, height, memoryBudget=MEMORY_BUDGET, devicePixelRatio=1.0):
+        self.width = width
+        self.height = height
+        self.memoryBudget = memoryBudget
+        self.devicePixelRatio = devicePixelRatio
+        self.pixmaps = OrderedDict()  # (card, rotation) -> QPixmap, least recently used first
+        self.memoryUsed = 0
+        self.atlas = None
+        self.atlasRects = {}
+
+    '''
+    Gets the pixmap of a card face or the back in one orientation.
+
+    @param self - The instance of the CardImageCache class
+    @param card (int) - The encoded card, or BACK
+    @param rotation (int) - UPRIGHT, 90 or -90
+
+    @return (QPixmap) - The scaled pixmap
+
+    @author Mike
+    '''
+    def pixmap(self, card, rotation=UPRIGHT):
+        key = (card, rotation)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.load(card)[rotation]
+        else:
+            self.pixmaps.move_to_end(key)
+        return pixmap
+
+    '''
+    Gets the pixmap of the card back in one orientation.
+
+    @param self - The instance of the CardImageCache class
+    @param rotation (int) - UPRIGHT, 90 or -90
+
+    @return (QPixmap) - The scaled pixmap
+
+    @author Mike
+    '''
+    def back(self, rotation=UPRIGHT):
+        return self.pixmap(BACK, rotation)
+
+    '''
+    Cuts one card out of the atlas and stores every orientation of it,
+    evicting the least recently used pixmaps if that goes over the memory
+    budget. The atlas itself is loaded the first time.
+
+    @param self - The instance of the CardImageCache class
+    @param card (int) - The encoded card, or BACK
+
+    @return variants (dict) - The pixmap for each rotation
+
+    @author Mike
+    '''
+    def load(self, card):
+        if self.atlas is None:
+            atlas, self.atlasRects = loadAtlas(round(self.width * self.devicePixelRatio),
+                                               round(self.height * self.devicePixelRatio))
+            self.atlas = QPixmap.fromImage(atlas)
+        name = "back" if card == BACK else cardImageName(card)
+        upright = self.atlas.copy(QRect(*self.atlasRects[name]))
+        variants = {}
+        for rotation in ROTATIONS:
+            pixmap = upright if rotation == UPRIGHT else upright.transformed(QTransform().rotate(rotation))
+            pixmap.setDevicePixelRatio(self.devicePixelRatio)
+            variants[rotation] = pixmap
+            self.store((card, rotation), pixmap)
+        return variants
+
+    '''
+    Adds a pixmap and evicts the least recently used ones while the cache
+    is over its memory budget.
+
+    @param self - The instance of the CardImageCache class
+    @param key (tuple) - The card and rotation
+    @param pixmap (QPixmap) - The scaled pixmap
+
+    @return None
+
+    @author Mike
+    '''
+    def store(self, key, pixmap):
+        old = self.pixmaps.pop(key, None)
+        if old is not None:
+            self.memoryUsed -= self.pixmapBytes(old)
+        self.pixmaps[key] = pixmap
+        self.memoryUsed += self.pixmapBytes(pixmap)
+        budget = self.memoryBudget * self.devicePixelRatio * self.devicePixelRatio
+        while self.memoryUsed > budget and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.memoryUsed -= self.pixmapBytes(evicted)
+
+    '''
+    Gets the memory a pixmap takes up.
+
+    @param self - The instance of the CardImageCache class
+    @param pixmap (QPixmap) - The pixmap
+
+    @return (int) - Its size in bytes
+
+    @author Mike
+    '''
+    def pixmapBytes(self, pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    '''
+    Cuts every card face and the back out of the atlas up front, so the
+    first game does not pay for it while cards are dealt.
+
+    @param self - The instance of the CardImageCache class
+
+    @return None
+
+    @author Mike
+    '''
+    def preload(self):
+        for card in [BACK, *range(DECK_SIZE)]:
+            if (card, UPRIGHT) not in self.pixmaps:
+                self.load(card)
+
+    '''
+    Changes the pixel ratio cards are rendered for, dropping every pixmap
+    rendered for the old one. Nothing is dropped if the ratio is the same.
+
+    @param self - The instance of the CardImageCache class
+    @param devicePixelRatio (float) - The pixel ratio of the screen the cards are drawn on
+
+    @return (bool) - True if the ratio changed and cards need to be drawn again
+
+    @author Mike
+    '''
+    def setDevicePixelRatio(self, devicePixelRatio):
+        if devicePixelRatio == self.devicePixelRatio:
+            return False
+        self.devicePixelRatio = devicePixelRatio
+        self.clear()
+        return True
+
+    '''
+    Changes the logical size cards are rendered at, dropping every pixmap
+    rendered at the old one. The memory budget grows or shrinks with the
+    card area, and the atlas for the new size is built or loaded from its
+    cache file the next time a card is drawn. Nothing is dropped if the size
+    is the same.
+
+    @param self - The instance of the CardImageCache class
+    @param width (int) - The width of an upright card
+    @param height (int) - The height of an upright card
+
+    @return (bool) - True if the size changed and cards need to be drawn again
+
+    @author Mike
+    '''
+    def setCardSize(self, width, height):
+        if (width, height) == (self.width, self.height):
+            return False
+        self.memoryBudget = self.memoryBudget * width * height / (self.width * self.height)
+        self.width = width
+        self.height = height
+        self.clear()
+        return True
+
+    '''
+    Drops every pixmap and the atlas, for when the card size or pixel ratio
+    changes.
+
+    @param self - The instance of the CardImageCache class
+
+    @return None
+
+    @author Mike
+    '''
+    def clear(self):
+        self.pixmaps.clear()
+        self.memoryUsed = 0
+        self.atlas = None
+        self.atlasRects = {}
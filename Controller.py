@@ -1,47 +1,71 @@
-import random
+import threading
 import time
-from PySide6.QtWidgets import QLabel
-from PySide6.QtGui import QPixmap
-from PySide6.QtCore import Qt, QCoreApplication, QTimer
+import traceback
+from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import Qt, QCoreApplication, QThreadPool, QTimer
 from View import View
-from Player import Player
+from SceneView import SceneView
+from AIWorker import AIMoveSignals, AIMoveTask, FastForwardTask
+from CardAnimator import CardAnimator, Flight, FLIGHT_MS
+from Player import Player, TOP_CARDS, BOTTOM_CARDS
 from AIPlayer import AIPlayer
+from InformationSetMCTS import shutdownExecutors
+from GameEngine import GameEngine, PICK_UP
+from Card import RANKS, rankOf, cardName
 
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-VALUES = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
-CARD_WIDTH = 56
-CARD_HEIGHT = 84
-BUTTON_WIDTH = 66
-BUTTON_HEIGHT = 87
+AI_DELAY_MS = 1000  # Default shortest time an AI move takes to appear, so it can be followed
+BLIND_REVEAL_MS = 1000  # How long a failed blind card stays on the pile before it is picked up
+FAST_FORWARD_TURNS = 25  # Turns fast-forwarded between redraws of the table
 
 class Controller:
     '''
-    Initializes the Controller class, sets up the game state, and starts 
-    the game loop.
+    Initializes the Controller class, sets up the game state, and starts
+    the game loop. The rules themselves live in GameEngine; the Controller
+    drives the engine and renders the results through the View.
 
     @param self - The instance of the Controller class
     @param numPlayers (int) - The number of players in the game
     @param difficulty (str) - The difficulty level of the AI players
+    @param aiDelayMs (int) - Shortest time an AI move takes to appear, 0 to play AI moves as soon as they are chosen
+    @param viewBackend (str) - 'widgets' for the layout of QLabels, 'scene' for the QGraphicsScene table
+    @param animationMs (int) - How long a card takes to move between zones, 0 to move cards instantly
+    @param showFrameStats (bool) - Flag to show frame times while cards move
 
     @return None
 
     @author Mike
     '''
-    def __init__(self, numPlayers, difficulty):
+    def __init__(self, numPlayers, difficulty, aiDelayMs=AI_DELAY_MS, viewBackend='widgets', animationMs=FLIGHT_MS,
+                 showFrameStats=False):
         self.numPlayers = numPlayers
         self.difficulty = difficulty
-        self.view = View(self)
+        self.aiDelayMs = aiDelayMs
+        self.view = SceneView(self) if viewBackend == 'scene' else View(self)
+        self.animator = CardAnimator(self.view, animationMs, showFrameStats)
+        self.engine = None
         self.players = []
-        self.deck = []
-        self.pile = []
-        self.currentPlayerIndex = 0
-        self.selectedCards = [] 
-        self.playCardButtons = []  
-        self.topCardSelectionPhase = True  
+        self.selectedCards = []
+        self.playCardButtons = []
+        self.topCardSelectionPhase = True
+        self.activeZoneNames = {}  # The zone last drawn in each seat's hand row
+        self.busy = False  # An AI move is being chosen or a move is still being shown
+        self.aiToken = 0
+        self.aiStartTime = 0.0
+        self.aiSignals = AIMoveSignals()
+        self.aiSignals.moveReady.connect(self.applyAIMove, Qt.ConnectionType.QueuedConnection)
+        self.aiSignals.batchDone.connect(self.applyFastForward, Qt.ConnectionType.QueuedConnection)
+        self.fastForward = False  # AI turns are played in batches with no pacing or animation
+        self.autoPlay = False  # The human player's turns are played by standIn as well
+        self.standIn = None
+        self.fastForwardStop = threading.Event()
+        self.skippedTurns = 0
         self.setupGame()
 
     '''
-    Starts the game loop with a timer to manage turns and game state updates.
+    Starts the next turn after the game state has changed: the game was set
+    up, or a move has been applied and rendered. An AI turn is started
+    straight away; a human turn needs nothing until they click, so the
+    Controller stays idle instead of polling.
 
     @param self - The instance of the Controller class
 
@@ -49,30 +73,50 @@ class Controller:
 
     @author Mike
     '''
-    def startGameLoop(self):
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.gameLoop)
-        self.timer.start(1000)  
+    def scheduleTurn(self):
+        if self.engine.isTerminal() or self.busy or self.topCardSelectionPhase:
+            return
+        AITurn = isinstance(self.players[self.engine.currentPlayerIndex], AIPlayer)
+        if self.autoPlay or (self.fastForward and AITurn):
+            self.fastForwardTurns()
+        elif AITurn:
+            self.AIPlayTurn()
 
     '''
-    The main game loop that handles the current player's turn and updates the 
-    game state.
+    Turns fast forward on or off. Turning it off ends a running batch after
+    its current move, and the game carries on at the normal pace.
 
     @param self - The instance of the Controller class
+    @param enabled (bool) - Flag to fast forward AI turns
 
     @return None
 
     @author Mike
     '''
-    def gameLoop(self):
-        currentPlayer = self.players[self.currentPlayerIndex]
-        if isinstance(currentPlayer, AIPlayer):
-            self.AIPlayTurn()
-        else:
-            self.view.updateUI(currentPlayer, len(self.deck), self.pile)
+    def setFastForward(self, enabled):
+        self.fastForward = enabled
+        self.fastForwardStop.set()
+        self.scheduleTurn()
+
+    '''
+    Hands the human player's turns to an AI stand-in, which plays them
+    fast-forwarded along with the AI turns, or takes them back. Taking them
+    back ends a running batch after its current move.
+
+    @param self - The instance of the Controller class
+    @param enabled (bool) - Flag to let the stand-in play the human player's turns
+
+    @return None
+
+    @author Mike
+    '''
+    def setAutoPlay(self, enabled):
+        self.autoPlay = enabled
+        self.fastForwardStop.set()
+        self.scheduleTurn()
 
     '''
-    Handles the logic for a player picking up the pile of cards.
+    Handles the logic for the human player picking up the pile of cards.
 
     @param self - The instance of the Controller class
 
@@ -81,43 +125,19 @@ class Controller:
     @author Mike
     '''
     def pickUpPile(self):
-        top = False
-        if self.pile == []:
+        if not self.engine.pile or self.busy:
             return
-        currentPlayer = self.players[self.currentPlayerIndex]
-        pickedUpCards = self.pile[:]
-        currentPlayer.pickUpPile(self.pile)
-        print(f"{currentPlayer.name} picks up the pile")
-        self.view.pileLabel.setText("Pile: Empty")
-        currentPlayer.sevenSwitch = False
-
-        for card in pickedUpCards:
-            if card[3]: 
-                if card in currentPlayer.hand:
-                    index = currentPlayer.hand.index(card)
-                    currentPlayer.hand[index] = (card[0], card[1], card[2], False)  
-                    if index < self.view.playerHandLayout.count():
-                        self.view.revealCard(self.view.playerHandLayout.itemAt(index).widget(), card) 
-
-        for card in reversed(currentPlayer.hand):
-            if card[2]:
-                currentPlayer.topCards.append(currentPlayer.hand.pop(currentPlayer.hand.index(card)))
-                top = True
-        if top:
-            if isinstance(currentPlayer, AIPlayer):
-                AI_Index = self.players.index(currentPlayer)
-                self.view.updateAITopCardButtons(currentPlayer.topCards, AI_Index)
-            else:
-                self.view.updateTopCardButtons(currentPlayer.topCards)
+        for _, cardLabel in self.selectedCards:
+            self.view.setCardSelected(cardLabel, False)
+        self.selectedCards = []
+        result = self.engine.apply(PICK_UP)
+        self.renderResult(result)
 
-        # self.view.setPlayerHandEnabled(False)
-        self.view.placeButton.setText("AI Turn...")
-        self.updateUI()
-        self.changeTurn()
-    
     '''
-    Sets up the game by creating players, shuffling the deck, and dealing 
-    initial cards.
+    Sets up the game by creating players, shuffling the deck, and dealing
+    initial cards. The impossible AI's search pool is created here on the
+    GUI thread, not by the first AI move on a worker thread, and is shut
+    down when the application quits.
 
     @param self - The instance of the Controller class
 
@@ -126,17 +146,22 @@ class Controller:
     @author Mike
     '''
     def setupGame(self):
-        self.players.append(Player("Player"))
+        players = [Player("Player")]
         for _ in range(self.numPlayers - 1):
-            self.players.append(AIPlayer(f"AI{_}", self.difficulty))
-        self.deck = self.createDeck()
-        random.shuffle(self.deck)
-        self.dealInitialCards()
+            players.append(AIPlayer(f"AI{_}", self.difficulty))
+        searchers = [player.searcher for player in players[1:] if player.searcher is not None]
+        for searcher in searchers:
+            searcher.startExecutor()
+        if searchers:
+            QCoreApplication.instance().aboutToQuit.connect(shutdownExecutors)
+        self.engine = GameEngine(players)
+        self.players = self.engine.players
+        self.engine.setupGame()
         self.view.updatePlayerHand(self.players[0].hand)
         self.view.showTopCardSelection(self.players[0])
 
     '''
-    Proceeds with the game setup after the top cards have been selected by 
+    Proceeds with the game setup after the top cards have been selected by
     the players.
 
     @param self - The instance of the Controller class
@@ -146,30 +171,37 @@ class Controller:
     @author Mike
     '''
     def proceedWithGameSetup(self):
+        self.engine.chooseAITopCards()
         for index, AIPlayer in enumerate(self.players[1:], start=1):
-            AIPlayer.chooseTopCards()
             self.view.updateAITopCardButtons(AIPlayer.topCards, index)
             self.view.updateAIBottomCardButtons(AIPlayer.bottomCards, index)
         self.view.updateBottomCardButtons(self.players[0].bottomCards)
         self.topCardSelectionPhase = False
+        for playerIndex in range(len(self.players)):
+            self.updateSeat(playerIndex)
         self.updateUI()
-        self.startGameLoop()
+        self.scheduleTurn()
 
     '''
-    Creates a standard deck of cards.
+    Updates the UI elements to reflect the current game state. The hand rows
+    are kept up to date by updateSeat after every move, so they are not
+    redrawn here.
 
     @param self - The instance of the Controller class
 
-    @return deck (list) - The created deck of cards
+    @return None
 
     @author Mike
     '''
-    def createDeck(self):
-        suits = ['diamonds', 'hearts', 'clubs', 'spades']
-        return [(rank, suit, False, False) for rank in RANKS for suit in suits] 
+    def updateUI(self):
+        currentPlayer = self.players[self.engine.currentPlayerIndex]
+        if not self.topCardSelectionPhase:
+            self.view.updateUI(currentPlayer, len(self.engine.deck))
+            self.updateTurnControls()
 
     '''
-    Deals the initial cards to all players.
+    Sets the place and pick up buttons for whoever's turn it is, and which
+    of the human player's cards can be played on their turn.
 
     @param self - The instance of the Controller class
 
@@ -177,39 +209,206 @@ class Controller:
 
     @author Mike
     '''
-    def dealInitialCards(self):
-        for player in self.players:
-            player.bottomCards = [(card[0], card[1], False, True) for card in self.deck[:3]]
-            player.hand = self.deck[3:9]
-            self.deck = self.deck[9:]
+    def updateTurnControls(self):
+        if isinstance(self.players[self.engine.currentPlayerIndex], AIPlayer):
+            self.view.placeButton.setText("AI Turn...")
+            self.view.placeButton.setEnabled(False)
+            self.view.pickUpPileButton.setDisabled(True)
+        else:
+            self.view.placeButton.setText("Select A Card")
+            self.view.placeButton.setEnabled(len(self.selectedCards) > 0)
+            self.view.pickUpPileButton.setDisabled(False)
+            self.updatePlayableCards()
 
     '''
-    Updates the UI elements to reflect the current game state.
+    Applies the changes a move made to the window: only the rows of the
+    zones in its change set, the deck count if cards were drawn, the current
+    player if the turn passed, and which of the human player's cards are
+    playable if anything they depend on changed.
 
     @param self - The instance of the Controller class
+    @param result (MoveResult) - The result returned by GameEngine.apply
 
     @return None
 
     @author Mike
     '''
-    def updateUI(self):
-        currentPlayer = self.players[self.currentPlayerIndex]
-        if not self.topCardSelectionPhase:
-            self.view.updateUI(currentPlayer, len(self.deck), self.pile)
+    def applyChanges(self, result):
+        seats = {}
+        for playerIndex, zone in result.changedZones:
+            seats.setdefault(playerIndex, set()).add(zone)
+        for playerIndex, zones in seats.items():
+            self.updateSeat(playerIndex, zones)
+        if result.deckChanged:
+            self.view.updateDeckLabel(len(self.engine.deck))
+        if result.turnChanged:
+            currentPlayer = self.players[self.engine.currentPlayerIndex]
+            self.view.updateCurrentPlayer(currentPlayer)
+            self.updateTurnControls()
             if isinstance(currentPlayer, AIPlayer):
-                self.view.placeButton.setText("AI Turn...")
-                AI_Index = self.players.index(currentPlayer)
-                self.view.updateAIHand(currentPlayer.hand, AI_Index)
-                self.view.pickUpPileButton.setDisabled(True)
+                self.view.setPlayerHandEnabled(False)
+        elif self.engine.currentPlayerIndex == 0:
+            # The human player goes again after a 2, a 10 or a bomb
+            self.view.placeButton.setText("Select A Card")
+            self.view.placeButton.setEnabled(False)
+            if result.pileChanged or 0 in seats:
+                self.updatePlayableCards()
+
+    '''
+    Redraws the rows of a single seat. Once the hand is empty the zone being
+    played from is drawn in the hand row and left out of its own row. Only
+    the rows showing a changed zone are drawn, unless the zone played from
+    has changed, which moves a zone between rows.
+
+    @param self - The instance of the Controller class
+    @param playerIndex (int) - The index of the seat to redraw
+    @param zones (set) - The changed zones of the seat, None to redraw every row
+
+    @return None
+
+    @author Mike
+    '''
+    def updateSeat(self, playerIndex, zones=None):
+        player = self.players[playerIndex]
+        activeZone = player.activeZone()
+        activeZoneName = player.activeZoneName()
+        if self.activeZoneNames.get(playerIndex) != activeZoneName:
+            self.activeZoneNames[playerIndex] = activeZoneName
+            zones = None
+        topCards = [] if activeZone is player.topCards else player.topCards
+        bottomCards = [] if activeZone is player.bottomCards else player.bottomCards
+        if playerIndex == 0:
+            if zones is None or activeZoneName in zones:
+                self.view.updatePlayerHand(activeZone, player.isBlind())
+            if zones is None or TOP_CARDS in zones:
+                self.view.updateTopCardButtons(topCards)
+            if zones is None or BOTTOM_CARDS in zones:
+                self.view.updateBottomCardButtons(bottomCards)
+        else:
+            if zones is None or activeZoneName in zones:
+                self.view.updateAIHand(activeZone, playerIndex)
+            if zones is None or TOP_CARDS in zones:
+                self.view.updateAITopCardButtons(topCards, playerIndex)
+            if zones is None or BOTTOM_CARDS in zones:
+                self.view.updateAIBottomCardButtons(bottomCards, playerIndex)
+
+    '''
+    Shows the top card of the pile on the pile label, with how many of its
+    rank are in a row and how many more would bomb the pile as a tooltip.
+
+    @param self - The instance of the Controller class
+
+    @return None
+
+    @author Mike
+    '''
+    def updatePileLabel(self):
+        topCard = self.engine.pile[-1]
+        self.view.pileLabel.setPixmap(self.view.cardImages.pixmap(topCard))
+        self.view.pileLabel.setToolTip(f"{self.engine.pile.run} x {RANKS[rankOf(topCard)]} on top, "
+                                       f"{self.engine.pile.cardsToBomb()} more to bomb")
+
+    '''
+    Renders the outcome of a move applied to the engine: the pile, the seat
+    that moved, and the turn or winner that follows. A failed blind card is
+    shown on the pile first and the rest is rendered by a timer, so the
+    window keeps drawing while the card is on show.
+
+    @param self - The instance of the Controller class
+    @param result (MoveResult) - The result returned by GameEngine.apply
+
+    @return None
+
+    @author Mike
+    '''
+    def renderResult(self, result):
+        self.busy = True
+        if result.blindFailed:
+            # Show the flipped card on the pile before it is picked up
+            self.view.pileLabel.setPixmap(self.view.cardImages.pixmap(result.playedCards[-1]))
+            QTimer.singleShot(BLIND_REVEAL_MS, lambda: self.animateResult(result))
+            return
+        self.animateResult(result)
+
+    '''
+    Moves the cards of a move between zones: played cards to the pile,
+    drawn cards from the deck and a picked up pile into the hand, then the
+    cards of a bomb off the table. The played cards leave the hand row as
+    they take off, and the rest of the move is rendered once every card has
+    landed.
+
+    @param self - The instance of the Controller class
+    @param result (MoveResult) - The result returned by GameEngine.apply
+
+    @return None
+
+    @author Mike
+    '''
+    def animateResult(self, result):
+        seat = result.playerIndex
+        handRow = self.view.handRow(seat)
+        handPoint = handRow.centrePoint()
+        pilePoint = self.view.labelCentre(self.view.pileLabel)
+        flights = []
+        if result.playedCards and not result.blindFailed:
+            drawnCards = set(result.drawnCards)
+            remaining = [card for card in result.playedFrom if card not in drawnCards]
+            if seat == 0:
+                self.view.updatePlayerHand(remaining, result.playedFrom is self.players[0].bottomCards)
             else:
-                self.view.placeButton.setText("Select A Card")
-                self.view.pickUpPileButton.setDisabled(False)
-                self.view.updatePlayerHand(currentPlayer.hand)
-                if not self.topCardSelectionPhase:
-                    self.updatePlayableCards()
+                self.view.updateAIHand(remaining, seat)
+            flights.append(Flight(result.playedCards, handPoint, pilePoint))
+        if result.pickedUpCards:
+            flights.append(Flight(result.pickedUpCards, pilePoint, handPoint, rotation=handRow.rotation))
+        if result.drawnCards:
+            flights.append(Flight(result.drawnCards, self.view.labelCentre(self.view.deckLabel), handPoint,
+                                  seat != 0, handRow.rotation))
+        if result.bombed:
+            bombCard = result.playedCards[-1]
+            self.animator.play(flights, lambda: self.view.pileLabel.setPixmap(self.view.cardImages.pixmap(bombCard)))
+            flights = [Flight(result.clearedCards, pilePoint, self.view.discardPoint())]
+        self.animator.play(flights, lambda: self.finishResult(result))
+
+    '''
+    Renders the rest of a move once any failed blind card has been shown,
+    and lets the next move start.
+
+    @param self - The instance of the Controller class
+    @param result (MoveResult) - The result returned by GameEngine.apply
+
+    @return None
+
+    @author Mike
+    '''
+    def finishResult(self, result):
+        player = self.players[result.playerIndex]
+        if result.playedCards and not result.blindFailed:
+            print(f"{player.name} plays {', '.join([cardName(card) for card in result.playedCards])}")
+
+        if result.pickedUp:
+            print(f"{player.name} picks up the pile")
+            self.view.pileLabel.setText("Pile: Empty")
+        elif result.bombed:
+            if result.fourOfAKind:
+                print("Four of a kind! Clearing the pile.")
+            self.view.pileLabel.setText("Bombed")
+        elif result.pileChanged:
+            self.updatePileLabel()
+        if not self.engine.pile:
+            self.view.pileLabel.setToolTip("")
+
+        self.selectedCards = []
+        self.busy = False
+        if result.gameOver:
+            self.updateSeat(result.playerIndex)
+            self.showWinner(player)
+            return
+
+        self.applyChanges(result)
+        self.scheduleTurn()
 
     '''
-    Prepares a card for placement by selecting or deselecting it and updating 
+    Prepares a card for placement by selecting or deselecting it and updating
     the UI accordingly.
 
     @param self - The instance of the Controller class
@@ -221,56 +420,61 @@ class Controller:
     @author Mike
     '''
     def prepareCardPlacement(self, cardIndex, cardLabel):
-        card = self.players[self.currentPlayerIndex].hand[cardIndex]
+        player = self.players[self.engine.currentPlayerIndex]
+        cards = player.activeZone()
+        card = cards[cardIndex]
         if (card, cardLabel) in self.selectedCards:
             self.selectedCards.remove((card, cardLabel))
-            cardLabel.setStyleSheet("border: 0px solid black; background-color: transparent;") 
+            self.view.setCardSelected(cardLabel, False)
         else:
             self.selectedCards.append((card, cardLabel))
-            cardLabel.setStyleSheet("border: 0px solid black; background-color: blue;") 
-        
+            self.view.setCardSelected(cardLabel, True)
+
         # Enable all buttons with the same rank, disable the rest
-        selectedCardRank = card[0]
+        selectedCardRank = rankOf(card)
+        blind = player.isBlind()
         if not self.selectedCards:
             for i, lbl in enumerate(self.playCardButtons):
-                handCard = self.players[self.currentPlayerIndex].hand[i]
-                if handCard[3] or self.isCardPlayable(handCard):  
+                handCard = cards[i]
+                if blind or self.engine.isCardPlayable(handCard):
                     lbl.setEnabled(True)
         else:
             for i, lbl in enumerate(self.playCardButtons):
-                handCard = self.players[self.currentPlayerIndex].hand[i]
-                if handCard[0] == selectedCardRank or (handCard, lbl) in self.selectedCards:
+                handCard = cards[i]
+                if (handCard, lbl) in self.selectedCards or (not blind and rankOf(handCard) == selectedCardRank):
                     lbl.setEnabled(True)
-                elif not handCard[3]:  
+                else:
                     lbl.setEnabled(False)
-        self.view.placeButton.setEnabled(len(self.selectedCards) > 0)  
+        self.view.placeButton.setEnabled(len(self.selectedCards) > 0)
         if self.view.placeButton.text() == "Place":
             self.view.placeButton.setText("Select A Card")
         else:
             self.view.placeButton.setText("Place")
-    
+
     '''
-    Checks if a card is playable based on the top card of the pile and the 
-    sevenSwitch flag.
+    Places the selected cards onto the pile and renders the outcome of the
+    human player's turn.
 
     @param self - The instance of the Controller class
-    @param card (tuple) - The card to check
 
-    @return (bool) - True if the card is playable, False otherwise
+    @return None
 
     @author Mike
     '''
-    def isCardPlayable(self, card):
-        topCard = self.pile[-1] if self.pile else None
-        if self.players[self.currentPlayerIndex].sevenSwitch:
-            return VALUES[card[0]] <= 7 or card[0] in ['2', '10']
-        if not topCard:
-            return True 
-        return card[0] == '2' or card[0] == '10' or VALUES[card[0]] >= VALUES[topCard[0]]
-    
+    def placeCard(self):
+        if self.busy:
+            return
+        player = self.players[self.engine.currentPlayerIndex]
+        cards = player.activeZone()
+        selectedCards = sorted(self.selectedCards, key=lambda x: cards.index(x[0]))
+        self.selectedCards = []
+        result = self.engine.apply([card for card, _ in selectedCards])
+        self.renderResult(result)
+
     '''
-    Places the selected cards onto the pile and handles the game logic for 
-    the current player's turn.
+    Handles the AI player's turn by asking for its move on a worker thread.
+    The move comes back through applyAIMove, so the GUI thread keeps running
+    however long the AI thinks.
 
     @param self - The instance of the Controller class
 
@@ -278,103 +482,41 @@ class Controller:
 
     @author Mike
     '''
-    def placeCard(self):
-        player = self.players[self.currentPlayerIndex]
-        playedCards = []
-        pickUp = False
-
-        for card, button in sorted(self.selectedCards, key=lambda x: player.hand.index(x[0])):
-            if card[3] and not self.isCardPlayable(card):
-                playedCards.append(card)
-                for i, card in enumerate(playedCards):
-                    self.pile.append(player.hand.pop(player.hand.index(playedCards[i])))
-                    self.pile[-1] = (card[0], card[1], card[2], False)
-                    self.view.revealCard(button, card)
-                pickUp = True
-                button.setParent(None) 
-                button.deleteLater() 
-            else:
-                playedCards.append(card)
-                for i, card in enumerate(playedCards):
-                    if card[3]: 
-                        playedCards[i] = (card[0], card[1], card[2], False) 
-                player.playCard(player.hand.index(card), self.pile)
-                self.view.revealCard(button, card)
-                button.setParent(None)
-                button.deleteLater()  
-                
-        if pickUp:
-            topCard = self.pile[-1]
-            pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.view.pileLabel.setPixmap(pixmap)
-            QCoreApplication.processEvents()
-            time.sleep(1)      
-            self.pickUpPile()
-            for card in reversed(player.hand):
-                if card[3]:
-                    player.bottomCards.append(player.hand.pop(player.hand.index(card)))
-            self.view.updatePlayerHand(player.hand)
-            self.view.updateBottomCardButtons(player.bottomCards)
-            self.view.setPlayerHandEnabled(False)
-            self.view.placeButton.setText("AI Turn...")
-            return
-
-        self.selectedCards = []
-        print(f"{player.name} plays {', '.join([f'{card[0]} of {card[1]}' for card in playedCards])}")
+    def AIPlayTurn(self):
+        self.busy = True
+        self.aiToken += 1
+        self.aiStartTime = time.perf_counter()
+        QThreadPool.globalInstance().start(AIMoveTask(self.engine.snapshot(), self.aiToken, self.aiSignals))
 
-        # Draw cards if fewer than 3 in hand
-        while len(player.hand) < 3 and self.deck:
-            player.hand.append(self.deck.pop(0))
+    '''
+    Receives an AI move from the worker thread and applies it once the AI
+    has been thinking for at least aiDelayMs, so quick moves can still be
+    followed. Moves asked for by an earlier request are ignored.
 
-        self.view.updatePlayerHand(player.hand) 
+    @param self - The instance of the Controller class
+    @param token (int) - The request the move answers
+    @param move (list) - The cards to play, PICK_UP, or the exception raised while choosing, see recoverFromAIError
 
-        self.updatePlayableCards()
+    @return None
 
-        if self.checkFourOfAKind():
-            print("Four of a kind! Clearing the pile.")
-            self.pile.clear()
-            self.view.pileLabel.setText("Bombed")
-            self.updateUI()
-            gameOver = self.checkGameState()
+    @author Mike
+    '''
+    def applyAIMove(self, token, move):
+        if token != self.aiToken:
             return
+        if isinstance(move, Exception):
+            self.busy = False
+            self.recoverFromAIError(move)
+            return
+        elapsedMs = int((time.perf_counter() - self.aiStartTime) * 1000)
+        QTimer.singleShot(max(0, self.aiDelayMs - elapsedMs), lambda: self.renderResult(self.engine.apply(move)))
 
-        if '2' in [card[0] for card in playedCards]:
-            self.players[self.currentPlayerIndex].sevenSwitch = False
-            topCard = self.pile[-1]
-            pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.view.pileLabel.setPixmap(pixmap)
-            self.updateUI()
-            gameOver = self.checkGameState()
-            if gameOver:
-                return
-        elif '10' in [card[0] for card in playedCards]:
-            self.pile.clear()
-            self.players[self.currentPlayerIndex].sevenSwitch = False
-            self.view.pileLabel.setText("Bombed")
-            self.updateUI()
-            gameOver = self.checkGameState()
-            if gameOver:
-                return
-        else:
-            if '7' in [card[0] for card in playedCards]:
-                self.players[(self.currentPlayerIndex + 1) % len(self.players)].sevenSwitch = True
-            else:
-                self.players[(self.currentPlayerIndex + 1) % len(self.players)].sevenSwitch = False
-            self.view.placeButton.setEnabled(False)
-            topCard = self.pile[-1]
-            pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.view.pileLabel.setPixmap(pixmap)
-            self.updateUI()
-            gameOver = self.checkGameState()
-            if gameOver:
-                return
-            self.changeTurn()
-            self.view.setPlayerHandEnabled(False)
-            self.view.placeButton.setText("Opponent's Turn...")
-            
     '''
-    Handles the AI player's turn, determining and executing the best move 
-    based on the difficulty level and game state.
+    Works out a batch of turns on a worker thread with no pacing, animation
+    or rendering, see FastForwardTask. The worker plays on a snapshot of the
+    game, so the table can still be drawn from the engine meanwhile. The
+    moves are applied and the table drawn once the batch comes back to
+    applyFastForward.
 
     @param self - The instance of the Controller class
 
@@ -382,192 +524,134 @@ class Controller:
 
     @author Mike
     '''
-    def AIPlayTurn(self):
-        time.sleep(1)
-        AIPlayer = self.players[self.currentPlayerIndex]
-        AI_Index = self.players.index(AIPlayer)
-        playerTopCards = self.players[0].topCards
-        playerHand = self.players[0].hand
-        playerBottomCards = self.players[0].bottomCards
-        playedCards = []
-        pickUp = False
-
-        if self.difficulty == 'impossible':
-            cardsToPlay = AIPlayer.playTurn(self.pile, len(self.deck), playerTopCards, playerHand, playerBottomCards)
-        else:
-            cardsToPlay = AIPlayer.playTurn(self.pile, len(self.deck), playerTopCards)
-
-        if cardsToPlay == -1:
-            self.pickUpPile()
-            time.sleep(1)
-            return
-
-        for card in cardsToPlay:
-            cardIndex = AIPlayer.hand.index(card)
-            AI_HandLayout = getattr(self.view, f'AIHandLayout{AI_Index}')
-            cardLabel = AI_HandLayout.itemAt(cardIndex).widget()
-            if card[3] and not self.isCardPlayable(card):
-                playedCards.append(card)
-                for i, card in enumerate(playedCards):
-                    self.pile.append(AIPlayer.hand.pop(AIPlayer.hand.index(playedCards[i])))
-                    self.pile[-1] = (card[0], card[1], card[2], False)
-                    self.view.revealCard(cardLabel, card)
-                pickUp = True
-                cardLabel.setParent(None)
-                cardLabel.deleteLater()
-            else:
-                playedCards.append(card)
-                self.pile.append(AIPlayer.hand.pop(AIPlayer.hand.index(card)))
-                self.pile[-1] = (card[0], card[1], False, False)
-                self.view.revealCard(cardLabel, card)
-                cardLabel.setParent(None)
-                cardLabel.deleteLater()
-
-        if pickUp:
-            topCard = self.pile[-1]
-            pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.view.pileLabel.setPixmap(pixmap)
-            self.pickUpPile()
-            for card in reversed(AIPlayer.hand):
-                if card[3]:
-                    AIPlayer.bottomCards.append(AIPlayer.hand.pop(AIPlayer.hand.index(card)))
-            self.view.updateAIHand(AIPlayer.hand, AI_Index)
-            self.view.updateAIBottomCardButtons(AIPlayer.bottomCards, AI_Index)
-            time.sleep(1)
-            return
-
-        print(f"{AIPlayer.name} plays {', '.join([f'{card[0]} of {card[1]}' for card in playedCards])}")
+    def fastForwardTurns(self):
+        self.busy = True
+        self.aiToken += 1
+        for _, cardLabel in self.selectedCards:
+            self.view.setCardSelected(cardLabel, False)
+        self.selectedCards = []
+        self.view.setPlayerHandEnabled(False)
+        self.view.placeButton.setText("Fast Forward...")
+        self.view.placeButton.setEnabled(False)
+        self.view.pickUpPileButton.setDisabled(True)
+        standIn = None
+        if self.autoPlay:
+            if self.standIn is None:
+                self.standIn = AIPlayer(self.players[0].name, self.difficulty)
+            standIn = self.standIn
+        self.fastForwardStop.clear()
+        QThreadPool.globalInstance().start(FastForwardTask(self.engine.snapshot(), self.aiToken, self.aiSignals,
+                                                           FAST_FORWARD_TURNS, self.fastForwardStop, standIn))
+
+    '''
+    Receives a fast-forward batch from the worker thread, applies its moves
+    to the game, draws the table as the batch left it, and carries on with
+    the next turn, which is another batch while fast forward is still on.
 
-        while len(AIPlayer.hand) < 3 and self.deck:
-            AIPlayer.hand.append(self.deck.pop(0))
+    @param self - The instance of the Controller class
+    @param token (int) - The request the batch answers
+    @param moves (list) - The moves of the batch in order, or the exception raised while choosing them
 
-        self.view.updateAIHand(AIPlayer.hand, AI_Index)
+    @return None
 
-        if self.checkFourOfAKind():
-            print("Four of a kind! Clearing the pile.")
-            self.pile.clear()
-            self.view.pileLabel.setText("Bombed")
-            self.updateUI()
-            gameOver = self.checkGameState()
-            time.sleep(1)
+    @author Mike
+    '''
+    def applyFastForward(self, token, moves):
+        if token != self.aiToken:
             return
-
-        if '2' in [card[0] for card in playedCards]:
-            self.players[self.currentPlayerIndex].sevenSwitch = False
-            if self.pile:
-                topCard = self.pile[-1]
-                pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                self.view.pileLabel.setPixmap(pixmap)
-            else:
-                self.view.pileLabel.setText("Pile: Empty")
-            self.updateUI()
-            gameOver = self.checkGameState()
-            time.sleep(1)
+        self.busy = False
+        if isinstance(moves, Exception):
+            for button in (self.view.fastForwardButton, self.view.autoPlayButton):
+                button.blockSignals(True)
+                button.setChecked(False)
+                button.blockSignals(False)
+            self.fastForward = False
+            self.autoPlay = False
+            self.recoverFromAIError(moves)
             return
-        elif '10' in [card[0] for card in playedCards]:
-            self.pile.clear()
-            self.players[self.currentPlayerIndex].sevenSwitch = False
-            self.view.pileLabel.setText("Bombed")
-            self.updateUI()
-            gameOver = self.checkGameState()
-            time.sleep(1)
+        for move in moves:
+            self.engine.apply(move)
+        self.skippedTurns += len(moves)
+        self.view.fastForwardButton.setText(f"Fast Forward ({self.skippedTurns} turns skipped)")
+        print(f"Fast-forwarded {len(moves)} turns, {self.skippedTurns} in all")
+        self.renderState()
+        if self.engine.isTerminal():
+            self.showWinner(self.players[self.engine.winner])
             return
-        else:
-            if '7' in [card[0] for card in playedCards]:
-                self.players[(self.currentPlayerIndex + 1) % len(self.players)].sevenSwitch = True
-            else:
-                self.players[(self.currentPlayerIndex + 1) % len(self.players)].sevenSwitch = False
-            self.view.placeButton.setEnabled(False)
-            topCard = self.pile[-1]
-            pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.view.pileLabel.setPixmap(pixmap)
-            self.updateUI()
-            gameOver = self.checkGameState()
-            if gameOver:
-                return
-            self.changeTurn()
+        self.scheduleTurn()
 
     '''
-    Changes the turn to the next player and updates the game state.
+    Handles an AI that failed to choose a move, so the game carries on
+    instead of waiting for a move that will never come. The error is logged
+    and shown, and the AI plays a safe move in its place: it picks up the
+    pile, or plays its first legal card when the pile is empty. A human
+    seat is handed back to the player instead.
 
     @param self - The instance of the Controller class
+    @param error (Exception) - The exception raised while choosing the move
 
     @return None
 
     @author Mike
     '''
-    def changeTurn(self):
-        self.currentPlayerIndex = (self.currentPlayerIndex + 1) % len(self.players)
-        if self.currentPlayerIndex == 0:
-            self.view.placeButton.setText("Select A Card")
-        self.selectedCards = [] 
-        self.updateUI()
+    def recoverFromAIError(self, error):
+        traceback.print_exception(error)
+        player = self.players[self.engine.currentPlayerIndex]
+        if not isinstance(player, AIPlayer):
+            QMessageBox.warning(self.view, "Palace", f"The AI stopped playing for you, it is your turn.\n\n{error}")
+            self.renderState()
+            return
+        move = PICK_UP if self.engine.pile else self.engine.legalMoves()[0]
+        action = "picks up the pile" if move == PICK_UP else "plays its first card"
+        QMessageBox.warning(self.view, "Palace", f"{player.name} could not choose a move and {action}.\n\n{error}")
+        self.renderResult(self.engine.apply(move))
 
     '''
-    Checks if the top four cards in the pile are of the same rank, indicating 
-    a bomb.
+    Draws the whole table from the engine, for after turns that were played
+    without being rendered or when every card has to be drawn again. The
+    controls are left alone while a move is being shown or once the game is
+    over.
 
     @param self - The instance of the Controller class
 
-    @return (bool) - True if the top four cards are of the same rank, False otherwise
+    @return None
 
     @author Mike
     '''
-    def checkFourOfAKind(self):
-        if len(self.pile) < 4:
-            return False
-        return len(set(card[0] for card in self.pile[-4:])) == 1
+    def renderState(self):
+        for playerIndex in range(len(self.players)):
+            self.updateSeat(playerIndex)
+        if self.engine.pile:
+            self.updatePileLabel()
+        else:
+            self.view.pileLabel.setText("Pile: Empty")
+            self.view.pileLabel.setToolTip("")
+        if self.busy or self.engine.isTerminal():
+            return
+        self.updateUI()
+        if isinstance(self.players[self.engine.currentPlayerIndex], AIPlayer):
+            self.view.setPlayerHandEnabled(False)
 
     '''
-    Checks the game state to determine if a player has won or if the game 
-    should continue.
+    Stops the game and shows the winner.
 
     @param self - The instance of the Controller class
+    @param winner (Player) - The player who won
 
-    @return (bool) - True if the game is over, False otherwise
+    @return None
 
     @author Mike
     '''
-    def checkGameState(self):
-        gameOver = False
-        currentPlayer = self.players[self.currentPlayerIndex]
-        if not currentPlayer.hand and not self.deck:
-            if currentPlayer.topCards:
-                currentPlayer.hand = currentPlayer.topCards
-                currentPlayer.topCards = []
-                if isinstance(currentPlayer, AIPlayer):
-                    AI_Index = self.players.index(currentPlayer)
-                    self.view.updateAIHand(currentPlayer.hand, AI_Index)
-                    self.view.updateAITopCardButtons(currentPlayer.topCards, AI_Index)
-                else:
-                    self.view.updatePlayerHand(currentPlayer.hand)
-                    self.view.updateTopCardButtons(currentPlayer.topCards)
-            elif currentPlayer.bottomCards:
-                currentPlayer.hand = currentPlayer.bottomCards
-                currentPlayer.bottomCards = []
-                if isinstance(currentPlayer, AIPlayer):
-                    AI_Index = self.players.index(currentPlayer)
-                    self.view.updateAIHand(currentPlayer.hand, AI_Index)
-                    self.view.updateAIBottomCardButtons(currentPlayer.bottomCards, AI_Index)
-                else:
-                    self.view.updatePlayerHand(currentPlayer.hand)
-                    self.view.updateBottomCardButtons(currentPlayer.bottomCards)
-            elif not currentPlayer.bottomCards:
-                placeholder = QLabel()
-                placeholder.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-                currentPlayer.hand.append(placeholder)
-                self.timer.stop()
-                self.view.currentPlayerLabel.setText(f"{currentPlayer.name} wins!")
-                self.view.pickUpPileButton.setDisabled(True)
-                self.view.placeButton.setDisabled(True)
-                for button in self.playCardButtons:
-                    button.setDisabled(True)
-                print(f"{currentPlayer.name} wins!")
-                gameOver = True
-        return gameOver
-    
-    '''
-    Updates the playable cards for the current player based on the top card 
+    def showWinner(self, winner):
+        self.view.currentPlayerLabel.setText(f"{winner.name} wins!")
+        self.view.pickUpPileButton.setDisabled(True)
+        self.view.placeButton.setDisabled(True)
+        for button in self.playCardButtons:
+            button.setEnabled(False)
+        print(f"{winner.name} wins!")
+
+    '''
+    Updates the playable cards for the current player based on the top card
     of the pile and the sevenSwitch flag.
 
     @param self - The instance of the Controller class
@@ -578,9 +662,11 @@ class Controller:
     '''
     def updatePlayableCards(self):
         currentPlayer = self.players[0]
+        cards = currentPlayer.activeZone()
+        blind = currentPlayer.isBlind()
         for i, lbl in enumerate(self.playCardButtons):
-            handCard = currentPlayer.hand[i]
-            if handCard[3] or self.isCardPlayable(handCard):
+            handCard = cards[i]
+            if blind or self.engine.isCardPlayable(handCard, 0):
                 lbl.setEnabled(True)
             else:
-                lbl.setEnabled(False)
\ No newline at end of file
+                lbl.setEnabled(False)
@@ -0,0 +1,76 @@
+from array import array
+from Card import DECK_SIZE
+
+class Deck:
+    '''
+    Initializes the Deck class, the draw deck as one array of encoded cards
+    with a cursor. Drawing and dealing move the cursor forward instead of
+    removing cards from the front of the array, so both are O(1) per card.
+
+    @param self - The instance of the Deck class
+    @param cards (iterable) - The cards in draw order, a full ordered deck by default
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, cards=range(DECK_SIZE)):
+        self.cards = array('B', cards)
+        self.position = 0
+
+    '''
+    Gets the number of cards left to draw.
+
+    @param self - The instance of the Deck class
+
+    @return (int) - The number of cards remaining
+
+    @author Mike
+    '''
+    def __len__(self):
+        return len(self.cards) - self.position
+
+    '''
+    Shuffles the cards that are left to draw.
+
+    @param self - The instance of the Deck class
+    @param rng (Random) - The random source to shuffle with
+
+    @return None
+
+    @author Mike
+    '''
+    def shuffle(self, rng):
+        if self.position:
+            self.cards = self.cards[self.position:]
+            self.position = 0
+        rng.shuffle(self.cards)
+
+    '''
+    Draws the next card.
+
+    @param self - The instance of the Deck class
+
+    @return card (int) - The card drawn
+
+    @author Mike
+    '''
+    def draw(self):
+        card = self.cards[self.position]
+        self.position += 1
+        return card
+
+    '''
+    Deals the next cards in draw order.
+
+    @param self - The instance of the Deck class
+    @param count (int) - The number of cards to deal
+
+    @return cards (array) - The cards dealt
+
+    @author Mike
+    '''
+    def deal(self, count):
+        cards = self.cards[self.position:self.position + count]
+        self.position += len(cards)
+        return cards
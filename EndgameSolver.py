@@ -0,0 +1,470 @@
+'''
+Endgame solver for 2-player games once the draw deck is empty.
+
+With the deck gone every card that is not a bottom card has been seen, so a
+player counting cards knows both hands, both sets of top cards and the pile.
+The only hidden information is which bottom card is where, and the unseen
+cards are exactly the bottom cards still on the table, so each blind flip is
+a uniform draw from that pool whoever flips it. The solver searches that
+game tree with negamax alpha-beta over the players' moves and expectimax
+over blind flips, using iterative deepening so it always has a move ready
+when its time or node budget runs out.
+
+States are rank histograms from the point of view of the player to move,
+which makes them canonical: suits, card order and seat number never split a
+position into two table entries. Values are the mover's chance of winning,
+with a card-count estimate at the depth limit.
+
+    python EndgameSolver.py -n 50 --budget 0.1
+'''
+import argparse
+import time
+from Card import NUM_RANKS, TWO, SEVEN, TEN
+from Rules import BOMB_SIZE, EMPTY_PILE, PLAYABLE_RANKS
+
+PICK_UP = -1  # Same sentinel as GameEngine.PICK_UP
+EXACT, LOWER, UPPER = 0, 1, 2
+CHECK_INTERVAL = 1024  # Nodes between budget checks
+TABLE_LIMIT = 500000  # Entries kept in the transposition table before it is cleared
+
+class SearchTimeout(Exception):
+    '''
+    Raised inside the search when the time or node budget runs out.
+
+    @author Mike
+    '''
+
+'''
+Builds a rank histogram from encoded cards.
+
+@param cards (iterable) - The encoded cards
+
+@return (tuple) - The number of cards of each rank
+
+@author Mike
+'''
+def rankCounts(cards):
+    counts = [0] * NUM_RANKS
+    for card in cards:
+        counts[card >> 2] += 1
+    return tuple(counts)
+
+'''
+Changes one entry of a rank histogram.
+
+@param counts (tuple) - The histogram
+@param rank (int) - The rank to change
+@param delta (int) - The amount to add
+
+@return (tuple) - The new histogram
+
+@author Mike
+'''
+def addCount(counts, rank, delta):
+    return counts[:rank] + (counts[rank] + delta,) + counts[rank + 1:]
+
+'''
+Adds two rank histograms.
+
+@param first (tuple) - A histogram
+@param second (tuple) - Another histogram
+
+@return (tuple) - The sum of both
+
+@author Mike
+'''
+def addCounts(first, second):
+    return tuple(a + b for a, b in zip(first, second))
+
+EMPTY_COUNTS = (0,) * NUM_RANKS
+
+class EndgameSolver:
+    '''
+    Initializes the EndgameSolver class. A solver keeps its transposition
+    table between moves, so each AI should own one for the whole game.
+
+    @param self - The instance of the EndgameSolver class
+    @param timeBudget (float) - Seconds allowed per move, None for no time limit
+    @param nodeBudget (int) - Nodes allowed per move, None for no limit and 0 to disable the solver
+    @param maxDepth (int) - The deepest iteration to search
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, timeBudget=0.1, nodeBudget=None, maxDepth=40):
+        self.timeBudget = timeBudget
+        self.nodeBudget = nodeBudget
+        self.maxDepth = maxDepth
+        self.table = {}
+        self.nodes = 0
+        self.deadline = None
+        self.nodeLimit = None
+        self.lastDepth = 0
+        self.lastValue = 0.5
+        self.totalNodes = 0
+        self.totalTime = 0.0
+        self.searches = 0
+
+    '''
+    Chooses a move for the player to move. The player must not be playing
+    blind, since a blind flip is not a choice.
+
+    @param self - The instance of the EndgameSolver class
+    @param hand (array) - The mover's hand
+    @param topCards (array) - The mover's face-up top cards
+    @param bottomCards (array) - The mover's face-down bottom cards
+    @param opponentHand (array) - The opponent's hand
+    @param opponentTopCards (array) - The opponent's face-up top cards
+    @param opponentBottomCards (array) - The opponent's face-down bottom cards
+    @param pile (Pile) - The current pile
+    @param sevenSwitch (bool) - Whether the mover is restricted to 7 or lower
+
+    @return (tuple | int | None) - (rank, count) to play, PICK_UP, or None if no search finished in budget
+
+    @author Mike
+    '''
+    def chooseMove(self, hand, topCards, bottomCards, opponentHand, opponentTopCards, opponentBottomCards,
+                   pile, sevenSwitch):
+        if self.nodeBudget == 0:
+            return None
+        pool = addCounts(rankCounts(bottomCards), rankCounts(opponentBottomCards))
+        state = (bool(sevenSwitch), rankCounts(hand), rankCounts(opponentHand), rankCounts(topCards),
+                 rankCounts(opponentTopCards), len(bottomCards), len(opponentBottomCards),
+                 rankCounts(pile), pile.topRank, pile.run, pool)
+        return self.search(state)
+
+    '''
+    Runs iterative deepening on a state until the budget runs out or the
+    result is proven.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+
+    @return bestMove (tuple | int | None) - The best move of the deepest finished iteration
+
+    @author Mike
+    '''
+    def search(self, state):
+        startTime = time.perf_counter()
+        self.nodes = 0
+        self.deadline = startTime + self.timeBudget if self.timeBudget is not None else None
+        self.nodeLimit = self.nodeBudget
+        if len(self.table) > TABLE_LIMIT:
+            self.table.clear()
+
+        bestMove = None
+        self.lastDepth = 0
+        try:
+            for depth in range(1, self.maxDepth + 1):
+                value, move = self.searchRoot(state, depth)
+                bestMove = move
+                self.lastDepth = depth
+                self.lastValue = value
+                if value in (0.0, 1.0):
+                    break  # Proven win or loss, deeper iterations cannot change it
+        except SearchTimeout:
+            pass
+        self.totalNodes += self.nodes
+        self.totalTime += time.perf_counter() - startTime
+        self.searches += 1
+        return bestMove
+
+    '''
+    Searches the root with a full window and returns the best move as well
+    as its value.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+    @param depth (int) - The remaining depth
+
+    @return (tuple) - The value for the mover and the best move
+
+    @author Mike
+    '''
+    def searchRoot(self, state, depth):
+        entry = self.table.get(state)
+        bestValue, bestMove = -1.0, None
+        for move in self.orderedMoves(state, entry[3] if entry is not None else None):
+            value = self.moveValue(state, move, depth, max(bestValue, 0.0), 1.0)
+            if value > bestValue:
+                bestValue, bestMove = value, move
+        self.table[state] = (depth, bestValue, EXACT, bestMove)
+        return bestValue, bestMove
+
+    '''
+    Negamax alpha-beta search of a state where the mover chooses a move.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+    @param depth (int) - The remaining depth
+    @param alpha (float) - The lower bound of the window
+    @param beta (float) - The upper bound of the window
+
+    @return (float) - The mover's chance of winning
+
+    @author Mike
+    '''
+    def negamax(self, state, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes % CHECK_INTERVAL:
+            self.checkBudget()
+
+        if depth <= 0:
+            return self.evaluate(state)
+
+        entry = self.table.get(state)
+        if entry is not None and entry[0] >= depth:
+            _, value, flag, _ = entry
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                return value
+
+        _, hand, _, top, _, bottom, _, _, _, _, _ = state
+        if not any(hand) and not any(top):
+            value = self.blindValue(state, depth)
+            self.table[state] = (depth, value, EXACT, None)
+            return value
+
+        originalAlpha = alpha
+        bestValue, bestMove = -1.0, None
+        for move in self.orderedMoves(state, entry[3] if entry is not None else None):
+            value = self.moveValue(state, move, depth, alpha, beta)
+            if value > bestValue:
+                bestValue, bestMove = value, move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        flag = UPPER if bestValue <= originalAlpha else LOWER if bestValue >= beta else EXACT
+        self.table[state] = (depth, bestValue, flag, bestMove)
+        return bestValue
+
+    '''
+    Values a blind flip as the average over every card left in the pool.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state, with the mover on bottom cards
+    @param depth (int) - The remaining depth
+
+    @return (float) - The mover's chance of winning
+
+    @author Mike
+    '''
+    def blindValue(self, state, depth):
+        seven, hand, oHand, top, oTop, bottom, oBottom, pile, topRank, run, pool = state
+        total = sum(pool)
+        playable = PLAYABLE_RANKS[seven][topRank]
+        expected = 0.0
+        for rank in range(NUM_RANKS):
+            if not pool[rank]:
+                continue
+            drawn = (seven, hand, oHand, top, oTop, bottom - 1, oBottom, pile, topRank, run,
+                     addCount(pool, rank, -1))
+            if playable >> rank & 1:
+                value = self.playValue(drawn, rank, 1, 2, depth)
+            else:
+                # The flipped card goes on the pile and the whole pile is picked up
+                picked = addCounts(addCount(pile, rank, 1), hand)
+                value = 1.0 - self.negamax((False, oHand, picked, oTop, top, oBottom, bottom - 1, EMPTY_COUNTS,
+                                            EMPTY_PILE, 0, drawn[10]), depth - 1, 0.0, 1.0)
+            expected += pool[rank] * value
+        return expected / total
+
+    '''
+    Gets the value of one move for the mover.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+    @param move (tuple | int) - (rank, count) or PICK_UP
+    @param depth (int) - The remaining depth
+    @param alpha (float) - The lower bound of the window
+    @param beta (float) - The upper bound of the window
+
+    @return (float) - The mover's chance of winning after the move
+
+    @author Mike
+    '''
+    def moveValue(self, state, move, depth, alpha, beta):
+        seven, hand, oHand, top, oTop, bottom, oBottom, pile, topRank, run, pool = state
+        if move == PICK_UP:
+            return 1.0 - self.negamax((False, oHand, addCounts(hand, pile), oTop, top, oBottom, bottom,
+                                       EMPTY_COUNTS, EMPTY_PILE, 0, pool), depth - 1, 1.0 - beta, 1.0 - alpha)
+        rank, count = move
+        zone = 0 if any(hand) else 1
+        return self.playValue(state, rank, count, zone, depth, alpha, beta)
+
+    '''
+    Gets the value of playing cards of one rank from a zone, following the
+    same rules as GameEngine.apply with an empty deck.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+    @param rank (int) - The rank played
+    @param count (int) - How many cards are played
+    @param zone (int) - 0 for the hand, 1 for the top cards, 2 for a bottom card already taken out
+    @param depth (int) - The remaining depth
+    @param alpha (float) - The lower bound of the window
+    @param beta (float) - The upper bound of the window
+
+    @return (float) - The mover's chance of winning after the play
+
+    @author Mike
+    '''
+    def playValue(self, state, rank, count, zone, depth, alpha=0.0, beta=1.0):
+        seven, hand, oHand, top, oTop, bottom, oBottom, pile, topRank, run, pool = state
+        if zone == 0:
+            hand = addCount(hand, rank, -count)
+        elif zone == 1:
+            top = addCount(top, rank, -count)
+        if not bottom and not any(hand) and not any(top):
+            return 1.0
+
+        run = run + count if rank == topRank else count
+        if run >= BOMB_SIZE or rank == TEN:
+            return self.negamax((False, hand, oHand, top, oTop, bottom, oBottom, EMPTY_COUNTS, EMPTY_PILE, 0, pool),
+                                depth - 1, alpha, beta)
+        pile = addCount(pile, rank, count)
+        if rank == TWO:
+            return self.negamax((False, hand, oHand, top, oTop, bottom, oBottom, pile, rank, run, pool),
+                                depth - 1, alpha, beta)
+        return 1.0 - self.negamax((rank == SEVEN, oHand, hand, oTop, top, oBottom, bottom, pile, rank, run, pool),
+                                  depth - 1, 1.0 - beta, 1.0 - alpha)
+
+    '''
+    Lists the mover's moves, best guesses first: the table's best move, then
+    plays that finish a bomb, then ordinary ranks from the lowest up with all
+    copies before fewer, then 10s and 2s, and picking up last.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+    @param hashMove (tuple | int) - The best move stored for this state, if any
+
+    @return moves (list) - The moves in search order
+
+    @author Mike
+    '''
+    def orderedMoves(self, state, hashMove=None):
+        seven, hand, _, top, _, _, _, pile, topRank, run, _ = state
+        zone = hand if any(hand) else top
+        playable = PLAYABLE_RANKS[seven][topRank]
+        bombs, plain, special = [], [], []
+        for rank in range(NUM_RANKS):
+            held = zone[rank]
+            if not held or not playable >> rank & 1:
+                continue
+            for count in range(held, 0, -1):
+                if rank == topRank and run + count >= BOMB_SIZE:
+                    bombs.append((rank, count))
+                elif rank == TEN or rank == TWO:
+                    special.append((rank, count))
+                else:
+                    plain.append((rank, count))
+        special.sort(key=lambda move: move[0] == TWO)
+        moves = bombs + plain + special
+        if topRank != EMPTY_PILE:
+            moves.append(PICK_UP)
+        if hashMove is not None and hashMove in moves:
+            moves.remove(hashMove)
+            moves.insert(0, hashMove)
+        return moves
+
+    '''
+    Estimates the mover's chance of winning from how many cards each player
+    has left.
+
+    @param self - The instance of the EndgameSolver class
+    @param state (tuple) - The mover-relative state
+
+    @return (float) - A value strictly between 0 and 1
+
+    @author Mike
+    '''
+    def evaluate(self, state):
+        _, hand, oHand, top, oTop, bottom, oBottom, _, _, _, _ = state
+        mine = sum(hand) + sum(top) + bottom
+        theirs = sum(oHand) + sum(oTop) + oBottom
+        return 0.5 + 0.45 * (theirs - mine) / (theirs + mine)
+
+    '''
+    Stops the search once the time or node budget is spent.
+
+    @param self - The instance of the EndgameSolver class
+
+    @return None
+
+    @author Mike
+    '''
+    def checkBudget(self):
+        if self.nodeLimit is not None and self.nodes >= self.nodeLimit:
+            raise SearchTimeout
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+
+    '''
+    Gets the solver's throughput over every search it has run.
+
+    @param self - The instance of the EndgameSolver class
+
+    @return (float) - Nodes searched per second
+
+    @author Mike
+    '''
+    def nodesPerSecond(self):
+        return self.totalNodes / self.totalTime if self.totalTime else 0.0
+
+'''
+Plays 2-player games with heuristic AIs until the deck runs out and the
+player to move is not blind, giving positions to benchmark the solver on.
+
+@param numPositions (int) - The number of positions to collect
+@param seed (int) - The base seed
+
+@return positions (list) - (engine, player index) pairs
+
+@author Mike
+'''
+def collectPositions(numPositions, seed):
+    from Simulator import createGame
+    positions = []
+    gameIndex = 0
+    while len(positions) < numPositions:
+        engine, _ = createGame(['medium', 'medium'], seed, gameIndex, True)
+        gameIndex += 1
+        while not engine.isTerminal() and engine.turnCount < 1000:
+            player = engine.players[engine.currentPlayerIndex]
+            if not engine.deck and not player.isBlind() and engine.pile:
+                positions.append((engine, engine.currentPlayerIndex))
+                break
+            engine.apply(engine.chooseAIMove())
+    return positions
+
+'''
+Benchmarks the solver on endgame positions and prints its throughput.
+
+@return None
+
+@author Mike
+'''
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Palace endgame solver.")
+    parser.add_argument("-n", "--positions", type=int, default=50, help="number of endgame positions")
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds per move")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the games the positions come from")
+    args = parser.parse_args()
+
+    depths = []
+    solver = EndgameSolver(timeBudget=args.budget)
+    for engine, playerIndex in collectPositions(args.positions, args.seed):
+        player = engine.players[playerIndex]
+        opponent = engine.players[1 - playerIndex]
+        solver.table.clear()
+        solver.chooseMove(player.hand, player.topCards, player.bottomCards, opponent.hand, opponent.topCards,
+                          opponent.bottomCards, engine.pile, player.sevenSwitch)
+        depths.append(solver.lastDepth)
+    print(f"Solved {solver.searches} positions with a {args.budget:.3f} s budget")
+    print(f"Nodes: {solver.totalNodes}    Time: {solver.totalTime:.2f} s    "
+          f"Nodes/s: {solver.nodesPerSecond():.0f}    Mean depth: {sum(depths) / len(depths):.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,417 @@
+import copy
+import random
+from array import array
+from AIPlayer import AIPlayer
+from Card import NUM_RANKS, TWO, SEVEN, TEN, rankOf
+from Deck import Deck
+from Pile import Pile
+from Player import HAND, BOTTOM_CARDS
+from Rules import BOMB_SIZE, PLAYABLE, playableRankMask
+
+PICK_UP = -1  # Same sentinel AIPlayer.playTurn returns when it wants the pile
+
+class MoveResult:
+    '''
+    Initializes the MoveResult class, which records everything that happened
+    while a move was applied so the Controller can render it afterwards.
+
+    @param self - The instance of the MoveResult class
+    @param playerIndex (int) - The index of the player who made the move
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, playerIndex):
+        self.playerIndex = playerIndex
+        self.playedFrom = None  # The zone the player was playing from when the move started
+        self.playedCards = []
+        self.playedPositions = []  # Where each played card was in playedFrom when it was removed
+        self.drawnCards = []
+        self.pickedUpCards = []
+        self.clearedCards = []  # The cards a bomb took off the pile
+        self.pickedUp = False
+        self.blindFailed = False  # A bottom card was flipped and could not be played
+        self.fourOfAKind = False
+        self.bombed = False  # The pile was cleared by a 10 or four of a kind
+        self.turnChanged = False
+        self.gameOver = False
+        self.changedZones = set()  # (playerIndex, HAND/TOP_CARDS/BOTTOM_CARDS) of every zone the move changed
+        self.pileChanged = False
+        self.deckChanged = False
+
+class GameEngine:
+    '''
+    Initializes the GameEngine class, the headless Palace rules engine. It
+    owns the deck, the pile, the players and the turn order, and has no
+    dependency on PySide6 so whole games can be simulated without a window.
+
+    @param self - The instance of the GameEngine class
+    @param players (list) - The Player/AIPlayer instances, in turn order
+    @param seed (int) - Optional seed for the deck shuffle
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, players, seed=None):
+        self.players = players
+        self.rng = random.Random(seed)
+        self.deck = Deck(())
+        self.pile = Pile()
+        self.currentPlayerIndex = 0
+        self.winner = None
+        self.turnCount = 0
+        self.pickUpCounts = [0] * len(players)
+        self.bombCounts = [0] * len(players)
+        self.discarded = array('B')  # Cards cleared off the pile by bombs, out of the game for good
+        self.knownCards = [set() for _ in players]  # Cards every player saw go into each hand by a pickup
+
+    '''
+    Creates, shuffles and deals a fresh deck to every player.
+
+    @param self - The instance of the GameEngine class
+
+    @return None
+
+    @author Mike
+    '''
+    def setupGame(self):
+        self.deck = self.createDeck()
+        self.deck.shuffle(self.rng)
+        self.pile = Pile()
+        self.discarded = array('B')
+        self.knownCards = [set() for _ in self.players]
+        self.dealInitialCards()
+
+    '''
+    Creates a standard deck of cards.
+
+    @param self - The instance of the GameEngine class
+
+    @return deck (Deck) - The created deck of cards
+
+    @author Mike
+    '''
+    def createDeck(self):
+        return Deck()
+
+    '''
+    Deals the initial cards to all players.
+
+    @param self - The instance of the GameEngine class
+
+    @return None
+
+    @author Mike
+    '''
+    def dealInitialCards(self):
+        for player in self.players:
+            bottomCards = self.deck.deal(3)
+            player.dealCards(self.deck.deal(6), bottomCards)
+
+    '''
+    Moves the chosen cards from a player's hand to their face-up top cards.
+
+    @param self - The instance of the GameEngine class
+    @param playerIndex (int) - The index of the player choosing top cards
+    @param cards (list) - The three cards chosen from the hand
+
+    @return None
+
+    @author Mike
+    '''
+    def selectTopCards(self, playerIndex, cards):
+        self.players[playerIndex].moveToTopCards(cards)
+
+    '''
+    Lets every AI player choose its top cards.
+
+    @param self - The instance of the GameEngine class
+
+    @return None
+
+    @author Mike
+    '''
+    def chooseAITopCards(self):
+        for player in self.players:
+            if isinstance(player, AIPlayer):
+                player.chooseTopCards()
+
+    '''
+    Checks if a card is playable based on the top card of the pile and the
+    sevenSwitch flag.
+
+    @param self - The instance of the GameEngine class
+    @param card (int) - The card to check
+    @param playerIndex (int) - The player to check for, defaults to the current player
+
+    @return (bool) - True if the card is playable, False otherwise
+
+    @author Mike
+    '''
+    def isCardPlayable(self, card, playerIndex=None):
+        if playerIndex is None:
+            playerIndex = self.currentPlayerIndex
+        return PLAYABLE[self.players[playerIndex].sevenSwitch][self.pile.topRank][card >> 2]
+
+    '''
+    Lists every legal move for the current player. A move is either PICK_UP
+    or a list of same-rank cards from the active zone. Bottom cards are
+    played blind one at a time, so each of them is always legal.
+
+    @param self - The instance of the GameEngine class
+
+    @return moves (list) - The legal moves
+
+    @author Mike
+    '''
+    def legalMoves(self):
+        player = self.players[self.currentPlayerIndex]
+        moves = []
+        if self.pile:
+            moves.append(PICK_UP)
+        if player.isBlind():
+            moves.extend([card] for card in player.bottomCards)
+            return moves
+        ranks = player.activeRanks()
+        validMask = ranks.mask & playableRankMask(player.sevenSwitch, self.pile)
+        for rank in range(NUM_RANKS):
+            if validMask >> rank & 1:
+                cards = ranks.cardsOfRank(rank)
+                for count in range(1, len(cards) + 1):
+                    moves.append(cards[:count])
+        return moves
+
+    '''
+    Checks if the game has been won.
+
+    @param self - The instance of the GameEngine class
+
+    @return (bool) - True if a player has won, False otherwise
+
+    @author Mike
+    '''
+    def isTerminal(self):
+        return self.winner is not None
+
+    '''
+    Asks the current AI player for its move given the state of the game.
+    A stand-in AIPlayer can be given to choose the move for a human seat.
+
+    @param self - The instance of the GameEngine class
+    @param standIn (AIPlayer) - Optional AI to choose the move in place of the current player
+
+    @return (list) - The cards to play or PICK_UP
+
+    @author Mike
+    '''
+    def chooseAIMove(self, standIn=None):
+        player = self.players[self.currentPlayerIndex]
+        if standIn is not None:
+            standIn.shareZones(player)
+            player = standIn
+        opponent = self.players[1] if self.currentPlayerIndex == 0 else self.players[0]
+        return player.playTurn(self.pile, len(self.deck), opponent.topCards, opponent.hand, opponent.bottomCards,
+                               self.pile.run, len(self.players), self)
+
+    '''
+    Copies the game so moves can be worked out ahead of it, for example on a
+    worker thread while this game is still being drawn. Each AI player's
+    copy gets its own random source, seeded from the player's on the
+    calling thread, and its own copy of its solver and searcher, so nothing
+    a worker thread changes is shared with this game or another copy. The
+    solver's transposition table is the one exception; it only caches
+    results, so it is shared rather than copied every turn.
+
+    @param self - The instance of the GameEngine class
+
+    @return (GameEngine) - An independent copy of the game
+
+    @author Mike
+    '''
+    def snapshot(self):
+        copies = {}
+        for player in self.players:
+            if isinstance(player, AIPlayer):
+                copies[id(player.rng)] = random.Random(player.rng.getrandbits(64))
+                if player.solver is not None:
+                    copies[id(player.solver)] = copy.copy(player.solver)
+                if player.searcher is not None:
+                    searcher = copy.copy(player.searcher)
+                    searcher.rng = random.Random(player.searcher.rng.getrandbits(64))
+                    copies[id(player.searcher)] = searcher
+        return copy.deepcopy(self, copies)
+
+    '''
+    Applies a move for the current player and advances the game.
+
+    @param self - The instance of the GameEngine class
+    @param move (list) - The cards to play from the active zone, or PICK_UP
+
+    @return result (MoveResult) - What happened as a result of the move
+
+    @author Mike
+    '''
+    def apply(self, move):
+        player = self.players[self.currentPlayerIndex]
+        result = MoveResult(self.currentPlayerIndex)
+        result.playedFrom = player.activeZone()
+        playedFromName = player.activeZoneName()
+        self.turnCount += 1
+
+        if move == PICK_UP:
+            self.pickUpPile(result)
+            return result
+
+        if player.isBlind() and not self.isCardPlayable(move[0]):
+            result.playedPositions.append(player.playCard(move[0], self.pile))
+            result.playedCards.append(move[0])
+            result.blindFailed = True
+            result.changedZones.add((self.currentPlayerIndex, BOTTOM_CARDS))
+            self.pickUpPile(result)
+            return result
+
+        knownCards = self.knownCards[self.currentPlayerIndex]
+        for card in move:
+            result.playedPositions.append(player.playCard(card, self.pile))
+            result.playedCards.append(card)
+            knownCards.discard(card)
+        result.changedZones.add((self.currentPlayerIndex, playedFromName))
+        result.pileChanged = True
+
+        # Draw cards if fewer than 3 in hand
+        while len(player.hand) < 3 and self.deck:
+            card = self.deck.draw()
+            player.addToHand([card])
+            result.drawnCards.append(card)
+        if result.drawnCards:
+            result.changedZones.add((self.currentPlayerIndex, HAND))
+            result.deckChanged = True
+
+        playedRank = rankOf(move[0])
+        if self.checkFourOfAKind():
+            result.fourOfAKind = True
+            self.clearPile(result)
+        elif playedRank == TWO:
+            player.sevenSwitch = False
+        elif playedRank == TEN:
+            self.clearPile(result)
+        else:
+            nextPlayer = self.players[(self.currentPlayerIndex + 1) % len(self.players)]
+            nextPlayer.sevenSwitch = playedRank == SEVEN
+            if not self.checkGameState(result):
+                self.changeTurn(result)
+            return result
+
+        # A 2, a 10 or a bomb lets the same player go again
+        self.checkGameState(result)
+        return result
+
+    '''
+    Clears the pile after a 10 or four of a kind. The current player keeps
+    the turn and may play any card. The cleared cards are kept in discarded
+    since every player saw them leave the game.
+
+    @param self - The instance of the GameEngine class
+    @param result (MoveResult) - The result of the move being applied
+
+    @return None
+
+    @author Mike
+    '''
+    def clearPile(self, result):
+        result.clearedCards = self.pile.take()
+        self.discarded.extend(result.clearedCards)
+        self.players[self.currentPlayerIndex].sevenSwitch = False
+        self.bombCounts[self.currentPlayerIndex] += 1
+        result.bombed = True
+
+    '''
+    Handles the logic for the current player picking up the pile. Top and
+    bottom cards stay in their own zones, so the player goes back to them
+    once the picked up cards have been played. Everyone saw the pile, so its
+    cards are recorded as known cards of that player's hand.
+
+    @param self - The instance of the GameEngine class
+    @param result (MoveResult) - The result of the move being applied
+
+    @return None
+
+    @author Mike
+    '''
+    def pickUpPile(self, result):
+        if not self.pile:
+            return
+        currentPlayer = self.players[self.currentPlayerIndex]
+        result.pickedUpCards = currentPlayer.pickUpPile(self.pile)
+        self.knownCards[self.currentPlayerIndex].update(result.pickedUpCards)
+        currentPlayer.sevenSwitch = False
+        self.pickUpCounts[self.currentPlayerIndex] += 1
+        result.pickedUp = True
+        result.changedZones.add((self.currentPlayerIndex, HAND))
+        result.pileChanged = True
+        self.changeTurn(result)
+
+    '''
+    Changes the turn to the next player. The sevenSwitch only lasts for one
+    turn, so it is cleared for the player whose turn is ending.
+
+    @param self - The instance of the GameEngine class
+    @param result (MoveResult) - The result of the move being applied
+
+    @return None
+
+    @author Mike
+    '''
+    def changeTurn(self, result):
+        self.players[self.currentPlayerIndex].sevenSwitch = False
+        self.currentPlayerIndex = (self.currentPlayerIndex + 1) % len(self.players)
+        result.turnChanged = True
+
+    '''
+    Checks if the top four cards in the pile are of the same rank, indicating
+    a bomb. Reads the run counter kept by the Pile, so a bomb is found
+    however many plays the run was built from.
+
+    @param self - The instance of the GameEngine class
+
+    @return (bool) - True if the top four cards are of the same rank, False otherwise
+
+    @author Mike
+    '''
+    def checkFourOfAKind(self):
+        return self.pile.run >= BOMB_SIZE
+
+    '''
+    Checks if the current player has played every card in every zone and
+    records them as the winner.
+
+    @param self - The instance of the GameEngine class
+    @param result (MoveResult) - The result of the move being applied
+
+    @return (bool) - True if the game is over, False otherwise
+
+    @author Mike
+    '''
+    def checkGameState(self, result):
+        if self.players[self.currentPlayerIndex].isOut() and not self.deck:
+            self.winner = self.currentPlayerIndex
+            result.gameOver = True
+        return result.gameOver
+
+    '''
+    Plays the game to the end with every seat controlled by its AIPlayer.
+    The AIs must already have chosen their top cards.
+
+    @param self - The instance of the GameEngine class
+    @param maxTurns (int) - Turn limit after which the game is abandoned
+
+    @return winner (int) - The index of the winning player, or None if the limit was hit
+
+    @author Mike
+    '''
+    def playGame(self, maxTurns=10000):
+        while not self.isTerminal() and self.turnCount < maxTurns:
+            self.apply(self.chooseAIMove())
+        return self.winner
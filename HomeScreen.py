@@ -1,12 +1,27 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, \
-    QLabel, QDialog, QRadioButton, QButtonGroup
-from PySide6.QtGui import QIcon
+    QLabel, QDialog, QRadioButton, QButtonGroup, QInputDialog
 from PySide6.QtCore import Qt, QCoreApplication
-from Controller import Controller
+from ImageLoader import loadWindowIcon
 
 class HomeScreen(QWidget):
-    def __init__(self):
+    '''
+    Creates the home screen.
+
+    @param self - The instance of the HomeScreen class
+    @param viewBackend (str) - The View backend games are drawn with, 'widgets' or 'scene'
+    @param showFrameStats (bool) - Flag to show frame times while cards move in games
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, viewBackend='widgets', showFrameStats=False):
         super().__init__()
+        self.viewBackend = viewBackend
+        self.showFrameStats = showFrameStats
+        self.onFirstPaint = None  # Called once the window has been painted for the first time
+        self.lobby = None
+        self.onlineTable = None
         self.initUI()
 
     '''
@@ -20,7 +35,7 @@ class HomeScreen(QWidget):
     def initUI(self):
         # Set up main window properties
         self.setWindowTitle('Palace')
-        self.setWindowIcon(QIcon(r"_internal\palaceData\palace.ico"))
+        loadWindowIcon(self)
         self.setGeometry(660, 215, 600, 500)
         layout = QVBoxLayout()
         title = QLabel("Palace")
@@ -67,6 +82,24 @@ class HomeScreen(QWidget):
         layout.addWidget(buttonContainer, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.setLayout(layout)
+
+    '''
+    Paints the home screen, and runs onFirstPaint the first time so startup
+    can be timed to the first frame.
+
+    @param self - The instance of the HomeScreen class
+    @param event (QPaintEvent) - The paint event
+
+    @return None
+
+    @author Mike
+    '''
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.onFirstPaint is not None:
+            onFirstPaint = self.onFirstPaint
+            self.onFirstPaint = None
+            onFirstPaint()
     
     '''
     Displays a dialog for player selection with radio buttons to choose the 
@@ -121,7 +154,7 @@ class HomeScreen(QWidget):
         self.difficultyGroup.addButton(easyButton, 1)
         self.difficultyGroup.addButton(mediumButton, 2)
         self.difficultyGroup.addButton(hardButton, 3)
-        self.difficultyGroup.addButton(impossibleButton, 3)
+        self.difficultyGroup.addButton(impossibleButton, 4)
 
         layout.addWidget(easyButton)
         layout.addWidget(mediumButton)
@@ -158,9 +191,11 @@ class HomeScreen(QWidget):
         if numPlayers in [2, 3, 4]:
             dialog.accept()
             self.hide()
-            difficultyMap = {1: 'easy', 2: 'medium', 3: 'hard'}
+            difficultyMap = {1: 'easy', 2: 'medium', 3: 'hard', 4: 'impossible'}
             difficultyLevel = difficultyMap.get(difficulty, 'medium')
-            controller = Controller(numPlayers, difficultyLevel)
+            from Controller import Controller  # The game modules are only loaded once a game is started
+            controller = Controller(numPlayers, difficultyLevel, viewBackend=self.viewBackend,
+                                    showFrameStats=self.showFrameStats)
             controller.view.show()
 
     '''
@@ -177,17 +212,23 @@ class HomeScreen(QWidget):
         self.onlineDialog = QDialog(self)
         self.onlineDialog.setWindowTitle("Online Multiplayer")
         self.onlineDialog.setGeometry(835, 400, 250, 150)
+        self.onlineDialog.finished.connect(self.onlineDialogClosed)
         layout = QVBoxLayout()
 
         hostButton = QPushButton("Host Lobby")
+        hostButton.clicked.connect(self.hostLobby)
         layout.addWidget(hostButton)
 
         layout.addWidget(QLabel())
         
         joinButton = QPushButton("Join Lobby")
+        joinButton.clicked.connect(self.joinLobby)
         layout.addWidget(joinButton)
         
-        layout.addWidget(QLabel())
+        self.lobbyStatus = QLabel()
+        self.lobbyStatus.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lobbyStatus.setWordWrap(True)
+        layout.addWidget(self.lobbyStatus)
 
         closeButton = QPushButton("Close")
         closeButton.setFixedWidth(75)
@@ -197,6 +238,171 @@ class HomeScreen(QWidget):
         self.onlineDialog.setLayout(layout)
         self.onlineDialog.exec()
     
+    '''
+    Starts a lobby server on this machine and hosts a table on it for the
+    number of players chosen.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def hostLobby(self):
+        seats, ok = QInputDialog.getInt(self.onlineDialog, "Host Lobby", "How many players?", 2, 2, 4)
+        if not ok:
+            return
+        self.openLobby().host("Player", seats)
+        self.lobbyStatus.setText("Starting the lobby...")
+
+    '''
+    Joins a table on a lobby server, given as address:port/table.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def joinLobby(self):
+        from LobbyServer import DEFAULT_HOST, DEFAULT_PORT
+
+        text, ok = QInputDialog.getText(self.onlineDialog, "Join Lobby", "Table (address:port/table):",
+                                        text=f"{DEFAULT_HOST}:{DEFAULT_PORT}/1")
+        if not ok:
+            return
+        try:
+            server, tableId = text.strip().rsplit("/", 1)
+            address, port = server.rsplit(":", 1)
+            port, tableId = int(port), int(tableId)
+        except ValueError:
+            self.lobbyStatus.setText("Enter the table as address:port/table, e.g. 127.0.0.1:50555/1")
+            return
+        self.openLobby().join(address, port, tableId, "Player")
+        self.lobbyStatus.setText(f"Joining table {tableId} on {address}:{port}...")
+
+    '''
+    Replaces any open lobby connection with a new one. The network code is
+    only loaded once a lobby is opened.
+
+    @param self - The instance of the HomeScreen class
+
+    @return (LobbyConnection) - The new connection
+
+    @author Mike
+    '''
+    def openLobby(self):
+        from LobbyConnection import LobbyConnection
+
+        self.closeLobby()
+        self.lobby = LobbyConnection()
+        self.lobby.messageReceived.connect(self.lobbyMessage)
+        self.lobby.failed.connect(self.lobbyFailed)
+        return self.lobby
+
+    '''
+    Closes the lobby connection, and the server if this player is hosting.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def closeLobby(self):
+        if self.lobby is not None:
+            self.lobby.messageReceived.disconnect()
+            self.lobby.failed.disconnect()
+            self.lobby.close()
+            self.lobby = None
+
+    '''
+    Closes the lobby with the online dialog, unless the game it was for is
+    being played in its own window.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def onlineDialogClosed(self):
+        if self.onlineTable is None:
+            self.closeLobby()
+
+    '''
+    Opens the window an online game is played in, once the table is dealt,
+    and closes the online dialog. The lobby connection stays open and its
+    messages are passed on to the window until it is closed.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def openOnlineTable(self):
+        from OnlineTable import OnlineTable
+
+        self.onlineTable = OnlineTable(self.lobby.send, self.onlineTableClosed)
+        self.onlineTable.show()
+        self.onlineDialog.accept()
+
+    '''
+    Forgets the online game's window once it is closed, and closes the
+    connection it was played over.
+
+    @param self - The instance of the HomeScreen class
+
+    @return None
+
+    @author Mike
+    '''
+    def onlineTableClosed(self):
+        self.onlineTable = None
+        self.closeLobby()
+
+    '''
+    Shows why the lobby connection ended, in the game's window if it is open.
+
+    @param self - The instance of the HomeScreen class
+    @param text (str) - What went wrong
+
+    @return None
+
+    @author Mike
+    '''
+    def lobbyFailed(self, text):
+        if self.onlineTable is not None:
+            self.onlineTable.showFailure(text)
+        else:
+            self.lobbyStatus.setText(text)
+
+    '''
+    Shows the progress of the lobby from a message sent by the server.
+
+    @param self - The instance of the HomeScreen class
+    @param message (dict) - The message
+
+    @return None
+
+    @author Mike
+    '''
+    def lobbyMessage(self, message):
+        kind = message.get("type")
+        if kind == "state" and self.onlineTable is None:
+            self.openOnlineTable()
+        if self.onlineTable is not None:
+            self.onlineTable.showMessage(message)
+        elif kind in ("hosted", "joined"):
+            self.lobbyStatus.setText(f"Seat {message['seat'] + 1} of {message['seats']} at table {message['table']}")
+        elif kind == "lobby":
+            players = [name for name in message["players"] if name is not None]
+            self.lobbyStatus.setText(f"Table {message['table']}: {len(players)}/{message['seats']} players, "
+                                     f"waiting for {message['seats'] - len(players)} more")
+        elif kind in ("closed", "error"):
+            self.lobbyStatus.setText(message["message"])
+
     '''
     Displays the rules of the Palace game in a dialog.
 
@@ -210,7 +416,7 @@ class HomeScreen(QWidget):
         rulesDialog = QDialog(self)
         rulesDialog.setWindowTitle("Rules")
         rulesDialog.setGeometry(560, 100, 800, 300)
-        rulesDialog.setWindowIcon(QIcon(r"_internal\palaceData\palace.ico"))
+        loadWindowIcon(rulesDialog)
         layout = QVBoxLayout()
         rulesLabel = QLabel(
             """<h2>The Pack</h2>
@@ -0,0 +1,158 @@
+from PySide6.QtGui import QIcon, QImage, QImageReader, QPixmap
+from PySide6.QtCore import Qt, QObject, QRunnable, QSize, QThreadPool, Signal
+import shiboken6
+from Assets import ICON, assetPath
+
+ICON_SIZE = QSize(64, 64)  # palace.ico holds a 256x256 image, far more than a title bar needs
+
+class ImageDecodeTask(QRunnable):
+    '''
+    Initializes the ImageDecodeTask class, which decodes one image on a
+    QThreadPool thread with QImageReader. With a size, the reader decodes
+    straight to the smallest size covering it at the image's aspect ratio,
+    instead of decoding the full image and scaling it afterwards.
+
+    @param self - The instance of the ImageDecodeTask class
+    @param path (str) - The image to decode
+    @param size (QSize) - The size to decode to, None for the image's own size
+    @param token (int) - Identifies the request
+    @param signals (ImageLoader) - Where to send the image
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, path, size, token, signals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.token = token
+        self.signals = signals
+
+    '''
+    Decodes the image and sends it back, as a null QImage if it could not
+    be read.
+
+    @param self - The instance of the ImageDecodeTask class
+
+    @return None
+
+    @author Mike
+    '''
+    def run(self):
+        reader = QImageReader(self.path)
+        if self.size is not None and reader.size().isValid():
+            reader.setScaledSize(reader.size().scaled(self.size, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+        image = reader.read()
+        if image.isNull():
+            print(f"Could not decode {self.path}: {reader.errorString()}")
+        self.signals.imageDecoded.emit(self.token, image)
+
+class ImageLoader(QObject):
+    '''
+    Initializes the ImageLoader class, which decodes large assets such as
+    the window icon and the table background off the GUI thread, so no
+    window waits on a multi-megabyte decode. Images are cached by asset and
+    size once decoded, so the next window asking for one gets it straight
+    away. QImage can cross threads, so each image is sent back as a QImage
+    and the caller turns it into a QPixmap or QIcon on the GUI thread.
+
+    @param self - The instance of the ImageLoader class
+
+    @return None
+
+    @author Mike
+    '''
+    imageDecoded = Signal(int, QImage)
+
+    def __init__(self):
+        super().__init__()
+        self.images = {}  # (asset, width, height) -> decoded QImage
+        self.pending = {}  # token -> (key, (receiver, callback) pairs waiting on it)
+        self.tokens = {}  # key -> token of the decode in flight
+        self.nextToken = 0
+        self.imageDecoded.connect(self.deliver, Qt.ConnectionType.QueuedConnection)
+
+    '''
+    Asks for an asset decoded at a size. onReady is called on the GUI
+    thread with the QImage, straight away if it was already decoded. Until
+    then the caller shows its own placeholder. The request belongs to the
+    receiver, the widget that asked, and is dropped if the receiver has
+    been deleted by the time the image is decoded, for example a dialog
+    closed straight after it opened.
+
+    @param self - The instance of the ImageLoader class
+    @param name (str) - The asset, as given to Assets.assetPath
+    @param size (QSize) - The size to decode to, None for the image's own size
+    @param receiver (QObject) - The object the image is for
+    @param onReady (function) - Called with the decoded QImage
+
+    @return None
+
+    @author Mike
+    '''
+    def load(self, name, size, receiver, onReady):
+        key = (name, size.width(), size.height()) if size is not None else (name, 0, 0)
+        image = self.images.get(key)
+        if image is not None:
+            onReady(image)
+            return
+        if key in self.tokens:
+            self.pending[self.tokens[key]][1].append((receiver, onReady))
+            return
+        self.nextToken += 1
+        self.tokens[key] = self.nextToken
+        self.pending[self.nextToken] = (key, [(receiver, onReady)])
+        QThreadPool.globalInstance().start(ImageDecodeTask(assetPath(name), size, self.nextToken, self))
+
+    '''
+    Receives a decoded image from the worker thread, caches it and passes
+    it to every receiver that asked for it and still exists.
+
+    @param self - The instance of the ImageLoader class
+    @param token (int) - The request the image answers
+    @param image (QImage) - The decoded image, null if it could not be read
+
+    @return None
+
+    @author Mike
+    '''
+    def deliver(self, token, image):
+        key, callbacks = self.pending.pop(token)
+        del self.tokens[key]
+        if image.isNull():
+            return
+        self.images[key] = image
+        for receiver, onReady in callbacks:
+            if shiboken6.isValid(receiver):
+                onReady(image)
+
+imageLoader = None
+
+'''
+Gets the ImageLoader shared by every window, creating it on first use so
+it belongs to the GUI thread.
+
+@return (ImageLoader) - The shared loader
+
+@author Mike
+'''
+def getImageLoader():
+    global imageLoader
+    if imageLoader is None:
+        imageLoader = ImageLoader()
+    return imageLoader
+
+'''
+Sets a window's icon once it has been decoded. The window has no icon of
+its own until then, which costs nothing to draw.
+
+@param window (QWidget) - The window to set the icon of
+
+@return None
+
+@author Mike
+'''
+def loadWindowIcon(window):
+    getImageLoader().load(ICON, ICON_SIZE, window,
+                          lambda image: window.setWindowIcon(QIcon(QPixmap.fromImage(image))))
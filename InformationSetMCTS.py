@@ -0,0 +1,520 @@
+'''
+Information-set Monte Carlo Tree Search for the impossible AI.
+
+The player to move only knows its own hand, the face-up cards, the pile,
+the cards bombed out of the game and the cards it watched the others pick
+up. Each iteration deals the rest of the cards (the deck order, the unseen
+part of every other hand and all bottom cards) at random in a way that is
+consistent with that view, then walks one shared tree over the moves that
+are legal in that deal (single-observer ISMCTS). Moves are abstract, a rank
+and a count, a blind flip or a pickup, so the same node is reached whatever
+suits a deal hands out. Each walk finishes with a medium-difficulty rollout.
+
+Searches run on a process pool with one independent tree per worker, and
+the root visit counts are summed (root parallelisation). The workers are
+spawned rather than forked, so they never inherit a copy of a process that
+has Qt loaded or threads running, and every pool is shut down on exit. A search stops at
+its millisecond budget, or after a fixed number of rollouts so simulations
+stay reproducible.
+
+    python InformationSetMCTS.py -n 200 --budget 50 --workers 1
+    python InformationSetMCTS.py -n 200 --budget 200 --workers 4
+'''
+import argparse
+import atexit
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Card import DECK_SIZE, NUM_RANKS
+from Deck import Deck
+from Rules import playableRankMask
+
+PICK_UP = -1  # Same sentinel as GameEngine.PICK_UP
+BLIND = -2  # Flip a random bottom card
+ROLLOUT_DIFFICULTY = 'medium'
+ROLLOUT_TURNS = 150  # Turns a rollout may run before it is scored on cards left
+EXPLORATION = 0.7
+
+executors = {}  # Process pools shared by every searcher, keyed by worker count
+
+class InformationSet:
+    '''
+    Initializes the InformationSet class, a picklable snapshot of what one
+    player can see of a game on their turn. Nothing hidden from that player
+    is copied, so a search can never peek at the real deal.
+
+    @param self - The instance of the InformationSet class
+    @param engine (GameEngine) - The game to take the snapshot of
+    @param playerIndex (int) - The player whose view is taken, the player to move
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, engine, playerIndex):
+        players = engine.players
+        self.playerIndex = playerIndex
+        self.hand = list(players[playerIndex].hand)
+        self.topCards = [list(player.topCards) for player in players]
+        self.handSizes = [len(player.hand) for player in players]
+        self.bottomSizes = [len(player.bottomCards) for player in players]
+        self.knownCards = [sorted(known) if index != playerIndex else []
+                           for index, known in enumerate(engine.knownCards)]
+        self.sevenSwitches = [player.sevenSwitch for player in players]
+        self.pile = list(engine.pile)
+        seen = set(self.hand)
+        seen.update(engine.pile)
+        seen.update(engine.discarded)
+        for index in range(len(players)):
+            seen.update(self.topCards[index])
+            seen.update(self.knownCards[index])
+        self.unseen = [card for card in range(DECK_SIZE) if card not in seen]
+
+class SearchNode:
+    '''
+    Initializes the SearchNode class, one abstract move in the search tree.
+    Rewards are kept for the player who made the move, and avails counts the
+    iterations in which the move was legal, since under hidden information
+    a move is not available in every deal. Children are keyed by the player
+    to move as well as the move: after a blind flip the same move can be
+    followed by a different player depending on the deal, and each of them
+    needs a node of their own to be credited with their rewards.
+
+    @param self - The instance of the SearchNode class
+    @param move (int | tuple) - The abstract move that leads here, None at the root
+    @param parent (SearchNode) - The node the move was made from
+    @param mover (int) - The index of the player who made the move
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, move=None, parent=None, mover=None):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.avails = 1
+
+    '''
+    Picks the child to follow with UCB1, counting every legal child as
+    available this iteration.
+
+    @param self - The instance of the SearchNode class
+    @param moves (list) - The abstract moves legal in this deal, all already expanded
+    @param mover (int) - The index of the player to move in this deal
+
+    @return (SearchNode) - The child to follow
+
+    @author Mike
+    '''
+    def selectChild(self, moves, mover):
+        bestChild = None
+        bestScore = -1.0
+        for move in moves:
+            child = self.children[(mover, move)]
+            child.avails += 1
+            score = child.reward / child.visits + EXPLORATION * math.sqrt(math.log(child.avails) / child.visits)
+            if score > bestScore:
+                bestChild = child
+                bestScore = score
+        return bestChild
+
+    '''
+    Adds a child for a move that has not been tried from this node.
+
+    @param self - The instance of the SearchNode class
+    @param move (int | tuple) - The abstract move
+    @param mover (int) - The index of the player making the move
+
+    @return child (SearchNode) - The new child
+
+    @author Mike
+    '''
+    def addChild(self, move, mover):
+        child = SearchNode(move, self, mover)
+        self.children[(mover, move)] = child
+        return child
+
+    '''
+    Records the result of a rollout through this node.
+
+    @param self - The instance of the SearchNode class
+    @param rewards (list) - The reward of each player
+
+    @return None
+
+    @author Mike
+    '''
+    def update(self, rewards):
+        self.visits += 1
+        if self.mover is not None:
+            self.reward += rewards[self.mover]
+
+'''
+Lists the abstract moves of the player to move: a rank and how many cards
+of it to play, BLIND for a bottom card, or PICK_UP.
+
+@param engine (GameEngine) - The game, real or determinized
+
+@return moves (list) - The legal abstract moves
+
+@author Mike
+'''
+def abstractMoves(engine):
+    player = engine.players[engine.currentPlayerIndex]
+    if player.isBlind():
+        return [BLIND]
+    ranks = player.activeRanks()
+    validMask = ranks.mask & playableRankMask(player.sevenSwitch, engine.pile)
+    moves = [(rank, count) for rank in range(NUM_RANKS) if validMask >> rank & 1
+             for count in range(1, ranks.count(rank) + 1)]
+    if engine.pile or not moves:
+        moves.append(PICK_UP)
+    return moves
+
+'''
+Turns an abstract move into the cards the engine expects.
+
+@param engine (GameEngine) - The game the move is made in
+@param move (int | tuple) - The abstract move
+@param rng (Random) - The random source for blind flips
+
+@return (list | int) - The cards to play, or PICK_UP
+
+@author Mike
+'''
+def concreteMove(engine, move, rng):
+    if move == PICK_UP:
+        return PICK_UP
+    player = engine.players[engine.currentPlayerIndex]
+    if move == BLIND:
+        return [rng.choice(player.bottomCards)]
+    rank, count = move
+    return player.activeRanks().cardsOfRank(rank)[:count]
+
+'''
+Deals the unseen cards of an information set at random into a playable
+game. Known cards go back into the hands they were picked up into, hand
+and bottom sizes match the real game and the rest becomes the deck.
+
+@param infoSet (InformationSet) - The view to deal from
+@param rng (Random) - The random source for the deal and the rollout players
+
+@return engine (GameEngine) - A game consistent with the view, with the viewer to move
+
+@author Mike
+'''
+def determinize(infoSet, rng):
+    # Imported here because GameEngine imports AIPlayer, which imports this module
+    from AIPlayer import AIPlayer
+    from GameEngine import GameEngine
+
+    unseen = infoSet.unseen[:]
+    rng.shuffle(unseen)
+    position = 0
+    players = []
+    for index, topCards in enumerate(infoSet.topCards):
+        if index == infoSet.playerIndex:
+            hand = infoSet.hand
+        else:
+            missing = infoSet.handSizes[index] - len(infoSet.knownCards[index])
+            hand = infoSet.knownCards[index] + unseen[position:position + missing]
+            position += missing
+        bottomCards = unseen[position:position + infoSet.bottomSizes[index]]
+        position += infoSet.bottomSizes[index]
+        player = AIPlayer(f"Rollout{index}", ROLLOUT_DIFFICULTY, rng=rng)
+        player.dealCards(hand, bottomCards, topCards)
+        player.sevenSwitch = infoSet.sevenSwitches[index]
+        players.append(player)
+
+    engine = GameEngine(players, seed=0)
+    engine.deck = Deck(unseen[position:])
+    for card in infoSet.pile:
+        engine.pile.append(card)
+    engine.currentPlayerIndex = infoSet.playerIndex
+    return engine
+
+'''
+Scores a finished or abandoned rollout: 1 for the winner, or the player
+with the fewest cards left when the turn limit was hit, split on ties.
+
+@param engine (GameEngine) - The game at the end of the rollout
+
+@return rewards (list) - The reward of each player
+
+@author Mike
+'''
+def rolloutRewards(engine):
+    rewards = [0.0] * len(engine.players)
+    if engine.winner is not None:
+        rewards[engine.winner] = 1.0
+        return rewards
+    cardsLeft = [len(player.hand) + len(player.topCards) + len(player.bottomCards) for player in engine.players]
+    fewest = min(cardsLeft)
+    leaders = [index for index, cards in enumerate(cardsLeft) if cards == fewest]
+    for index in leaders:
+        rewards[index] = 1.0 / len(leaders)
+    return rewards
+
+'''
+Grows one search tree from an information set. Runs in a worker process,
+so it only takes and returns picklable values.
+
+@param infoSet (InformationSet) - The view of the player to move
+@param budgetMs (float) - Milliseconds to search for, None for no time limit
+@param rollouts (int) - Rollouts to run, None for no limit
+@param seed (int) - Seed for the deals, blind flips and rollouts
+
+@return (tuple) - The visit count of each root move and the number of rollouts run
+
+@author Mike
+'''
+def runSearch(infoSet, budgetMs, rollouts, seed):
+    rng = random.Random(seed)
+    root = SearchNode()
+    deadline = None if budgetMs is None else time.perf_counter() + budgetMs / 1000
+    count = 0
+    while (rollouts is None or count < rollouts) and (deadline is None or time.perf_counter() < deadline):
+        state = determinize(infoSet, rng)
+        node = root
+        # Selection and expansion
+        while state.winner is None:
+            moves = abstractMoves(state)
+            mover = state.currentPlayerIndex
+            untried = [move for move in moves if (mover, move) not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node = node.addChild(move, mover)
+                state.apply(concreteMove(state, move, rng))
+                break
+            node = node.selectChild(moves, mover)
+            state.apply(concreteMove(state, node.move, rng))
+
+        # Rollout
+        turns = 0
+        while state.winner is None and turns < ROLLOUT_TURNS:
+            state.apply(state.chooseAIMove())
+            turns += 1
+
+        # Backpropagation
+        rewards = rolloutRewards(state)
+        while node is not None:
+            node.update(rewards)
+            node = node.parent
+        count += 1
+    return {child.move: child.visits for child in root.children.values()}, count
+
+'''
+Gets the shared process pool for a worker count, starting it the first
+time it is needed so later searches do not pay for process start-up.
+
+@param workers (int) - The number of worker processes
+
+@return (ProcessPoolExecutor) - The pool
+
+@author Mike
+'''
+def getExecutor(workers):
+    if workers not in executors:
+        executors[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return executors[workers]
+
+'''
+Shuts down every shared process pool, cancelling searches that have not
+started. Registered to run on exit, and safe to call more than once.
+
+@return None
+
+@author Mike
+'''
+def shutdownExecutors():
+    for executor in executors.values():
+        executor.shutdown(cancel_futures=True)
+    executors.clear()
+
+atexit.register(shutdownExecutors)
+
+class InformationSetMCTS:
+    '''
+    Initializes the InformationSetMCTS class.
+
+    @param self - The instance of the InformationSetMCTS class
+    @param budgetMs (float) - Milliseconds per move, None to rely on the rollout budget, 0 turns the search off
+    @param workers (int) - Worker processes, 1 searches in-process, None uses every core
+    @param rollouts (int) - Rollouts per move summed over the workers, None for no limit, 0 turns the search off
+    @param seed (int) - Optional seed for reproducible searches
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, budgetMs=200, workers=None, rollouts=None, seed=None):
+        self.budgetMs = budgetMs
+        self.workers = workers or os.cpu_count() or 1
+        self.rollouts = rollouts
+        self.rng = random.Random(seed)
+        self.searches = 0
+        self.lastRollouts = 0
+        self.totalRollouts = 0
+        self.totalTime = 0.0
+
+    '''
+    Checks if the searcher has a budget to search with.
+
+    @param self - The instance of the InformationSetMCTS class
+
+    @return (bool) - True if the search is on, False otherwise
+
+    @author Mike
+    '''
+    def isEnabled(self):
+        return self.budgetMs != 0 and self.rollouts != 0 and (self.budgetMs is not None or self.rollouts is not None)
+
+    '''
+    Creates the process pool this searcher uses, so it belongs to the
+    calling thread instead of whichever thread searches first.
+
+    @param self - The instance of the InformationSetMCTS class
+
+    @return None
+
+    @author Mike
+    '''
+    def startExecutor(self):
+        if self.isEnabled() and self.workers > 1:
+            getExecutor(self.workers)
+
+    '''
+    Searches the current player's position and picks the move whose root
+    node was visited most across all workers.
+
+    @param self - The instance of the InformationSetMCTS class
+    @param engine (GameEngine) - The game, with the searching player to move
+
+    @return (int | tuple) - PICK_UP or a (rank, count) move, None if the search is off
+
+    @author Mike
+    '''
+    def chooseMove(self, engine):
+        if not self.isEnabled():
+            return None
+        moves = abstractMoves(engine)
+        if len(moves) == 1:
+            return moves[0]
+
+        startTime = time.perf_counter()
+        infoSet = InformationSet(engine, engine.currentPlayerIndex)
+        seeds = [self.rng.getrandbits(64) for _ in range(self.workers)]
+        if self.rollouts is None:
+            rollouts = [None] * self.workers
+        else:
+            rollouts = [self.rollouts // self.workers + (worker < self.rollouts % self.workers)
+                        for worker in range(self.workers)]
+        if self.workers == 1:
+            results = [runSearch(infoSet, self.budgetMs, rollouts[0], seeds[0])]
+        else:
+            results = getExecutor(self.workers).map(runSearch, [infoSet] * self.workers,
+                                                    [self.budgetMs] * self.workers, rollouts, seeds)
+
+        visits = {}
+        self.lastRollouts = 0
+        for rootVisits, count in results:
+            for move, moveVisits in rootVisits.items():
+                visits[move] = visits.get(move, 0) + moveVisits
+            self.lastRollouts += count
+        self.searches += 1
+        self.totalRollouts += self.lastRollouts
+        self.totalTime += time.perf_counter() - startTime
+        return max(moves, key=lambda move: visits.get(move, 0))
+
+    '''
+    Gets the average search speed so far.
+
+    @param self - The instance of the InformationSetMCTS class
+
+    @return (float) - Rollouts per second of wall-clock search time
+
+    @author Mike
+    '''
+    def rolloutsPerSecond(self):
+        return self.totalRollouts / self.totalTime if self.totalTime else 0.0
+
+'''
+Plays 2-player games between the searching impossible AI and the heuristic
+one, swapping who moves first every game. The endgame solver is off on
+both sides so only the search is measured.
+
+@param numGames (int) - The number of games to play
+@param searcher (InformationSetMCTS) - The searcher to test
+@param seed (int) - Seed for the deals
+@param maxTurns (int) - Turn limit after which a game counts as unfinished
+
+@return (tuple) - The searcher's wins and the number of unfinished games
+
+@author Mike
+'''
+def playMatch(numGames, searcher, seed, maxTurns):
+    from AIPlayer import AIPlayer
+    from EndgameSolver import EndgameSolver
+    from GameEngine import GameEngine
+
+    wins = 0
+    unfinished = 0
+    for gameIndex in range(numGames):
+        rng = random.Random(seed * 1000003 + gameIndex)
+        searching = AIPlayer("Search", 'impossible', rng=random.Random(rng.getrandbits(64)),
+                             solver=EndgameSolver(nodeBudget=0), searcher=searcher)
+        heuristic = AIPlayer("Heuristic", 'impossible', rng=random.Random(rng.getrandbits(64)),
+                             solver=EndgameSolver(nodeBudget=0), searcher=InformationSetMCTS(rollouts=0))
+        players = [searching, heuristic] if gameIndex % 2 == 0 else [heuristic, searching]
+        engine = GameEngine(players, seed=rng.getrandbits(64))
+        engine.setupGame()
+        engine.chooseAITopCards()
+        engine.playGame(maxTurns)
+        if engine.winner is None:
+            unfinished += 1
+        elif engine.players[engine.winner] is searching:
+            wins += 1
+    return wins, unfinished
+
+'''
+Parses the command line, plays the match and prints the win rate and the
+search speed.
+
+@return None
+
+@author Mike
+'''
+def main():
+    from Simulator import wilsonInterval
+
+    parser = argparse.ArgumentParser(description="Benchmark the ISMCTS impossible AI against the heuristic.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--budget", type=float, default=100, help="milliseconds per move")
+    parser.add_argument("--rollouts", type=int, default=None, help="rollouts per move instead of a time budget")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes per search")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the deals")
+    parser.add_argument("--max-turns", type=int, default=2000, help="turn limit per game")
+    args = parser.parse_args()
+
+    budgetMs = None if args.rollouts is not None else args.budget
+    searcher = InformationSetMCTS(budgetMs, args.workers, args.rollouts, args.seed)
+    startTime = time.perf_counter()
+    wins, unfinished = playMatch(args.games, searcher, args.seed, args.max_turns)
+    elapsed = time.perf_counter() - startTime
+    rate, low, high = wilsonInterval(wins, args.games)
+    print(f"Played {args.games} games in {elapsed:.1f} s with {searcher.workers} worker(s), "
+          f"{args.budget if budgetMs is not None else args.rollouts}"
+          f"{' ms' if budgetMs is not None else ' rollouts'} per move")
+    print(f"Search win rate: {rate:.1%} [{low:.1%}, {high:.1%}]    Unfinished (turn limit): {unfinished}")
+    print(f"Searches: {searcher.searches}    Rollouts: {searcher.totalRollouts}    "
+          f"Rollouts/s: {searcher.rolloutsPerSecond():.0f}")
+
+if __name__ == '__main__':
+    main()
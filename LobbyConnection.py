@@ -0,0 +1,202 @@
+import asyncio
+import threading
+from PySide6.QtCore import QObject, Signal
+from LobbyServer import LobbyServer, LobbyClient, DEFAULT_HOST, DEFAULT_PORT
+
+CLOSE_TIMEOUT = 2  # Seconds to wait for the connection and server to close
+
+class LobbyConnection(QObject):
+    '''
+    Initializes the LobbyConnection class, which runs a LobbyClient, and a
+    LobbyServer when hosting, on an asyncio event loop in a thread of its
+    own, so the window never waits on the network. Messages from the server
+    are sent to the GUI thread by messageReceived, and anything that ends
+    the connection by failed.
+
+    @param self - The instance of the LobbyConnection class
+
+    @return None
+
+    @author Mike
+    '''
+    messageReceived = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.client = LobbyClient()
+        self.server = None
+
+    '''
+    Runs a coroutine on the connection's event loop, reporting any error it
+    raises through failed.
+
+    @param self - The instance of the LobbyConnection class
+    @param coroutine (coroutine) - The coroutine to run
+
+    @return None
+
+    @author Mike
+    '''
+    def submit(self, coroutine):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(self.reportError)
+
+    '''
+    Reports the error a finished coroutine raised, if any.
+
+    @param self - The instance of the LobbyConnection class
+    @param future (Future) - The finished coroutine
+
+    @return None
+
+    @author Mike
+    '''
+    def reportError(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.failed.emit(str(future.exception()))
+
+    '''
+    Starts a server on this machine and hosts a table on it.
+
+    @param self - The instance of the LobbyConnection class
+    @param name (str) - The player's name
+    @param seats (int) - How many players the game is for
+    @param port (int) - The port to serve on
+
+    @return None
+
+    @author Mike
+    '''
+    def host(self, name, seats, port=DEFAULT_PORT):
+        self.submit(self.hostTable(name, seats, port))
+
+    '''
+    Joins a table on a server.
+
+    @param self - The instance of the LobbyConnection class
+    @param address (str) - The server's address
+    @param port (int) - The server's port
+    @param tableId (int) - The table to join
+    @param name (str) - The player's name
+
+    @return None
+
+    @author Mike
+    '''
+    def join(self, address, port, tableId, name):
+        self.submit(self.joinTable(address, port, tableId, name))
+
+    '''
+    Starts the server, connects to it and hosts a table, then passes on
+    messages until the connection closes.
+
+    @param self - The instance of the LobbyConnection class
+    @param name (str) - The player's name
+    @param seats (int) - How many players the game is for
+    @param port (int) - The port to serve on
+
+    @return None
+
+    @author Mike
+    '''
+    async def hostTable(self, name, seats, port):
+        self.server = LobbyServer()
+        port = await self.server.start(DEFAULT_HOST, port)
+        await self.client.connect(DEFAULT_HOST, port)
+        await self.client.host(name, seats)
+        await self.readMessages()
+
+    '''
+    Connects to a server and joins a table, then passes on messages until
+    the connection closes.
+
+    @param self - The instance of the LobbyConnection class
+    @param address (str) - The server's address
+    @param port (int) - The server's port
+    @param tableId (int) - The table to join
+    @param name (str) - The player's name
+
+    @return None
+
+    @author Mike
+    '''
+    async def joinTable(self, address, port, tableId, name):
+        await self.client.connect(address, port)
+        await self.client.join(tableId, name)
+        await self.readMessages()
+
+    '''
+    Passes every message from the server to the GUI thread.
+
+    @param self - The instance of the LobbyConnection class
+
+    @return None
+
+    @author Mike
+    '''
+    async def readMessages(self):
+        while True:
+            message = await self.client.receive()
+            if message is None:
+                self.failed.emit("The connection to the lobby was closed")
+                return
+            self.messageReceived.emit(message)
+
+    '''
+    Sends a message to the table.
+
+    @param self - The instance of the LobbyConnection class
+    @param message (dict) - The message
+
+    @return None
+
+    @author Mike
+    '''
+    def send(self, message):
+        self.submit(self.client.send(message))
+
+    '''
+    Closes the connection, stops the server if this connection is hosting,
+    and stops the event loop. Waits for all of it to finish, which takes a
+    moment on a local socket, so the port is free again as soon as this
+    returns and a new lobby can be hosted on it straight away.
+
+    @param self - The instance of the LobbyConnection class
+
+    @return None
+
+    @author Mike
+    '''
+    def close(self):
+        future = asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop)
+        try:
+            future.result(CLOSE_TIMEOUT)
+        except Exception as error:
+            print(f"The lobby connection did not close cleanly: {error!r}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(CLOSE_TIMEOUT)
+        if not self.thread.is_alive():
+            self.loop.close()
+
+    '''
+    Closes the client and server on the event loop, then cancels whatever
+    is still waiting on them and waits for it to wind down.
+
+    @param self - The instance of the LobbyConnection class
+
+    @return None
+
+    @author Mike
+    '''
+    async def shutdown(self):
+        await self.client.close()
+        if self.server is not None:
+            await self.server.stop()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
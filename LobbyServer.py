@@ -0,0 +1,798 @@
+'''
+Hosts online Palace tables over TCP with asyncio, with no dependency on
+PySide6, so one process can serve many tables.
+
+Each table is an actor: a task that owns a headless GameEngine and handles
+the messages for its table one at a time from its own queue, so tables
+never share state and a slow table never holds up the others. Messages are
+one JSON object per line. A client first sends host or join:
+
+    {"type": "host", "name": "Mike", "seats": 2}   -> {"type": "hosted", "table": 1, "seat": 0, ...}
+    {"type": "join", "name": "Sam", "table": 1}    -> {"type": "joined", "table": 1, "seat": 1, ...}
+
+Everyone at the table gets a lobby message as seats fill, and the game is
+dealt when the last seat is taken. From then on each player gets a state
+message after every change, showing only what that seat can see, and
+sends its top cards and then its moves:
+
+    {"type": "top", "cards": [4, 17, 30]}
+    {"type": "move", "move": [12, 13]}   or   {"type": "move", "move": -1} to pick up the pile
+
+{"type": "stats"} can be sent instead of host or join to get the server's
+per-move latency. Everything runs on localhost for testing:
+
+    python LobbyServer.py                          # serve on 127.0.0.1:50555
+    python LobbyServer.py --bench --tables 300     # load test with bots playing 300 tables at once
+'''
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import time
+import traceback
+from GameEngine import GameEngine, PICK_UP
+from Player import Player
+from Card import rankOf
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50555
+MIN_SEATS = 2
+MAX_SEATS = 4
+TOP_CARD_COUNT = 3
+MAX_TURNS = 3000  # A game still going after this many turns is ended with no winner
+LOBBY = 'lobby'  # Table phases, as sent in state messages
+TOP_CARDS = 'top'
+PLAYING = 'playing'
+GAME_OVER = 'over'
+
+'''
+Encodes a message as one line of JSON.
+
+@param message (dict) - The message
+
+@return (bytes) - The line to write
+
+@author Mike
+'''
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + "\n").encode()
+
+'''
+Gets the 50th and 99th percentile of a list of timings.
+
+@param timings (list) - Timings in seconds
+
+@return (tuple) - p50 and p99 in milliseconds, or None for both if there are fewer than two timings
+
+@author Mike
+'''
+def percentiles(timings):
+    if len(timings) < 2:
+        return None, None
+    cuts = statistics.quantiles(timings, n=100)
+    return cuts[49] * 1000, cuts[98] * 1000
+
+class Table:
+    '''
+    Initializes the Table class, the actor for one game. Messages for the
+    table are queued on its inbox and handled in order by its own task,
+    which is the only code that touches the table's engine.
+
+    @param self - The instance of the Table class
+    @param server (LobbyServer) - The server hosting the table
+    @param tableId (int) - The number players join the table with
+    @param seatCount (int) - How many players the game is for
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, server, tableId, seatCount):
+        self.server = server
+        self.tableId = tableId
+        self.seatCount = seatCount
+        self.writers = [None] * seatCount  # The connection of the player in each seat
+        self.names = [None] * seatCount
+        self.phase = LOBBY
+        self.engine = None
+        self.topCardsChosen = set()
+        self.inbox = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    '''
+    Handles the table's messages until the table closes. A message that
+    fails is reported to its sender and dropped, so one bad client cannot
+    stop the table for the others. Joins still queued when the table
+    closes are turned down.
+
+    @param self - The instance of the Table class
+
+    @return None
+
+    @author Mike
+    '''
+    async def run(self):
+        while self.phase != GAME_OVER:
+            writer, message, received, reply = await self.inbox.get()
+            try:
+                self.handle(writer, message, received, reply)
+            except Exception:
+                traceback.print_exc()
+                self.send(writer, {"type": "error", "message": "That message could not be handled"})
+                if reply is not None and not reply.done():
+                    reply.set_result(False)
+        self.server.tables.pop(self.tableId, None)
+        while not self.inbox.empty():
+            writer, message, received, reply = self.inbox.get_nowait()
+            if reply is not None:
+                self.send(writer, {"type": "error", "message": f"Table {self.tableId} has closed"})
+                reply.set_result(False)
+
+    '''
+    Handles one message for the table.
+
+    @param self - The instance of the Table class
+    @param writer (StreamWriter) - The sender's connection
+    @param message (dict) - The message
+    @param received (float) - perf_counter time the message arrived
+    @param reply (Future) - Set to whether a join was seated, None for other messages
+
+    @return None
+
+    @author Mike
+    '''
+    def handle(self, writer, message, received, reply):
+        kind = message.get("type")
+        if kind == "join":
+            reply.set_result(self.join(writer, str(message.get("name") or "Player")))
+        elif kind == "leave":
+            self.leave(writer)
+        elif writer not in self.writers:
+            return
+        elif kind == "top":
+            self.selectTopCards(self.writers.index(writer), message.get("cards"))
+        elif kind == "move":
+            self.move(self.writers.index(writer), message.get("move"), received)
+        else:
+            self.send(writer, {"type": "error", "message": f"Unknown message {kind!r}"})
+
+    '''
+    Sends a message to one connection. Writes are buffered, so the table
+    never waits on a slow client.
+
+    @param self - The instance of the Table class
+    @param writer (StreamWriter) - The connection
+    @param message (dict) - The message
+
+    @return None
+
+    @author Mike
+    '''
+    def send(self, writer, message):
+        if writer is not None and not writer.is_closing():
+            writer.write(encode(message))
+
+    '''
+    Sends every seated player the names in the lobby.
+
+    @param self - The instance of the Table class
+
+    @return None
+
+    @author Mike
+    '''
+    def sendLobby(self):
+        message = {"type": "lobby", "table": self.tableId, "seats": self.seatCount, "players": self.names}
+        for writer in self.writers:
+            self.send(writer, message)
+
+    '''
+    Seats a player in the first free seat, and deals the game once every
+    seat is taken.
+
+    @param self - The instance of the Table class
+    @param writer (StreamWriter) - The player's connection
+    @param name (str) - The player's name
+
+    @return (bool) - True if the player was seated, False if the table is full
+
+    @author Mike
+    '''
+    def join(self, writer, name):
+        if self.phase != LOBBY or None not in self.writers:
+            self.send(writer, {"type": "error", "message": f"Table {self.tableId} is full"})
+            return False
+        seat = self.writers.index(None)
+        self.writers[seat] = writer
+        self.names[seat] = name
+        self.send(writer, {"type": "hosted" if seat == 0 else "joined", "table": self.tableId, "seat": seat,
+                           "seats": self.seatCount})
+        self.sendLobby()
+        if None not in self.writers:
+            self.engine = GameEngine([Player(name) for name in self.names])
+            self.engine.setupGame()
+            self.phase = TOP_CARDS
+            self.broadcast()
+        return True
+
+    '''
+    Handles a player leaving. A seat in the lobby is freed for someone
+    else; leaving a game in progress closes the table for everyone.
+
+    @param self - The instance of the Table class
+    @param writer (StreamWriter) - The player's connection
+
+    @return None
+
+    @author Mike
+    '''
+    def leave(self, writer):
+        if writer not in self.writers:
+            return
+        seat = self.writers.index(writer)
+        if self.phase == LOBBY:
+            self.writers[seat] = None
+            self.names[seat] = None
+            self.sendLobby()
+            if not any(self.writers):
+                self.phase = GAME_OVER
+            return
+        for other in self.writers:
+            if other is not writer:
+                self.send(other, {"type": "closed", "message": f"{self.names[seat]} left the game"})
+        self.phase = GAME_OVER
+
+    '''
+    Moves a player's chosen cards to their top cards, and starts play once
+    every player has chosen.
+
+    @param self - The instance of the Table class
+    @param seat (int) - The player's seat
+    @param cards (list) - The three cards from their hand
+
+    @return None
+
+    @author Mike
+    '''
+    def selectTopCards(self, seat, cards):
+        hand = self.engine.players[seat].hand
+        if (self.phase != TOP_CARDS or seat in self.topCardsChosen or not isinstance(cards, list)
+                or any(type(card) is not int for card in cards) or len(set(cards)) != TOP_CARD_COUNT
+                or any(card not in hand for card in cards)):
+            self.send(self.writers[seat], {"type": "error", "message": "Choose 3 different cards from your hand"})
+            return
+        self.engine.selectTopCards(seat, cards)
+        self.topCardsChosen.add(seat)
+        if len(self.topCardsChosen) == self.seatCount:
+            self.phase = PLAYING
+        self.broadcast()
+
+    '''
+    Checks a move sent by the current player: picking up a pile that has
+    cards, one face-down card when playing blind, or cards of one rank from
+    the active zone that can go on the pile.
+
+    @param self - The instance of the Table class
+    @param move (list) - The cards to play, or PICK_UP
+
+    @return (bool) - True if the move can be applied
+
+    @author Mike
+    '''
+    def isLegal(self, move):
+        if type(move) is int and move == PICK_UP:
+            return bool(self.engine.pile)
+        player = self.engine.players[self.engine.currentPlayerIndex]
+        if (not isinstance(move, list) or not move or any(type(card) is not int for card in move)
+                or len(set(move)) != len(move)):
+            return False
+        if player.isBlind():
+            return len(move) == 1 and move[0] in player.bottomCards
+        zone = player.activeZone()
+        return (all(card in zone and rankOf(card) == rankOf(move[0]) for card in move)
+                and self.engine.isCardPlayable(move[0]))
+
+    '''
+    Applies the current player's move, sends everyone the new state and
+    records how long the move took from arriving to being sent back.
+
+    @param self - The instance of the Table class
+    @param seat (int) - The player's seat
+    @param move (list) - The cards to play, or PICK_UP
+    @param received (float) - perf_counter time the move arrived
+
+    @return None
+
+    @author Mike
+    '''
+    def move(self, seat, move, received):
+        if self.phase != PLAYING or seat != self.engine.currentPlayerIndex or not self.isLegal(move):
+            self.send(self.writers[seat], {"type": "error", "message": "That move is not allowed now"})
+            return
+        result = self.engine.apply(move)
+        if result.gameOver or self.engine.turnCount >= MAX_TURNS:
+            self.phase = GAME_OVER
+        self.broadcast()
+        self.server.recordMove(time.perf_counter() - received)
+
+    '''
+    Gets what one seat can see of the table.
+
+    @param self - The instance of the Table class
+    @param seat (int) - The seat to describe the table for
+
+    @return (dict) - The state message
+
+    @author Mike
+    '''
+    def stateFor(self, seat):
+        engine = self.engine
+        players = engine.players
+        state = {"type": "state", "table": self.tableId, "seat": seat, "phase": self.phase,
+                 "current": engine.currentPlayerIndex, "names": self.names,
+                 "hand": list(players[seat].hand),
+                 "topCards": [list(player.topCards) for player in players],
+                 "handSizes": [len(player.hand) for player in players],
+                 "bottomSizes": [len(player.bottomCards) for player in players],
+                 "pile": engine.pile[-1] if engine.pile else None, "pileSize": len(engine.pile),
+                 "deckSize": len(engine.deck), "winner": engine.winner}
+        if self.phase == PLAYING and seat == engine.currentPlayerIndex:
+            state["moves"] = engine.legalMoves()
+        return state
+
+    '''
+    Sends every player the table as their seat sees it.
+
+    @param self - The instance of the Table class
+
+    @return None
+
+    @author Mike
+    '''
+    def broadcast(self):
+        for seat, writer in enumerate(self.writers):
+            self.send(writer, self.stateFor(seat))
+
+class LobbyServer:
+    '''
+    Initializes the LobbyServer class, which accepts connections, creates
+    tables for hosts and passes every message on to its table's inbox.
+
+    @param self - The instance of the LobbyServer class
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self):
+        self.tables = {}
+        self.nextTableId = 1
+        self.moveTimes = []  # Seconds from a move arriving to its state being sent, for every move
+        self.writers = set()  # Every open connection
+        self.handlers = set()  # The task reading each open connection
+        self.server = None
+
+    '''
+    Starts listening.
+
+    @param self - The instance of the LobbyServer class
+    @param host (str) - The address to listen on
+    @param port (int) - The port to listen on, 0 for any free port
+
+    @return (int) - The port being listened on
+
+    @author Mike
+    '''
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handleClient, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    '''
+    Stops listening, closes every connection and waits for its reader to
+    finish, then closes every table.
+
+    @param self - The instance of the LobbyServer class
+
+    @return None
+
+    @author Mike
+    '''
+    async def stop(self):
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        if self.handlers:
+            await asyncio.wait(self.handlers)
+        await self.server.wait_closed()
+        for table in list(self.tables.values()):
+            table.task.cancel()
+        self.tables.clear()
+
+    '''
+    Records how long a move took to handle.
+
+    @param self - The instance of the LobbyServer class
+    @param seconds (float) - From the move arriving to its state being sent
+
+    @return None
+
+    @author Mike
+    '''
+    def recordMove(self, seconds):
+        self.moveTimes.append(seconds)
+
+    '''
+    Gets the server's statistics.
+
+    @param self - The instance of the LobbyServer class
+
+    @return (dict) - The stats message
+
+    @author Mike
+    '''
+    def stats(self):
+        p50, p99 = percentiles(self.moveTimes)
+        return {"type": "stats", "tables": len(self.tables), "moves": len(self.moveTimes), "p50Ms": p50,
+                "p99Ms": p99}
+
+    '''
+    Asks a table for a seat and waits for its answer, so the connection is
+    only bound to a table that seated it.
+
+    @param self - The instance of the LobbyServer class
+    @param table (Table) - The table to join
+    @param writer (StreamWriter) - The player's connection
+    @param name (str) - The player's name
+    @param received (float) - perf_counter time the request arrived
+
+    @return (bool) - True if the player was seated
+
+    @author Mike
+    '''
+    async def requestSeat(self, table, writer, name, received):
+        reply = asyncio.get_running_loop().create_future()
+        table.inbox.put_nowait((writer, {"type": "join", "name": name}, received, reply))
+        return await reply
+
+    '''
+    Reads one connection's messages until it closes. Host and join pick the
+    table; once seated, everything after goes to that table's inbox.
+
+    @param self - The instance of the LobbyServer class
+    @param reader (StreamReader) - The connection's incoming side
+    @param writer (StreamWriter) - The connection's outgoing side
+
+    @return None
+
+    @author Mike
+    '''
+    async def handleClient(self, reader, writer):
+        table = None
+        self.writers.add(writer)
+        self.handlers.add(asyncio.current_task())
+        try:
+            async for line in reader:
+                received = time.perf_counter()
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    writer.write(encode({"type": "error", "message": "Messages must be one JSON object per line"}))
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                kind = message.get("type")
+                if kind == "stats":
+                    writer.write(encode(self.stats()))
+                elif table is not None:
+                    table.inbox.put_nowait((writer, message, received, None))
+                elif kind == "host":
+                    seats = message.get("seats")
+                    if type(seats) is not int or not MIN_SEATS <= seats <= MAX_SEATS:
+                        writer.write(encode({"type": "error", "message": f"Tables have {MIN_SEATS} to {MAX_SEATS} seats"}))
+                        continue
+                    hosted = Table(self, self.nextTableId, seats)
+                    self.tables[hosted.tableId] = hosted
+                    self.nextTableId += 1
+                    if await self.requestSeat(hosted, writer, message.get("name"), received):
+                        table = hosted
+                elif kind == "join":
+                    tableId = message.get("table")
+                    joined = self.tables.get(tableId) if type(tableId) is int else None
+                    if joined is None:
+                        writer.write(encode({"type": "error", "message": f"No table {tableId}"}))
+                        continue
+                    if await self.requestSeat(joined, writer, message.get("name"), received):
+                        table = joined
+                else:
+                    writer.write(encode({"type": "error", "message": "Host or join a table first"}))
+        except ConnectionError:
+            pass
+        finally:
+            if table is not None:
+                table.inbox.put_nowait((writer, {"type": "leave"}, time.perf_counter(), None))
+            self.writers.discard(writer)
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+
+class LobbyClient:
+    '''
+    Initializes the LobbyClient class, one connection to a LobbyServer.
+
+    @param self - The instance of the LobbyClient class
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+    '''
+    Connects to a server.
+
+    @param self - The instance of the LobbyClient class
+    @param host (str) - The server's address
+    @param port (int) - The server's port
+
+    @return None
+
+    @author Mike
+    '''
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    '''
+    Sends a message.
+
+    @param self - The instance of the LobbyClient class
+    @param message (dict) - The message
+
+    @return None
+
+    @author Mike
+    '''
+    async def send(self, message):
+        self.writer.write(encode(message))
+        await self.writer.drain()
+
+    '''
+    Waits for the next message.
+
+    @param self - The instance of the LobbyClient class
+
+    @return (dict) - The message, or None once the server has closed the connection
+
+    @author Mike
+    '''
+    async def receive(self):
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    '''
+    Asks the server to create a table, seated in seat 0.
+
+    @param self - The instance of the LobbyClient class
+    @param name (str) - The player's name
+    @param seats (int) - How many players the game is for
+
+    @return None
+
+    @author Mike
+    '''
+    async def host(self, name, seats):
+        await self.send({"type": "host", "name": name, "seats": seats})
+
+    '''
+    Asks the server for a seat at a table.
+
+    @param self - The instance of the LobbyClient class
+    @param tableId (int) - The table to join
+    @param name (str) - The player's name
+
+    @return None
+
+    @author Mike
+    '''
+    async def join(self, tableId, name):
+        await self.send({"type": "join", "table": tableId, "name": name})
+
+    '''
+    Closes the connection.
+
+    @param self - The instance of the LobbyClient class
+
+    @return None
+
+    @author Mike
+    '''
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+'''
+Plays one seat of a table with random legal moves, timing every move from
+being sent until the state it caused comes back.
+
+@param host (str) - The server's address
+@param port (int) - The server's port
+@param tableId (asyncio.Future) - Set by the host bot to the table the others join, None to host it
+@param seats (int) - How many players the game is for
+@param moveTimes (list) - Where to add the round trip of each move, in seconds
+@param rng (Random) - Random source for the moves
+
+@return (bool) - True if the game was played to the end or the turn limit
+
+@author Mike
+'''
+async def playBot(host, port, tableId, seats, moveTimes, rng):
+    client = LobbyClient()
+    await client.connect(host, port)
+    try:
+        if isinstance(tableId, asyncio.Future):
+            await client.host("Host", seats)
+        else:
+            await client.join(tableId, "Bot")
+        sent = None
+        choseTopCards = False
+        while True:
+            message = await client.receive()
+            if message is None or message["type"] in ("closed", "error"):
+                return False
+            if message["type"] == "hosted" and isinstance(tableId, asyncio.Future):
+                tableId.set_result(message["table"])
+            if message["type"] != "state":
+                continue
+            if sent is not None:
+                moveTimes.append(time.perf_counter() - sent)
+                sent = None
+            if message["phase"] == GAME_OVER:
+                return True
+            if message["phase"] == TOP_CARDS and not choseTopCards:
+                choseTopCards = True
+                await client.send({"type": "top", "cards": message["hand"][:TOP_CARD_COUNT]})
+            elif "moves" in message:
+                # Pick up only when nothing can be played, or random games rarely end
+                moves = [move for move in message["moves"] if move != PICK_UP] or message["moves"]
+                sent = time.perf_counter()
+                await client.send({"type": "move", "move": rng.choice(moves)})
+    finally:
+        await client.close()
+
+'''
+Plays one table with bots from start to finish.
+
+@param host (str) - The server's address
+@param port (int) - The server's port
+@param seats (int) - How many players the game is for
+@param moveTimes (list) - Where to add the round trip of each move, in seconds
+@param seed (int) - Seed for the bots' moves
+
+@return (bool) - True if the game was played to the end
+
+@author Mike
+'''
+async def playTable(host, port, seats, moveTimes, seed):
+    rng = random.Random(seed)
+    tableId = asyncio.get_running_loop().create_future()
+    hostBot = asyncio.create_task(playBot(host, port, tableId, seats, moveTimes, rng))
+    joined = await tableId
+    others = [playBot(host, port, joined, seats, moveTimes, random.Random(rng.random())) for _ in range(seats - 1)]
+    results = await asyncio.gather(hostBot, *others)
+    return all(results)
+
+'''
+Runs a server until it is stopped.
+
+@param host (str) - The address to listen on
+@param port (int) - The port to listen on
+
+@return None
+
+@author Mike
+'''
+async def serve(host, port):
+    server = LobbyServer()
+    port = await server.start(host, port)
+    print(f"Palace lobby server on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(server.stats())
+        await server.stop()
+
+'''
+Runs a server in a process of its own, so a benchmark's bots do not share
+its event loop.
+
+@param host (str) - The address to listen on
+@param port (int) - The port to listen on
+
+@return None
+
+@author Mike
+'''
+def serveProcess(host, port):
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+'''
+Plays many tables at once against a server and reports the per-move
+latency the players saw and the server measured.
+
+@param host (str) - The server's address
+@param port (int) - The server's port
+@param tables (int) - How many tables to play at once
+@param seats (int) - How many players each table is for
+@param seed (int) - Seed for the bots' moves
+
+@return None
+
+@author Mike
+'''
+async def bench(host, port, tables, seats, seed):
+    for _ in range(100):  # Wait up to 10 s for the server to start listening
+        try:
+            client = LobbyClient()
+            await client.connect(host, port)
+            await client.close()
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    moveTimes = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*[playTable(host, port, seats, moveTimes, seed + table) for table in range(tables)])
+    elapsed = time.perf_counter() - start
+    client = LobbyClient()
+    await client.connect(host, port)
+    await client.send({"type": "stats"})
+    stats = await client.receive()
+    await client.close()
+    p50, p99 = percentiles(moveTimes)
+    print(f"{sum(results)}/{tables} tables of {seats} finished, {len(moveTimes)} moves in {elapsed:.1f}s "
+          f"({len(moveTimes) / elapsed:.0f} moves/s)")
+    if p50 is not None:
+        print(f"Round trip per move: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    if stats["p50Ms"] is not None:
+        print(f"Server time per move: p50 {stats['p50Ms']:.3f} ms, p99 {stats['p99Ms']:.3f} ms")
+
+'''
+Parses the command line and serves, or runs the benchmark against a
+server started in a separate process.
+
+@return None
+
+@author Mike
+'''
+def main():
+    parser = argparse.ArgumentParser(description="Host online Palace tables.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--bench", action="store_true", help="play bots against a fresh server and report latency")
+    parser.add_argument("--tables", type=int, default=100, help="tables to play at once with --bench")
+    parser.add_argument("--seats", type=int, default=2, choices=range(MIN_SEATS, MAX_SEATS + 1),
+                        help="players per table with --bench")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the bots' moves")
+    args = parser.parse_args()
+    if not args.bench:
+        serveProcess(args.host, args.port)
+        return
+
+    server = multiprocessing.Process(target=serveProcess, args=(args.host, args.port), daemon=True)
+    server.start()
+    try:
+        asyncio.run(bench(args.host, args.port, args.tables, args.seats, args.seed))
+    finally:
+        server.terminate()
+        server.join()
+
+if __name__ == '__main__':
+    main()
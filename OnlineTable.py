@@ -0,0 +1,310 @@
+import random
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
+from PySide6.QtCore import Qt
+from View import CardRow, SELECTED_CARD_STYLE, CARD_STYLE
+from ImageLoader import loadWindowIcon
+from LobbyServer import TOP_CARDS, PLAYING, GAME_OVER, TOP_CARD_COUNT
+from GameEngine import PICK_UP
+from Card import cardName
+
+class OnlineTable(QWidget):
+    '''
+    Initializes the OnlineTable class, the window an online game is played
+    in. The server owns the game, so the window only draws the state
+    messages it is sent and sends back the player's top cards and moves.
+    The moves offered are the legal moves listed in the state, so the
+    player can never send one the table will turn down.
+
+    @param self - The instance of the OnlineTable class
+    @param send (function) - Sends a message to the table
+    @param onClosed (function) - Called when the window is closed, to close the connection
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, send, onClosed):
+        super().__init__()
+        self.send = send
+        self.onClosed = onClosed
+        self.state = None
+        self.chosenCards = []  # (card, label) picked as top cards
+        self.initUI()
+
+    '''
+    Sets up the labels, card rows and buttons of the window.
+
+    @param self - The instance of the OnlineTable class
+
+    @return None
+
+    @author Mike
+    '''
+    def initUI(self):
+        self.setWindowTitle('Palace Online')
+        loadWindowIcon(self)
+        self.setGeometry(560, 215, 800, 560)
+        layout = QVBoxLayout()
+
+        self.statusLabel = QLabel()
+        self.statusLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.statusLabel.setStyleSheet("font-size: 18px; font-weight: bold;")
+        layout.addWidget(self.statusLabel)
+
+        self.seatsLabel = QLabel()
+        self.seatsLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.seatsLabel)
+
+        self.pileLabel = QLabel()
+        self.pileLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.pileLabel)
+        self.deckLabel = QLabel()
+        self.deckLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.deckLabel)
+
+        layout.addWidget(QLabel("Your Top Cards"), alignment=Qt.AlignmentFlag.AlignCenter)
+        topCardsLayout = QHBoxLayout()
+        topCardsLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.topCardsRow = CardRow(topCardsLayout, enabled=False, placeholder=True)
+        layout.addLayout(topCardsLayout)
+        self.bottomLabel = QLabel()
+        self.bottomLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.bottomLabel)
+
+        layout.addWidget(QLabel("Your Hand"), alignment=Qt.AlignmentFlag.AlignCenter)
+        handLayout = QHBoxLayout()
+        handLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.handRow = CardRow(handLayout, placeholder=True, onClick=self.handCardClicked)
+        layout.addLayout(handLayout)
+
+        self.confirmButton = QPushButton("Confirm")
+        self.confirmButton.setFixedWidth(150)
+        self.confirmButton.setVisible(False)
+        self.confirmButton.clicked.connect(self.confirmTopCards)
+        layout.addWidget(self.confirmButton, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        self.movesLayout = QHBoxLayout()
+        self.movesLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addLayout(self.movesLayout)
+
+        self.setLayout(layout)
+
+    '''
+    Handles a message from the table.
+
+    @param self - The instance of the OnlineTable class
+    @param message (dict) - The message
+
+    @return None
+
+    @author Mike
+    '''
+    def showMessage(self, message):
+        kind = message.get("type")
+        if kind == "state":
+            self.showState(message)
+        elif kind == "error":
+            self.statusLabel.setText(message["message"])
+        elif kind == "closed":
+            self.showFailure(message["message"])
+
+    '''
+    Shows that the game cannot go on, and takes away the controls.
+
+    @param self - The instance of the OnlineTable class
+    @param text (str) - Why the game ended
+
+    @return None
+
+    @author Mike
+    '''
+    def showFailure(self, text):
+        self.statusLabel.setText(text)
+        self.clearMoves()
+        self.confirmButton.setVisible(False)
+        for label in self.handRow.visibleLabels():
+            label.setEnabled(False)
+
+    '''
+    Draws the table as the player's seat sees it and offers the controls
+    for the phase the game is in.
+
+    @param self - The instance of the OnlineTable class
+    @param state (dict) - The state message
+
+    @return None
+
+    @author Mike
+    '''
+    def showState(self, state):
+        self.state = state
+        seat = state["seat"]
+        names = state["names"]
+        topCards = state["topCards"][seat]
+        self.seatsLabel.setText("\n".join(
+            f"{self.seatName(index)}: {state['handSizes'][index]} in hand, top cards "
+            f"{', '.join(cardName(card) for card in state['topCards'][index]) or 'none'}, "
+            f"{state['bottomSizes'][index]} face down"
+            for index in range(len(names)) if index != seat))
+        if state["pile"] is None:
+            self.pileLabel.setText("Pile: Empty")
+        else:
+            self.pileLabel.setText(f"Pile: {cardName(state['pile'])} ({state['pileSize']} cards)")
+        self.deckLabel.setText(f"Deck: {state['deckSize']} cards")
+        self.topCardsRow.render(topCards)
+        self.bottomLabel.setText(f"{state['bottomSizes'][seat]} face-down cards")
+        self.handRow.render(state["hand"])
+        self.chosenCards = []
+        self.clearMoves()
+
+        choosing = state["phase"] == TOP_CARDS and len(topCards) < TOP_CARD_COUNT
+        for label in self.handRow.visibleLabels():
+            label.setEnabled(choosing)
+        self.confirmButton.setVisible(choosing)
+        self.confirmButton.setEnabled(False)
+        if state["phase"] == TOP_CARDS:
+            self.statusLabel.setText(f"Choose your {TOP_CARD_COUNT} top cards" if choosing
+                                     else "Waiting for the others to choose their top cards")
+        elif state["phase"] == PLAYING:
+            if state["current"] == seat:
+                self.statusLabel.setText("Your turn")
+                self.showMoves(state["moves"], not state["hand"] and not topCards)
+            else:
+                self.statusLabel.setText(f"{self.seatName(state['current'])}'s turn")
+        elif state["phase"] == GAME_OVER:
+            winner = state["winner"]
+            self.statusLabel.setText("The game ended with no winner" if winner is None
+                                     else "You win!" if winner == seat else f"{self.seatName(winner)} wins!")
+
+    '''
+    Gets how a seat is shown, with its number since every player may have
+    the same name.
+
+    @param self - The instance of the OnlineTable class
+    @param index (int) - The seat
+
+    @return (str) - The player's name and seat number
+
+    @author Mike
+    '''
+    def seatName(self, index):
+        return f"{self.state['names'][index]} (seat {index + 1})"
+
+    '''
+    Offers a button for every legal move. Face-down cards are hidden from
+    the player, so playing blind is one button that flips any of them.
+
+    @param self - The instance of the OnlineTable class
+    @param moves (list) - The legal moves, each PICK_UP or a list of cards
+    @param blind (bool) - Flag for a player down to their face-down cards
+
+    @return None
+
+    @author Mike
+    '''
+    def showMoves(self, moves, blind):
+        plays = [move for move in moves if move != PICK_UP]
+        if blind and plays:
+            self.addMoveButton("Flip A Face-down Card", lambda: self.sendMove(random.choice(plays)))
+        else:
+            for move in plays:
+                self.addMoveButton(f"Play {', '.join(cardName(card) for card in move)}",
+                                   lambda move=move: self.sendMove(move))
+        if PICK_UP in moves:
+            self.addMoveButton("Pick Up Pile", lambda: self.sendMove(PICK_UP))
+
+    '''
+    Adds one move button.
+
+    @param self - The instance of the OnlineTable class
+    @param text (str) - The button's text
+    @param onClick (function) - Sends the move
+
+    @return None
+
+    @author Mike
+    '''
+    def addMoveButton(self, text, onClick):
+        button = QPushButton(text)
+        button.clicked.connect(onClick)
+        self.movesLayout.addWidget(button)
+
+    '''
+    Removes every move button.
+
+    @param self - The instance of the OnlineTable class
+
+    @return None
+
+    @author Mike
+    '''
+    def clearMoves(self):
+        while self.movesLayout.count():
+            button = self.movesLayout.takeAt(0).widget()
+            button.deleteLater()
+
+    '''
+    Sends a move and takes the buttons away until the next state arrives.
+
+    @param self - The instance of the OnlineTable class
+    @param move (list) - The cards to play, or PICK_UP
+
+    @return None
+
+    @author Mike
+    '''
+    def sendMove(self, move):
+        self.clearMoves()
+        self.send({"type": "move", "move": move})
+
+    '''
+    Picks a card of the hand as a top card, or puts it back.
+
+    @param self - The instance of the OnlineTable class
+    @param cardIndex (int) - The position of the card in the hand
+    @param cardLabel (QLabel) - The card's label
+
+    @return None
+
+    @author Mike
+    '''
+    def handCardClicked(self, cardIndex, cardLabel):
+        if not cardLabel.isEnabled():
+            return
+        card = self.state["hand"][cardIndex]
+        if (card, cardLabel) in self.chosenCards:
+            self.chosenCards.remove((card, cardLabel))
+            cardLabel.setStyleSheet(CARD_STYLE)
+        elif len(self.chosenCards) < TOP_CARD_COUNT:
+            self.chosenCards.append((card, cardLabel))
+            cardLabel.setStyleSheet(SELECTED_CARD_STYLE)
+        self.confirmButton.setEnabled(len(self.chosenCards) == TOP_CARD_COUNT)
+
+    '''
+    Sends the chosen top cards.
+
+    @param self - The instance of the OnlineTable class
+
+    @return None
+
+    @author Mike
+    '''
+    def confirmTopCards(self):
+        self.send({"type": "top", "cards": [card for card, _ in self.chosenCards]})
+        self.confirmButton.setEnabled(False)
+        for label in self.handRow.visibleLabels():
+            label.setEnabled(False)
+
+    '''
+    Closes the connection along with the window.
+
+    @param self - The instance of the OnlineTable class
+    @param event (QCloseEvent) - The close event
+
+    @return None
+
+    @author Mike
+    '''
+    def closeEvent(self, event):
+        self.onClosed()
+        super().closeEvent(event)
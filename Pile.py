@@ -0,0 +1,117 @@
+from array import array
+from Rules import BOMB_SIZE, EMPTY_PILE
+
+class Pile:
+    '''
+    Initializes the Pile class, the discard pile as a buffer of encoded cards
+    with the run of same-rank cards on top kept up to date as cards are
+    pushed. It supports len(), truth testing, indexing and iteration like
+    the list it replaces, so pile[-1] and "if pile" work unchanged.
+
+    @param self - The instance of the Pile class
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self):
+        self.cards = array('B')
+        self.topRank = EMPTY_PILE
+        self.run = 0  # Cards of topRank in a row on top of the pile
+
+    '''
+    Gets the number of cards in the pile.
+
+    @param self - The instance of the Pile class
+
+    @return (int) - The number of cards in the pile
+
+    @author Mike
+    '''
+    def __len__(self):
+        return len(self.cards)
+
+    '''
+    Gets a card, or a slice of cards, counting from the bottom of the pile.
+
+    @param self - The instance of the Pile class
+    @param index (int | slice) - The position, -1 for the top card
+
+    @return (int | array) - The card or cards at that position
+
+    @author Mike
+    '''
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    '''
+    Iterates over the pile from the bottom card to the top card.
+
+    @param self - The instance of the Pile class
+
+    @return (iterator) - The cards in the pile
+
+    @author Mike
+    '''
+    def __iter__(self):
+        return iter(self.cards)
+
+    '''
+    Pushes a card onto the pile and updates the run on top.
+
+    @param self - The instance of the Pile class
+    @param card (int) - The card to push
+
+    @return None
+
+    @author Mike
+    '''
+    def append(self, card):
+        self.cards.append(card)
+        rank = card >> 2
+        if rank == self.topRank:
+            self.run += 1
+        else:
+            self.topRank = rank
+            self.run = 1
+
+    '''
+    Empties the pile by swapping in a new buffer.
+
+    @param self - The instance of the Pile class
+
+    @return None
+
+    @author Mike
+    '''
+    def clear(self):
+        self.cards = array('B')
+        self.topRank = EMPTY_PILE
+        self.run = 0
+
+    '''
+    Empties the pile and hands its buffer to the caller, so a pickup moves
+    the cards without copying them first.
+
+    @param self - The instance of the Pile class
+
+    @return cards (array) - The cards that were in the pile, bottom first
+
+    @author Mike
+    '''
+    def take(self):
+        cards = self.cards
+        self.clear()
+        return cards
+
+    '''
+    Gets how many more cards of the top rank would bomb the pile.
+
+    @param self - The instance of the Pile class
+
+    @return (int) - The number of cards still needed, or BOMB_SIZE if the pile is empty
+
+    @author Mike
+    '''
+    def cardsToBomb(self):
+        return BOMB_SIZE - self.run
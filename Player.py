@@ -1,11 +1,111 @@
+from array import array
+from Card import NUM_RANKS
+from Rules import playableRankMask
 
-RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-VALUES = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14}
+SUIT_COUNT = [bin(suits).count('1') for suits in range(16)]
+HAND = 'hand'  # Names of a player's zones, as listed in MoveResult.changedZones
+TOP_CARDS = 'topCards'
+BOTTOM_CARDS = 'bottomCards'
+
+class RankIndex:
+    '''
+    Initializes the RankIndex class, an incrementally updated index of the
+    cards in one zone. For each of the 13 ranks it keeps a 4-bit mask of the
+    suits held, and it keeps a 13-bit mask of the ranks present, so rank
+    counts, "any card in these ranks" and "lowest rank at or above r" are
+    constant-time lookups instead of scans over the zone.
+
+    @param self - The instance of the RankIndex class
+    @param cards (iterable) - The cards the zone starts with
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, cards=()):
+        self.suits = [0] * NUM_RANKS
+        self.mask = 0
+        for card in cards:
+            self.add(card)
+
+    '''
+    Adds a card to the index.
+
+    @param self - The instance of the RankIndex class
+    @param card (int) - The card to add
+
+    @return None
+
+    @author Mike
+    '''
+    def add(self, card):
+        rank = card >> 2
+        self.suits[rank] |= 1 << (card & 3)
+        self.mask |= 1 << rank
+
+    '''
+    Removes a card from the index.
+
+    @param self - The instance of the RankIndex class
+    @param card (int) - The card to remove
+
+    @return None
+
+    @author Mike
+    '''
+    def remove(self, card):
+        rank = card >> 2
+        self.suits[rank] &= ~(1 << (card & 3))
+        if not self.suits[rank]:
+            self.mask &= ~(1 << rank)
+
+    '''
+    Gets the number of cards of a rank in the zone.
+
+    @param self - The instance of the RankIndex class
+    @param rank (int) - The rank index
+
+    @return (int) - The number of cards of that rank
+
+    @author Mike
+    '''
+    def count(self, rank):
+        return SUIT_COUNT[self.suits[rank]]
+
+    '''
+    Gets every card of a rank in the zone, lowest suit first.
+
+    @param self - The instance of the RankIndex class
+    @param rank (int) - The rank index
+
+    @return (list) - The cards of that rank
+
+    @author Mike
+    '''
+    def cardsOfRank(self, rank):
+        suits = self.suits[rank]
+        return [rank << 2 | suit for suit in range(4) if suits >> suit & 1]
+
+    '''
+    Gets the lowest rank in the zone that is also set in a rank mask.
+
+    @param self - The instance of the RankIndex class
+    @param rankMask (int) - The ranks to consider, one bit per rank
+
+    @return (int) - The lowest matching rank index, or -1 if there is none
+
+    @author Mike
+    '''
+    def lowestRank(self, rankMask=(1 << NUM_RANKS) - 1):
+        ranks = self.mask & rankMask
+        return (ranks & -ranks).bit_length() - 1
 
 class Player:
     '''
-    Initializes the Player class with a name, and sets up the player's hand, 
-    bottom cards, top cards, and sevenSwitch flag.
+    Initializes the Player class with a name, and sets up the player's hand,
+    bottom cards, top cards, and sevenSwitch flag. Each zone is an
+    array('B') of encoded cards (see Card.py) with a RankIndex kept in sync
+    by the methods below, so zones should only be changed through them.
 
     @param self - The instance of the Player class
     @param name (str) - The name of the player
@@ -16,28 +116,164 @@ class Player:
     '''
     def __init__(self, name):
         self.name = name
-        self.hand = []
-        self.bottomCards = []
-        self.topCards = []
+        self.hand = array('B')
+        self.bottomCards = array('B')
+        self.topCards = array('B')
+        self.handRanks = RankIndex()
+        self.topRanks = RankIndex()
+        self.bottomRanks = RankIndex()
         self.sevenSwitch = False  # Flag to restrict playable cards to 7 and lower or 2/10 for one turn
 
     '''
-    Plays a card from the player's hand and adds it to the pile.
+    Gives the player their dealt hand and face-down bottom cards.
+
+    @param self - The instance of the Player class
+    @param hand (array) - The cards dealt to the hand
+    @param bottomCards (array) - The cards dealt face down
+    @param topCards (array) - Face-up cards, for setting up a game already in progress
+
+    @return None
+
+    @author Mike
+    '''
+    def dealCards(self, hand, bottomCards, topCards=()):
+        self.hand = array('B', hand)
+        self.bottomCards = array('B', bottomCards)
+        self.topCards = array('B', topCards)
+        self.handRanks = RankIndex(self.hand)
+        self.topRanks = RankIndex(self.topCards)
+        self.bottomRanks = RankIndex(self.bottomCards)
+
+    '''
+    Moves cards from the hand to the face-up top cards.
 
     @param self - The instance of the Player class
-    @param cardIndex (int) - The index of the card to play from the hand
-    @param pile (list) - The pile to add the played card to
+    @param cards (list) - The cards to place face up
 
-    @return card (tuple) - The card that was played
+    @return None
 
     @author Mike
     '''
-    def playCard(self, cardIndex, pile):
-        card = self.hand.pop(cardIndex)
-        if card[2]:
-            card = (card[0], card[1], False, False)
+    def moveToTopCards(self, cards):
+        for card in cards:
+            self.hand.remove(card)
+            self.handRanks.remove(card)
+            self.topCards.append(card)
+            self.topRanks.add(card)
+
+    '''
+    Points this player's zones at another player's, so this player chooses
+    moves for that seat. The zones are shared, not copied, so moves the
+    engine applies to the seat are seen here too.
+
+    @param self - The instance of the Player class
+    @param other (Player) - The player whose zones to share
+
+    @return None
+
+    @author Mike
+    '''
+    def shareZones(self, other):
+        self.hand = other.hand
+        self.topCards = other.topCards
+        self.bottomCards = other.bottomCards
+        self.handRanks = other.handRanks
+        self.topRanks = other.topRanks
+        self.bottomRanks = other.bottomRanks
+        self.sevenSwitch = other.sevenSwitch
+
+    '''
+    Gets the zone the player is currently playing from: the hand, then the
+    face-up top cards once the hand is empty, then the face-down bottom cards.
+
+    @param self - The instance of the Player class
+
+    @return (array) - The zone to play from
+
+    @author Mike
+    '''
+    def activeZone(self):
+        if self.hand:
+            return self.hand
+        if self.topCards:
+            return self.topCards
+        return self.bottomCards
+
+    '''
+    Gets the name of the zone the player is currently playing from.
+
+    @param self - The instance of the Player class
+
+    @return (str) - HAND, TOP_CARDS or BOTTOM_CARDS
+
+    @author Mike
+    '''
+    def activeZoneName(self):
+        if self.hand:
+            return HAND
+        if self.topCards:
+            return TOP_CARDS
+        return BOTTOM_CARDS
+
+    '''
+    Gets the RankIndex of the zone the player is currently playing from.
+
+    @param self - The instance of the Player class
+
+    @return (RankIndex) - The index of the active zone
+
+    @author Mike
+    '''
+    def activeRanks(self):
+        if self.hand:
+            return self.handRanks
+        if self.topCards:
+            return self.topRanks
+        return self.bottomRanks
+
+    '''
+    Checks if the player is down to their face-down bottom cards and must
+    play blind.
+
+    @param self - The instance of the Player class
+
+    @return (bool) - True if the player is playing bottom cards, False otherwise
+
+    @author Mike
+    '''
+    def isBlind(self):
+        return not self.hand and not self.topCards
+
+    '''
+    Checks if the player has no cards left in any zone.
+
+    @param self - The instance of the Player class
+
+    @return (bool) - True if the player has played every card, False otherwise
+
+    @author Mike
+    '''
+    def isOut(self):
+        return not self.hand and not self.topCards and not self.bottomCards
+
+    '''
+    Plays a card from the player's active zone and adds it to the pile.
+
+    @param self - The instance of the Player class
+    @param card (int) - The card to play
+    @param pile (Pile) - The pile to add the played card to
+
+    @return position (int) - Where the card was in the zone when it was removed
+
+    @author Mike
+    '''
+    def playCard(self, card, pile):
+        zone = self.activeZone()
+        self.activeRanks().remove(card)
+        position = zone.index(card)
+        del zone[position]
         pile.append(card)
-        return card
+        return position
 
     '''
     Adds a list of cards to the player's hand.
@@ -51,23 +287,27 @@ class Player:
     '''
     def addToHand(self, cards):
         self.hand.extend(cards)
+        for card in cards:
+            self.handRanks.add(card)
 
     '''
-    Picks up the entire pile and adds it to the player's hand.
+    Picks up the entire pile and adds it to the player's hand. The pile's
+    buffer is taken rather than copied and is left empty.
 
     @param self - The instance of the Player class
-    @param pile (list) - The pile to pick up
+    @param pile (Pile) - The pile to pick up
 
-    @return None
+    @return cards (array) - The cards picked up
 
     @author Mike
     '''
     def pickUpPile(self, pile):
-        self.hand.extend(pile)
-        pile.clear()
+        cards = pile.take()
+        self.addToHand(cards)
+        return cards
 
     '''
-    Checks if the player has any playable cards based on the top card of the 
+    Checks if the player has any playable cards based on the top card of the
     pile and the sevenSwitch flag.
 
     @param self - The instance of the Player class
@@ -78,7 +318,4 @@ class Player:
     @author Mike
     '''
     def hasPlayableCards(self, topPile):
-        if self.sevenSwitch:
-            return any(VALUES[card[0]] <= 7 or card[0] in ['2', '10'] for card in self.hand)
-        else:
-            return any(card[0] == '2' or VALUES[card[0]] >= VALUES[topPile[-1][0]] for card in self.hand)
\ No newline at end of file
+        return bool(self.handRanks.mask & playableRankMask(self.sevenSwitch, topPile))
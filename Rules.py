@@ -0,0 +1,78 @@
+'''
+Playability rules shared by the GameEngine, the Controller and every AI.
+The tables are built once at import so a playability check is a single
+index: PLAYABLE[sevenSwitch][topRank][cardRank], or PLAYABLE_RANKS for the
+same answer as a 13-bit mask over every rank at once.
+
+A 2 and a 10 can always be played. With the sevenSwitch on only a 7 or
+lower (or a 10) can be played; otherwise the card must be at least the rank
+on top of the pile. An empty pile takes any card.
+'''
+from Card import NUM_RANKS, TWO, SEVEN, TEN
+
+EMPTY_PILE = NUM_RANKS  # Top rank index used when the pile is empty
+BOMB_SIZE = 4  # Cards of one rank in a row on top of the pile that clear it
+ALL_RANKS = (1 << NUM_RANKS) - 1
+SPECIAL_RANKS = 1 << TWO | 1 << TEN
+SEVEN_OR_LOWER = (1 << (SEVEN + 1)) - 1
+
+'''
+Builds the mask of playable ranks for one pile state.
+
+@param sevenSwitch (bool) - Whether the player is restricted to 7 or lower
+@param topRank (int) - The rank on top of the pile, or EMPTY_PILE
+
+@return (int) - The playable ranks, one bit per rank
+
+@author Mike
+'''
+def _buildPlayableRanks(sevenSwitch, topRank):
+    if sevenSwitch:
+        return SEVEN_OR_LOWER | SPECIAL_RANKS
+    if topRank == EMPTY_PILE:
+        return ALL_RANKS
+    return (ALL_RANKS & -1 << topRank) | SPECIAL_RANKS
+
+PLAYABLE_RANKS = [[_buildPlayableRanks(sevenSwitch, topRank) for topRank in range(NUM_RANKS + 1)]
+                  for sevenSwitch in (False, True)]
+PLAYABLE = [[[bool(mask >> rank & 1) for rank in range(NUM_RANKS)] for mask in masks]
+            for masks in PLAYABLE_RANKS]
+
+'''
+Gets the rank on top of the pile.
+
+@param pile (list) - The current pile of cards
+
+@return (int) - The top rank index, or EMPTY_PILE
+
+@author Mike
+'''
+def topRankOf(pile):
+    return pile[-1] >> 2 if pile else EMPTY_PILE
+
+'''
+Gets the ranks that can be played on the pile.
+
+@param sevenSwitch (bool) - Whether the player is restricted to 7 or lower
+@param pile (list) - The current pile of cards
+
+@return (int) - The playable ranks, one bit per rank
+
+@author Mike
+'''
+def playableRankMask(sevenSwitch, pile):
+    return PLAYABLE_RANKS[sevenSwitch][pile[-1] >> 2 if pile else EMPTY_PILE]
+
+'''
+Checks if a card can be played on the pile.
+
+@param card (int) - The card to check
+@param pile (list) - The current pile of cards
+@param sevenSwitch (bool) - Whether the player is restricted to 7 or lower
+
+@return (bool) - True if the card is playable, False otherwise
+
+@author Mike
+'''
+def isCardPlayable(card, pile, sevenSwitch):
+    return PLAYABLE[sevenSwitch][pile[-1] >> 2 if pile else EMPTY_PILE][card >> 2]
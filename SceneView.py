@@ -0,0 +1,353 @@
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsView, QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsItem, \
+    QFrame
+from PySide6.QtGui import QBrush, QPainter
+from PySide6.QtCore import Qt, QPointF, QRectF
+from CardImageCache import BACK, UPRIGHT
+from View import View, cardImages, labelSize
+
+EDGE = 280  # Depth of the band along each edge of the window kept for a seat's cards
+BUTTON_ROW = 40  # Height kept below the player's seat for the place button
+HAND_INSET = 55  # Distance from a seat's edge to the centre of its hand
+TABLE_INSET = 185  # Distance from a seat's edge to the centre of its top and bottom cards
+TOP_CARD_OFFSET = 12  # Top cards sit on their bottom cards, shifted so the bottom cards peek out
+DISABLED_OPACITY = 0.5
+
+class CardItem(QGraphicsPixmapItem):
+    '''
+    Initializes the CardItem class, one card on the table. There is one item
+    per card for the whole game, which is moved, flipped and rotated as the
+    card changes zone instead of being recreated. It has the methods the
+    Controller calls on a card label, so either backend can be driven the
+    same way.
+
+    @param self - The instance of the CardItem class
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self):
+        super().__init__()
+        self.key = None  # The card or BACK currently drawn
+        self.rotation = None
+        self.row = None  # The SceneCardRow showing the card, None while hidden
+        self.slot = 0
+        self.onClick = None
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        self.highlight = QGraphicsRectItem(self)
+        self.highlight.setBrush(QBrush(Qt.GlobalColor.blue))
+        self.highlight.setPen(Qt.PenStyle.NoPen)
+        self.highlight.setFlag(QGraphicsItem.GraphicsItemFlag.ItemStacksBehindParent)
+        self.highlight.hide()
+        self.hide()
+
+    '''
+    Draws the face or back of the card in an orientation, centred on the
+    item's position. The pixmap only changes if the card or the orientation
+    did.
+
+    @param self - The instance of the CardItem class
+    @param key (int) - The card to show, or BACK
+    @param rotation (int) - UPRIGHT, 90 or -90
+
+    @return None
+
+    @author Mike
+    '''
+    def setCard(self, key, rotation):
+        if key == self.key and rotation == self.rotation:
+            return
+        pixmap = cardImages.pixmap(key, rotation)
+        size = pixmap.deviceIndependentSize()
+        self.setPixmap(pixmap)
+        self.setOffset(-size.width() / 2, -size.height() / 2)
+        width, height = labelSize(rotation)
+        self.highlight.setRect(QRectF(-width / 2, -height / 2, width, height))
+        self.key = key
+        self.rotation = rotation
+
+    '''
+    Shows or clears the selection highlight behind the card.
+
+    @param self - The instance of the CardItem class
+    @param selected (bool) - Flag to show or clear the highlight
+
+    @return None
+
+    @author Mike
+    '''
+    def setHighlighted(self, selected):
+        self.highlight.setVisible(selected)
+
+    '''
+    Enables or disables the card and dims it while it is disabled, the way
+    a disabled QLabel greys out its pixmap.
+
+    @param self - The instance of the CardItem class
+    @param enabled (bool) - Flag to enable or disable the card
+
+    @return None
+
+    @author Mike
+    '''
+    def setEnabled(self, enabled):
+        super().setEnabled(enabled)
+        self.setOpacity(1.0 if enabled else DISABLED_OPACITY)
+
+    '''
+    Passes a click on the card to its row's handler with the card's current
+    position in the row.
+
+    @param self - The instance of the CardItem class
+    @param event (QGraphicsSceneMouseEvent) - The mouse press
+
+    @return None
+
+    @author Mike
+    '''
+    def mousePressEvent(self, event):
+        if self.onClick is not None:
+            self.onClick(self.slot, self)
+
+class SceneCardRow:
+    '''
+    Initializes the SceneCardRow class, a row of cards on the table with
+    the same render and visibleLabels methods as CardRow. Cards are spaced
+    a card apart until the row would be longer than maxLength, then fanned
+    so they overlap, so a hand of 30 or more cards after a pickup still
+    fits without any relayout.
+
+    @param self - The instance of the SceneCardRow class
+    @param view (SceneView) - The view that owns the card items
+    @param centre (QPointF) - The centre of the row on the table
+    @param vertical (bool) - Flag to run the row down the table instead of across it
+    @param rotation (int) - UPRIGHT, 90 or -90
+    @param maxLength (float) - The longest the row may be before the cards overlap
+    @param zValue (int) - Stacking order of the row, later cards in the row go on top
+    @param enabled (bool) - Whether the cards accept clicks when they join the row
+    @param onClick (function) - Called with the position and item of a clicked card
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, view, centre, vertical, rotation, maxLength, zValue, enabled=True, onClick=None):
+        self.view = view
+        self.centre = centre
+        self.vertical = vertical
+        self.rotation = rotation
+        self.maxLength = maxLength
+        self.zValue = zValue
+        self.enabled = enabled
+        self.onClick = onClick
+        self.items = []
+
+    '''
+    Gets where a card goes in the row.
+
+    @param self - The instance of the SceneCardRow class
+    @param slot (int) - The position of the card in the row
+    @param count (int) - The number of cards in the row
+
+    @return (QPointF) - The centre of the card on the table
+
+    @author Mike
+    '''
+    def slotPosition(self, slot, count):
+        spacing = labelSize()[0]
+        if count > 1:
+            spacing = min(spacing, (self.maxLength - labelSize()[0]) / (count - 1))
+        offset = (slot - (count - 1) / 2) * spacing
+        if self.vertical:
+            return QPointF(self.centre.x(), self.centre.y() + offset)
+        return QPointF(self.centre.x() + offset, self.centre.y())
+
+    '''
+    Shows a list of cards in the row. Each card keeps its item wherever it
+    was before, so a card moving in from another zone is the same item
+    moved, and items that left the row and were not taken by another row
+    are hidden. Any selection highlight is cleared.
+
+    @param self - The instance of the SceneCardRow class
+    @param cards (list) - The cards to show, in order
+    @param faceDown (bool) - Flag to show the backs of the cards
+
+    @return None
+
+    @author Mike
+    '''
+    def render(self, cards, faceDown=False):
+        items = []
+        for slot, card in enumerate(cards):
+            item = self.view.cardItem(card)
+            if item.row is not self:
+                item.row = self
+                item.onClick = self.onClick
+                item.setEnabled(self.enabled)
+                item.show()
+            item.slot = slot
+            item.setCard(BACK if faceDown else card, self.rotation)
+            item.setPos(self.slotPosition(slot, len(cards)))
+            item.setZValue(self.zValue + slot)
+            item.setHighlighted(False)
+            items.append(item)
+        shown = set(items)
+        for item in self.items:
+            if item.row is self and item not in shown:
+                item.row = None
+                item.hide()
+        self.items = items
+
+    '''
+    Gets the items currently shown, one per card.
+
+    @param self - The instance of the SceneCardRow class
+
+    @return (list) - The shown items in order
+
+    @author Mike
+    '''
+    def visibleLabels(self):
+        return self.items
+
+    '''
+    Forgets the pixmap each shown card was drawn with, so the next render
+    draws them all again.
+
+    @param self - The instance of the SceneCardRow class
+
+    @return None
+
+    @author Mike
+    '''
+    def invalidate(self):
+        for item in self.items:
+            item.key = None
+
+    '''
+    Gets the centre of the row, where cards fly to and from.
+
+    @param self - The instance of the SceneCardRow class
+
+    @return (QPoint) - The centre in the view's coordinates
+
+    @author Mike
+    '''
+    def centrePoint(self):
+        return self.centre.toPoint()
+
+class SceneView(View):
+    '''
+    Initializes the SceneView class, an optional View backend that draws the
+    cards as items in one QGraphicsScene behind the usual controls instead
+    of as QLabels in nested layouts. Items are cached as device pixmaps and
+    only move, flip or rotate when a card changes zone, so a move repaints
+    just the cards it touched and long hands overlap instead of relaying
+    out the window.
+
+    @param self - The instance of the SceneView class
+    @param controller (Controller) - The controller driving the view
+    @param parent (QWidget) - Optional parent widget
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, controller, parent=None):
+        super().__init__(controller, parent)
+
+    '''
+    Creates the scene and a row on it for each seat's hand, top cards and
+    bottom cards, and keeps the edges of the grid layout clear for them.
+
+    @param self - The instance of the SceneView class
+
+    @return None
+
+    @author Mike
+    '''
+    def createCardRows(self):
+        width = self.width()
+        height = self.height()
+        self.cardItems = {}
+        self.scene = QGraphicsScene(0, 0, width, height, self)
+        self.table = QGraphicsView(self.scene, self)
+        self.table.setGeometry(0, 0, width, height)
+        self.table.setFrameShape(QFrame.Shape.NoFrame)
+        self.table.setStyleSheet("background: transparent;")
+        self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.table.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        self.table.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.table.lower()
+
+        # The bands and insets are for a 1920x1080 screen, scaled like the cards
+        edge = self.scaled(EDGE)
+        handInset = self.scaled(HAND_INSET)
+        tableInset = self.scaled(TABLE_INSET)
+        offset = self.scaled(TOP_CARD_OFFSET)
+
+        # The controls stay in the grid layout, clear of the bands the seats are drawn in
+        self.layout.setRowMinimumHeight(0, edge)
+        self.layout.setRowMinimumHeight(8, edge)
+        self.layout.setColumnMinimumWidth(0, edge)
+        self.layout.setColumnMinimumWidth(8, edge)
+        for title in [self.playerHandLabel, self.AIPlayerLabel1, self.AIPlayerLabel2, self.AIPlayerLabel3]:
+            title.setVisible(False)
+
+        across = width - 2 * edge if self.controller.numPlayers > 2 else width - 2 * handInset
+        down = height - 2 * edge - BUTTON_ROW
+        middle = (height - BUTTON_ROW) / 2
+        bottom = height - BUTTON_ROW
+        self.playerHandRow = SceneCardRow(self, QPointF(width / 2, bottom - handInset), False, UPRIGHT, across, 200,
+                                          onClick=self.handCardClicked)
+        self.bottomCardsRow = SceneCardRow(self, QPointF(width / 2, bottom - tableInset), False, UPRIGHT, across, 0)
+        self.topCardsRow = SceneCardRow(self, QPointF(width / 2 + offset, bottom - tableInset + offset), False, UPRIGHT,
+                                        across, 100, enabled=False)
+
+        seats = {1: (QPointF(width / 2, handInset), QPointF(width / 2, tableInset), False, UPRIGHT, across),
+                 2: (QPointF(handInset, middle), QPointF(tableInset, middle), True, 90, down),
+                 3: (QPointF(width - handInset, middle), QPointF(width - tableInset, middle), True, -90, down)}
+        self.AIHandRows = {}
+        self.AITopCardRows = {}
+        self.AIBottomCardRows = {}
+        for index, (handCentre, tableCentre, vertical, rotation, length) in seats.items():
+            topCentre = tableCentre + QPointF(offset, offset)
+            self.AIHandRows[index] = SceneCardRow(self, handCentre, vertical, rotation, length, 200)
+            self.AIBottomCardRows[index] = SceneCardRow(self, tableCentre, vertical, rotation, length, 0)
+            # AI 1's top cards are drawn disabled like the player's, the sideways seats' are not
+            self.AITopCardRows[index] = SceneCardRow(self, topCentre, vertical, rotation, length, 100,
+                                                     enabled=index != 1)
+
+    '''
+    Gets the item for a card, adding it to the scene the first time.
+
+    @param self - The instance of the SceneView class
+    @param card (int) - The encoded card
+
+    @return item (CardItem) - The card's item
+
+    @author Mike
+    '''
+    def cardItem(self, card):
+        item = self.cardItems.get(card)
+        if item is None:
+            item = CardItem()
+            self.scene.addItem(item)
+            self.cardItems[card] = item
+        return item
+
+    '''
+    Highlights a card in the player's hand as selected, or clears it.
+
+    @param self - The instance of the SceneView class
+    @param cardLabel (CardItem) - The card's item
+    @param selected (bool) - Flag to highlight or clear the card
+
+    @return None
+
+    @author Mike
+    '''
+    def setCardSelected(self, cardLabel, selected):
+        cardLabel.setHighlighted(selected)
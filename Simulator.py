@@ -0,0 +1,339 @@
+'''
+Command-line self-play simulator for comparing AIPlayer difficulties.
+
+Plays N full games between 2-4 AI seats on a process pool and reports win
+rates, turns, pile pickups and bombs with 95% confidence intervals. It only
+uses the headless GameEngine, so no Qt window is created. Every game is
+seeded from (seed, game number), so a run gives the same results whatever
+the worker count.
+
+    python Simulator.py easy impossible -n 20000
+    python Simulator.py easy medium hard impossible -n 5000 --workers 4 --seed 7
+
+The impossible AI's endgame solver and tree search are off unless
+--solver-nodes or --mcts-rollouts is given; they then run with a node or
+rollout budget rather than a time budget so results stay reproducible.
+'''
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from AIPlayer import AIPlayer
+from EndgameSolver import EndgameSolver
+from GameEngine import GameEngine
+from InformationSetMCTS import InformationSetMCTS
+
+DIFFICULTIES = ['easy', 'medium', 'hard', 'impossible']
+CHUNK_SIZE = 250
+Z_95 = 1.96
+
+class SimulationStats:
+    '''
+    Initializes the SimulationStats class, which accumulates per-seat results
+    over many games. Instances are built in the workers and merged in the
+    parent process.
+
+    @param self - The instance of the SimulationStats class
+    @param numSeats (int) - The number of seats in every game
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, numSeats):
+        self.numSeats = numSeats
+        self.games = 0
+        self.unfinished = 0
+        self.wins = [0] * numSeats
+        self.turns = 0
+        self.turnsSquared = 0
+        self.pickUps = [0] * numSeats
+        self.pickUpsSquared = [0] * numSeats
+        self.bombs = [0] * numSeats
+        self.bombsSquared = [0] * numSeats
+
+    '''
+    Records a finished game. The engine may have played the seats in a
+    rotated order, so results are mapped back to the configured seats.
+
+    @param self - The instance of the SimulationStats class
+    @param engine (GameEngine) - The engine the game was played on
+    @param seatOrder (list) - The configured seat of each engine player
+
+    @return None
+
+    @author Mike
+    '''
+    def addGame(self, engine, seatOrder):
+        self.games += 1
+        self.turns += engine.turnCount
+        self.turnsSquared += engine.turnCount * engine.turnCount
+        if engine.winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[seatOrder[engine.winner]] += 1
+        for playerIndex, seat in enumerate(seatOrder):
+            pickUps = engine.pickUpCounts[playerIndex]
+            bombs = engine.bombCounts[playerIndex]
+            self.pickUps[seat] += pickUps
+            self.pickUpsSquared[seat] += pickUps * pickUps
+            self.bombs[seat] += bombs
+            self.bombsSquared[seat] += bombs * bombs
+
+    '''
+    Adds the results of another SimulationStats into this one.
+
+    @param self - The instance of the SimulationStats class
+    @param other (SimulationStats) - The results to add
+
+    @return None
+
+    @author Mike
+    '''
+    def merge(self, other):
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.turns += other.turns
+        self.turnsSquared += other.turnsSquared
+        for seat in range(self.numSeats):
+            self.wins[seat] += other.wins[seat]
+            self.pickUps[seat] += other.pickUps[seat]
+            self.pickUpsSquared[seat] += other.pickUpsSquared[seat]
+            self.bombs[seat] += other.bombs[seat]
+            self.bombsSquared[seat] += other.bombsSquared[seat]
+
+'''
+Computes the Wilson score interval for a proportion.
+
+@param successes (int) - The number of successes
+@param trials (int) - The number of trials
+
+@return (tuple) - The rate, and the lower and upper bounds of the 95% interval
+
+@author Mike
+'''
+def wilsonInterval(successes, trials):
+    if not trials:
+        return 0.0, 0.0, 0.0
+    rate = successes / trials
+    denominator = 1 + Z_95 * Z_95 / trials
+    centre = (rate + Z_95 * Z_95 / (2 * trials)) / denominator
+    margin = Z_95 * math.sqrt(rate * (1 - rate) / trials + Z_95 * Z_95 / (4 * trials * trials)) / denominator
+    return rate, centre - margin, centre + margin
+
+'''
+Computes a mean and the half-width of its 95% confidence interval from a
+running sum and sum of squares.
+
+@param total (int) - The sum of the samples
+@param totalSquared (int) - The sum of the squared samples
+@param count (int) - The number of samples
+
+@return (tuple) - The mean and the half-width of the interval
+
+@author Mike
+'''
+def meanInterval(total, totalSquared, count):
+    if not count:
+        return 0.0, 0.0
+    mean = total / count
+    variance = max(totalSquared / count - mean * mean, 0.0)
+    return mean, Z_95 * math.sqrt(variance / count)
+
+'''
+Derives the seeds of one game from the seed of the run, so every game can
+be replayed on its own.
+
+@param seed (int) - The base seed of the run
+@param gameIndex (int) - The number of the game within the run
+@param numSeats (int) - The number of seats in the game
+
+@return (tuple) - The rng seed of each engine player and the deck shuffle seed
+
+@author Mike
+'''
+def gameSeeds(seed, gameIndex, numSeats):
+    gameRng = random.Random(seed * 1000003 + gameIndex)
+    playerSeeds = [gameRng.getrandbits(64) for _ in range(numSeats)]
+    return playerSeeds, gameRng.getrandbits(64)
+
+'''
+Gets which configured seat each engine player is in one game. With
+rotation on, the seat that moves first changes from game to game.
+
+@param gameIndex (int) - The number of the game within the run
+@param numSeats (int) - The number of seats in the game
+@param rotate (bool) - Whether to rotate which seat moves first
+
+@return (list) - The configured seat of each engine player
+
+@author Mike
+'''
+def seatOrderFor(gameIndex, numSeats, rotate):
+    offset = gameIndex % numSeats if rotate else 0
+    return [(offset + i) % numSeats for i in range(numSeats)]
+
+'''
+Deals a game with every seat controlled by an AIPlayer and lets the AIs
+choose their top cards.
+
+@param difficulties (list) - The difficulty of each configured seat
+@param seed (int) - The base seed of the run
+@param gameIndex (int) - The number of the game within the run
+@param rotate (bool) - Whether to rotate which seat moves first
+@param solverNodes (int) - Node budget per move for the endgame solver, 0 to leave it off
+@param mctsRollouts (int) - Rollouts per move for the impossible AI's tree search, 0 to leave it off
+
+@return (tuple) - The engine and the configured seat of each engine player
+
+@author Mike
+'''
+def createGame(difficulties, seed, gameIndex, rotate, solverNodes=0, mctsRollouts=0):
+    seatOrder = seatOrderFor(gameIndex, len(difficulties), rotate)
+    playerSeeds, deckSeed = gameSeeds(seed, gameIndex, len(difficulties))
+    players = [AIPlayer(f"AI{seat}", difficulties[seat], rng=random.Random(playerSeed),
+                        solver=EndgameSolver(timeBudget=None, nodeBudget=solverNodes),
+                        searcher=InformationSetMCTS(budgetMs=None, workers=1, rollouts=mctsRollouts, seed=playerSeed))
+               for seat, playerSeed in zip(seatOrder, playerSeeds)]
+    engine = GameEngine(players, seed=deckSeed)
+    engine.setupGame()
+    engine.chooseAITopCards()
+    return engine, seatOrder
+
+'''
+Plays one game with every seat controlled by an AIPlayer.
+
+@param difficulties (list) - The difficulty of each configured seat
+@param seed (int) - The base seed of the run
+@param gameIndex (int) - The number of the game within the run
+@param rotate (bool) - Whether to rotate which seat moves first
+@param maxTurns (int) - Turn limit after which the game counts as unfinished
+@param solverNodes (int) - Node budget per move for the endgame solver, 0 to leave it off
+@param mctsRollouts (int) - Rollouts per move for the impossible AI's tree search, 0 to leave it off
+
+@return (tuple) - The finished engine and the configured seat of each engine player
+
+@author Mike
+'''
+def playGame(difficulties, seed, gameIndex, rotate, maxTurns, solverNodes=0, mctsRollouts=0):
+    engine, seatOrder = createGame(difficulties, seed, gameIndex, rotate, solverNodes, mctsRollouts)
+    engine.playGame(maxTurns)
+    return engine, seatOrder
+
+'''
+Plays a contiguous block of games in a worker process.
+
+@param difficulties (list) - The difficulty of each configured seat
+@param seed (int) - The base seed of the run
+@param start (int) - The number of the first game in the block
+@param stop (int) - The number one past the last game in the block
+@param rotate (bool) - Whether to rotate which seat moves first
+@param maxTurns (int) - Turn limit after which a game counts as unfinished
+@param solverNodes (int) - Node budget per move for the endgame solver, 0 to leave it off
+@param mctsRollouts (int) - Rollouts per move for the impossible AI's tree search, 0 to leave it off
+
+@return stats (SimulationStats) - The results of the block
+
+@author Mike
+'''
+def playChunk(difficulties, seed, start, stop, rotate, maxTurns, solverNodes=0, mctsRollouts=0):
+    stats = SimulationStats(len(difficulties))
+    for gameIndex in range(start, stop):
+        engine, seatOrder = playGame(difficulties, seed, gameIndex, rotate, maxTurns, solverNodes, mctsRollouts)
+        stats.addGame(engine, seatOrder)
+    return stats
+
+'''
+Plays a batch of games spread across a process pool.
+
+@param difficulties (list) - The difficulty of each seat, 2 to 4 seats
+@param numGames (int) - The number of games to play
+@param workers (int) - The number of worker processes, 1 plays in-process
+@param seed (int) - The base seed of the run
+@param rotate (bool) - Whether to rotate which seat moves first
+@param maxTurns (int) - Turn limit after which a game counts as unfinished
+@param solverNodes (int) - Node budget per move for the endgame solver, 0 to leave it off
+@param mctsRollouts (int) - Rollouts per move for the impossible AI's tree search, 0 to leave it off
+
+@return stats (SimulationStats) - The merged results
+
+@author Mike
+'''
+def simulate(difficulties, numGames, workers=None, seed=0, rotate=True, maxTurns=10000, solverNodes=0,
+             mctsRollouts=0):
+    workers = workers or os.cpu_count() or 1
+    stats = SimulationStats(len(difficulties))
+    chunks = [(start, min(start + CHUNK_SIZE, numGames)) for start in range(0, numGames, CHUNK_SIZE)]
+    if workers == 1:
+        for start, stop in chunks:
+            stats.merge(playChunk(difficulties, seed, start, stop, rotate, maxTurns, solverNodes, mctsRollouts))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(playChunk, difficulties, seed, start, stop, rotate, maxTurns, solverNodes,
+                                   mctsRollouts)
+                   for start, stop in chunks]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+'''
+Prints the results of a run as a table.
+
+@param difficulties (list) - The difficulty of each seat
+@param stats (SimulationStats) - The merged results
+@param elapsed (float) - The wall-clock time of the run in seconds
+@param workers (int) - The number of worker processes used
+
+@return None
+
+@author Mike
+'''
+def printReport(difficulties, stats, elapsed, workers):
+    gamesPerSecond = stats.games / elapsed if elapsed else 0.0
+    print(f"Simulated {stats.games} games on {workers} worker(s) in {elapsed:.2f} s ({gamesPerSecond:.0f} games/s)")
+    print(f"{'Seat':<6}{'Difficulty':<12}{'Win rate (95% CI)':<28}{'Pickups/game':<18}{'Bombs/game':<18}")
+    for seat, difficulty in enumerate(difficulties):
+        rate, low, high = wilsonInterval(stats.wins[seat], stats.games)
+        pickUps, pickUpsMargin = meanInterval(stats.pickUps[seat], stats.pickUpsSquared[seat], stats.games)
+        bombs, bombsMargin = meanInterval(stats.bombs[seat], stats.bombsSquared[seat], stats.games)
+        winRate = f"{rate:.1%} [{low:.1%}, {high:.1%}]"
+        print(f"{seat + 1:<6}{difficulty:<12}{winRate:<28}"
+              f"{f'{pickUps:.2f} ± {pickUpsMargin:.2f}':<18}{f'{bombs:.2f} ± {bombsMargin:.2f}':<18}")
+    turns, turnsMargin = meanInterval(stats.turns, stats.turnsSquared, stats.games)
+    print(f"Turns/game: {turns:.1f} ± {turnsMargin:.1f}    Unfinished (turn limit): {stats.unfinished}")
+
+'''
+Parses the command line, runs the simulation and prints the report.
+
+@return None
+
+@author Mike
+'''
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Palace games between AI difficulties.")
+    parser.add_argument("seats", nargs="+", choices=DIFFICULTIES,
+                        help="difficulty of each seat, 2 to 4 seats")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed, the same seed replays the same games")
+    parser.add_argument("--max-turns", type=int, default=10000, help="turn limit per game")
+    parser.add_argument("--no-rotate", action="store_true",
+                        help="always let seat 1 move first instead of rotating the first seat")
+    parser.add_argument("--solver-nodes", type=int, default=0,
+                        help="node budget per move for the impossible endgame solver, 0 leaves it off")
+    parser.add_argument("--mcts-rollouts", type=int, default=0,
+                        help="rollouts per move for the impossible tree search, 0 leaves it off")
+    args = parser.parse_args()
+    if not 2 <= len(args.seats) <= 4:
+        parser.error("between 2 and 4 seats are required")
+
+    workers = max(1, args.workers or 1)
+    startTime = time.perf_counter()
+    stats = simulate(args.seats, args.games, workers, args.seed, not args.no_rotate, args.max_turns,
+                     args.solver_nodes, args.mcts_rollouts)
+    printReport(args.seats, stats, time.perf_counter() - startTime, workers)
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,267 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, \
     QLabel, QGridLayout, QSpacerItem, QSizePolicy
-from PySide6.QtGui import QFontMetrics, QPixmap, QIcon, QTransform, QPainter
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QFontMetrics, QPixmap, QTransform, QPainter
+from PySide6.QtCore import Qt, QPoint
+from CardImageCache import CardImageCache, BACK, UPRIGHT
+from Assets import BACKGROUND
+from ImageLoader import getImageLoader, loadWindowIcon
 
-CARD_WIDTH = 56
+CARD_WIDTH = 56  # Sizes on a 1920x1080 screen, see screenScale
 CARD_HEIGHT = 84
 BUTTON_WIDTH = 66
 BUTTON_HEIGHT = 87
+REFERENCE_SCREEN_WIDTH = 1920
+REFERENCE_SCREEN_HEIGHT = 1080
+MIN_SCALE = 0.75
+MAX_SCALE = 2.0
 
-class View(QWidget):
-    global scalingFactorWidth
-    global scalingFactorHeight
+CARD_STYLE = "border: 0px solid black; background-color: transparent;"
+SELECTED_CARD_STYLE = "border: 0px solid black; background-color: blue;"
+BACKGROUND_PLACEHOLDER_STYLE = "background-color: #202124;"  # The theme's background until the art is decoded
+
+cardImages = CardImageCache(CARD_WIDTH, CARD_HEIGHT)  # Shared by every game window
+
+'''
+Picks how much to scale the table for a screen by comparing the space the
+screen has free with 1920x1080, so the game window fits on a small laptop
+screen and gets bigger cards on a large one. The scale is rounded to a
+quarter, so screens of nearly the same size share one card atlas.
+Sharpness on HiDPI screens is handled separately by the pixel ratio.
+
+@param screen (QScreen) - The screen the window opens on
+
+@return (float) - The scale, 1 on a 1920x1080 screen
+
+@author Mike
+'''
+def screenScale(screen):
+    available = screen.availableGeometry()
+    scale = min(available.width() / REFERENCE_SCREEN_WIDTH, available.height() / REFERENCE_SCREEN_HEIGHT)
+    return min(MAX_SCALE, max(MIN_SCALE, round(scale * 4) / 4))
+
+'''
+Gets the fixed size of a card label at the current card size.
+
+@param rotation (int) - UPRIGHT, 90 or -90
+
+@return (tuple) - The width and height
+
+@author Mike
+'''
+def labelSize(rotation=UPRIGHT):
+    width = round(BUTTON_WIDTH * cardImages.width / CARD_WIDTH)
+    height = round(BUTTON_HEIGHT * cardImages.height / CARD_HEIGHT)
+    if rotation == UPRIGHT:
+        return width, height
+    return height, width
+
+class CardRow:
+    '''
+    Initializes the CardRow class, which draws one row of cards (a hand,
+    top cards or bottom cards) into a layout and reconciles it on every
+    update instead of rebuilding it. Labels are matched to cards by
+    position. A label only gets a new pixmap when the card in its slot
+    changed, and labels that are no longer needed are hidden and kept as a
+    pool for the next time the row grows. Each label gets its click
+    handler once, when it is created.
+
+    @param self - The instance of the CardRow class
+    @param layout (QLayout) - The layout the row is drawn into
+    @param rotation (int) - UPRIGHT, 90 or -90
+    @param enabled (bool) - Whether the labels accept clicks when they are shown
+    @param placeholder (bool) - Whether to keep the row's space with an empty label when it has no cards
+    @param onClick (function) - Called with the position and label of a clicked card
+
+    @return None
+
+    @author Mike
+    '''
+    def __init__(self, layout, rotation=UPRIGHT, enabled=True, placeholder=False, onClick=None):
+        self.layout = layout
+        self.rotation = rotation
+        self.enabled = enabled
+        self.onClick = onClick
+        self.labels = []  # Every label in the row, shown ones first
+        self.labelKeys = []  # What each label was last drawn with, hidden ones included
+        self.count = 0  # How many labels are shown
+        self.placeholder = None
+        if placeholder:
+            self.placeholder = QLabel()
+            self.placeholder.setFixedSize(*self.labelSize())
+            self.placeholder.hide()
+            self.layout.addWidget(self.placeholder)
+
+    '''
+    Gets the fixed size of a label in this row.
+
+    @param self - The instance of the CardRow class
+
+    @return (tuple) - The width and height
+
+    @author Mike
+    '''
+    def labelSize(self):
+        return labelSize(self.rotation)
+
+    '''
+    Creates a label for the next slot in the row and adds it to the layout.
+
+    @param self - The instance of the CardRow class
+    @param slot (int) - The position of the label in the row
+
+    @return label (QLabel) - The new label
+
+    @author Mike
+    '''
+    def createLabel(self, slot):
+        label = QLabel()
+        label.setFixedSize(*self.labelSize())
+        label.setStyleSheet(CARD_STYLE)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        if self.onClick is not None:
+            label.mousePressEvent = lambda event, slot=slot, label=label: self.onClick(slot, label)
+        self.layout.addWidget(label)
+        self.labels.append(label)
+        self.labelKeys.append(None)
+        return label
+
+    '''
+    Shows a list of cards in the row, touching only the slots that changed.
+    Any selection highlight is cleared.
+
+    @param self - The instance of the CardRow class
+    @param cards (list) - The cards to show, in order
+    @param faceDown (bool) - Flag to show the backs of the cards
+
+    @return None
+
+    @author Mike
+    '''
+    def render(self, cards, faceDown=False):
+        for slot, card in enumerate(cards):
+            key = BACK if faceDown else card
+            label = self.labels[slot] if slot < len(self.labels) else self.createLabel(slot)
+            if self.labelKeys[slot] != key:
+                label.setPixmap(cardImages.pixmap(key, self.rotation))
+                self.labelKeys[slot] = key
+            if label.styleSheet() != CARD_STYLE:
+                label.setStyleSheet(CARD_STYLE)
+            if slot >= self.count:
+                label.setEnabled(self.enabled)
+                label.show()
+        for label in self.labels[len(cards):self.count]:
+            label.hide()
+        self.count = len(cards)
+        if self.placeholder is not None:
+            self.placeholder.setVisible(not cards)
+
+    '''
+    Gets the labels currently shown, one per card.
+
+    @param self - The instance of the CardRow class
+
+    @return (list) - The shown labels in order
 
+    @author Mike
+    '''
+    def visibleLabels(self):
+        return self.labels[:self.count]
+
+    '''
+    Forgets the pixmap each label was drawn with, so the next render draws
+    every card again.
+
+    @param self - The instance of the CardRow class
+
+    @return None
+
+    @author Mike
+    '''
+    def invalidate(self):
+        self.labelKeys = [None] * len(self.labels)
+
+    '''
+    Gets the centre of the row, where cards fly to and from.
+
+    @param self - The instance of the CardRow class
+
+    @return (QPoint) - The centre in the view's coordinates
+
+    @author Mike
+    '''
+    def centrePoint(self):
+        return self.layout.geometry().center()
+
+class View(QWidget):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
+        self.scale = screenScale(self.screen())
+        self.cardImages = cardImages
+        self.cardImages.setCardSize(self.scaled(CARD_WIDTH), self.scaled(CARD_HEIGHT))
+        self.cardImages.setDevicePixelRatio(self.devicePixelRatioF())
+        self.screenHooked = False
         self.initUI()
 
+    '''
+    Scales a size or position from the 1920x1080 layout to the screen the
+    window opened on.
+
+    @param self - The instance of the View class
+    @param value (int) - The size or position on a 1920x1080 screen
+
+    @return (int) - The size or position on this screen
+
+    @author Mike
+    '''
+    def scaled(self, value):
+        return round(value * self.scale)
+
+    '''
+    Starts following the screen the window is on once it has a native
+    window, so cards are drawn again for a screen with another pixel ratio.
+
+    @param self - The instance of the View class
+    @param event (QShowEvent) - The show event
+
+    @return None
+
+    @author Mike
+    '''
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.screenHooked:
+            self.windowHandle().screenChanged.connect(self.screenChanged)
+            self.screenHooked = True
+        self.screenChanged()
+
+    '''
+    Re-renders every card from the pixmap cache when the window has moved to
+    a screen with a different pixel ratio. Cards are cut for the new ratio
+    the first time each is drawn, instead of the old pixmaps being stretched.
+
+    @param self - The instance of the View class
+    @param screen (QScreen) - The screen the window moved to, unused
+
+    @return None
+
+    @author Mike
+    '''
+    def screenChanged(self, screen=None):
+        if not self.cardImages.setDevicePixelRatio(self.devicePixelRatioF()):
+            return
+        rows = [self.playerHandRow, self.topCardsRow, self.bottomCardsRow, *self.AIHandRows.values(),
+                *self.AITopCardRows.values(), *self.AIBottomCardRows.values()]
+        for row in rows:
+            row.invalidate()
+        if self.controller.topCardSelectionPhase:
+            self.updatePlayerHand(self.controller.players[0].hand)
+            labels = self.playerHandRow.visibleLabels()
+            for _, cardIndex in self.chosenCards:
+                self.setCardSelected(labels[cardIndex], True)
+        else:
+            self.controller.renderState()
+
     '''
     Initializes the UI for the View, sets up the layout, and connects the 
     necessary buttons to their functions.
@@ -30,15 +275,9 @@ class View(QWidget):
     def initUI(self):
         # Set up main window properties
         self.setWindowTitle('Palace Card Game')
-        self.setWindowIcon(QIcon(r"_internal\palaceData\palace.ico"))
-        self.setGeometry(410, 75, 1095, 900)
-        self.setFixedSize(1095, 900)
-        
-        # self.backgroundLabel = QLabel(self)
-        # self.backgroundPixmap = QPixmap(r"_internal\palaceData\background.png")
-        # self.backgroundLabel.setPixmap(self.backgroundPixmap)
-        # self.backgroundLabel.setGeometry(self.rect())
-        # self.backgroundLabel.lower()
+        loadWindowIcon(self)
+        self.setGeometry(self.scaled(410), self.scaled(75), self.scaled(1095), self.scaled(900))
+        self.setFixedSize(self.scaled(1095), self.scaled(900))
         
         self.layout = QGridLayout()
         
@@ -66,6 +305,20 @@ class View(QWidget):
         self.centerLayout.addWidget(QLabel(""))
         self.centerLayout.addWidget(self.currentPlayerLabel, alignment=Qt.AlignmentFlag.AlignCenter)
         self.centerLayout.addLayout(self.consoleLayout)
+
+        # Fast forward plays AI turns without pacing, auto-play hands the player's turns to an AI as well
+        self.fastForwardButton = QPushButton("Fast Forward")
+        self.fastForwardButton.setCheckable(True)
+        self.fastForwardButton.setVisible(False)
+        self.fastForwardButton.toggled.connect(self.controller.setFastForward)
+        self.autoPlayButton = QPushButton("Auto-play Me")
+        self.autoPlayButton.setCheckable(True)
+        self.autoPlayButton.setVisible(False)
+        self.autoPlayButton.toggled.connect(self.controller.setAutoPlay)
+        self.fastForwardLayout = QHBoxLayout()
+        self.fastForwardLayout.addWidget(self.fastForwardButton, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.fastForwardLayout.addWidget(self.autoPlayButton, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.centerLayout.addLayout(self.fastForwardLayout)
         self.centerLayout.addWidget(QLabel(""))
         self.centerLayout.addWidget(QLabel(""))
         
@@ -139,8 +392,8 @@ class View(QWidget):
         # Hide AI Player 2 and 3 layouts if less than 3 or 4 players    
         if self.controller.numPlayers < 3:
             self.AIPlayerLabel2.setText("")
-            self.setGeometry(550, 75, 900, 850)
-            self.setFixedSize(900, 850)
+            self.setGeometry(self.scaled(550), self.scaled(75), self.scaled(900), self.scaled(850))
+            self.setFixedSize(self.scaled(900), self.scaled(850))
         if self.controller.numPlayers < 4:
             self.AIPlayerLabel3.setText("")
 
@@ -155,81 +408,143 @@ class View(QWidget):
         self.placeButton.setVisible(False)
         self.layout.addWidget(self.placeButton, 10, 4)
 
+        # The background is decoded off the GUI thread straight to the window's size
+        self.backgroundLabel = QLabel(self)
+        self.backgroundLabel.setGeometry(self.rect())
+        self.backgroundLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.backgroundLabel.setStyleSheet(BACKGROUND_PLACEHOLDER_STYLE)
+        getImageLoader().load(BACKGROUND, self.size(), self, self.showBackground)
+
+        self.createCardRows()
+        self.backgroundLabel.lower()
         self.setLayout(self.layout)
+
+    '''
+    Shows the decoded background art in place of its placeholder.
+
+    @param self - The instance of the View class
+    @param image (QImage) - The background, decoded to cover the window
+
+    @return None
+
+    @author Mike
+    '''
+    def showBackground(self, image):
+        self.backgroundLabel.setPixmap(QPixmap.fromImage(image))
+        self.backgroundLabel.setStyleSheet("")
+
+    '''
+    Creates the rows that draw each seat's hand, top cards and bottom cards.
+
+    @param self - The instance of the View class
+
+    @return None
+
+    @author Mike
+    '''
+    def createCardRows(self):
+        # Card rows reuse their labels for the whole game, AI 2 and AI 3 sit sideways
+        rotations = {1: UPRIGHT, 2: 90, 3: -90}
+        self.playerHandRow = CardRow(self.playerHandLayout, onClick=self.handCardClicked)
+        self.topCardsRow = CardRow(self.topCardsLayout, enabled=False, placeholder=True)
+        self.bottomCardsRow = CardRow(self.bottomCardsLayout, placeholder=True)
+        self.AIHandRows = {}
+        self.AITopCardRows = {}
+        self.AIBottomCardRows = {}
+        for index, rotation in rotations.items():
+            self.AIHandRows[index] = CardRow(getattr(self, f'AIHandLayout{index}'), rotation)
+            # AI 1's top cards are drawn disabled like the player's, the sideways seats' are not
+            self.AITopCardRows[index] = CardRow(getattr(self, f'AITopCardsLayout{index}'), rotation,
+                                                enabled=index != 1, placeholder=True)
+            self.AIBottomCardRows[index] = CardRow(getattr(self, f'AIBottomCardsLayout{index}'), rotation,
+                                                   placeholder=True)
     
     '''
-    Updates the displayed hand of a player or AI in the game UI.
+    Gets the row a seat's hand is drawn in.
+
+    @param self - The instance of the View class
+    @param playerIndex (int) - The index of the seat
+
+    @return (CardRow) - The hand row
+
+    @author Mike
+    '''
+    def handRow(self, playerIndex):
+        return self.playerHandRow if playerIndex == 0 else self.AIHandRows[playerIndex]
+
+    '''
+    Gets the centre of a label in the view's coordinates, where cards fly
+    to and from.
+
+    @param self - The instance of the View class
+    @param label (QLabel) - The pile or deck label
+
+    @return (QPoint) - The centre of the label
+
+    @author Mike
+    '''
+    def labelCentre(self, label):
+        return label.mapTo(self, label.rect().center())
+
+    '''
+    Gets the point off the right of the table that bombed cards fly to.
 
     @param self - The instance of the View class
-    @param hand (list) - The list of cards in the hand
-    @param layout (QLayout) - The layout to update with the hand cards
-    @param isPlayer (bool) - Flag to indicate if the hand belongs to the player
-    @param rotate (bool) - Flag to indicate if the cards should be rotated
+
+    @return (QPoint) - The point in the view's coordinates
+
+    @author Mike
+    '''
+    def discardPoint(self):
+        return QPoint(self.width() + labelSize()[0], self.labelCentre(self.pileLabel).y())
+
+    '''
+    Handles a click on a card in the player's hand row. The labels are
+    reused for the whole game, so the click is routed by the phase the game
+    is in when it happens.
+
+    @param self - The instance of the View class
+    @param cardIndex (int) - The position of the card in the hand row
+    @param cardLabel (QLabel) - The label that was clicked
+
+    @return None
+
+    @author Mike
+    '''
+    def handCardClicked(self, cardIndex, cardLabel):
+        if self.controller.topCardSelectionPhase:
+            self.selectTopCard(cardIndex, cardLabel)
+        else:
+            self.controller.prepareCardPlacement(cardIndex, cardLabel)
+
+    '''
+    Highlights a card in the player's hand as selected, or clears it.
+
+    @param self - The instance of the View class
+    @param cardLabel (QLabel) - The card's label
+    @param selected (bool) - Flag to highlight or clear the card
 
     @return None
 
     @author Mike
     '''
-    def updateHand(self, hand, layout, isPlayer=True, rotate=False):
-        # Clear the existing layout
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-
-        if isPlayer:
-            self.controller.playCardButtons = []
-
-        for idx, card in enumerate(hand):
-            button = QLabel()
-            if rotate:
-                button.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-            else:
-                button.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
-            if not card[3] and isPlayer: 
-                pixmap = QPixmap(
-                    fr"_internal\palaceData\cards\{card[0].lower()}_of_{card[1].lower()}.png")
-                if rotate:
-                    transform = QTransform().rotate(90)
-                    pixmap = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation).scaled(CARD_HEIGHT, CARD_WIDTH, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                else:
-                    pixmap = pixmap.scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setPixmap(pixmap)
-            else:
-                pixmap = QPixmap(r"_internal\palaceData\cards\back.png")
-                if rotate:
-                    transform = QTransform().rotate(90)
-                    pixmap = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation).scaled(CARD_HEIGHT, CARD_WIDTH, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                else:
-                    pixmap = pixmap.scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setPixmap(pixmap)
-            button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            if isPlayer:
-                if self.controller.topCardSelectionPhase:
-                    button.mousePressEvent = lambda event, idx=idx, btn=button: self.selectTopCard(idx, btn)
-                else:
-                    try:
-                        button.mousePressEvent = lambda event, idx=idx, btn=button: self.controller.prepareCardPlacement(idx, btn)
-                    except IndexError:
-                        return
-                self.controller.playCardButtons.append(button)
-            layout.addWidget(button)
+    def setCardSelected(self, cardLabel, selected):
+        cardLabel.setStyleSheet(SELECTED_CARD_STYLE if selected else CARD_STYLE)
 
     '''
     Updates the displayed hand of the player in the game UI.
 
     @param self - The instance of the View class
     @param hand (list) - The list of cards in the player's hand
+    @param faceDown (bool) - Flag to indicate if the cards are bottom cards played blind
 
     @return None
 
     @author Mike
     '''
-    def updatePlayerHand(self, hand):
-        self.updateHand(hand, self.playerHandLayout, isPlayer=True)
+    def updatePlayerHand(self, hand, faceDown=False):
+        self.playerHandRow.render(hand, faceDown)
+        self.controller.playCardButtons = self.playerHandRow.visibleLabels()
 
     '''
     Updates the displayed hand of an AI player in the game UI.
@@ -243,9 +558,7 @@ class View(QWidget):
     @author Mike
     '''
     def updateAIHand(self, hand, AI_Index):
-        rotate = AI_Index in [2, 3]  # Rotate cards for AI2 and AI3
-        layout = getattr(self, f'AIHandLayout{AI_Index}')
-        self.updateHand(hand, layout, isPlayer=False, rotate=rotate)
+        self.AIHandRows[AI_Index].render(hand, faceDown=True)
 
     '''
     Updates the displayed top cards of the player in the game UI.
@@ -258,28 +571,8 @@ class View(QWidget):
     @author Mike
     '''
     def updateTopCardButtons(self, topCards):
-        for i in reversed(range(self.topCardsLayout.count())):
-            self.topCardsLayout.itemAt(i).widget().deleteLater()
-
-        for card in topCards:
-            button = QLabel()
-            button.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
-            pixmap = QPixmap(f"_internal\palaceData\cards\{card[0].lower()}_of_{card[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            button.setPixmap(pixmap)
-            button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            button.setDisabled(True)
-            self.topCardsLayout.addWidget(button)
-        if not topCards:
-            self.placeholder = QLabel()
-            self.placeholder.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            self.topCardsLayout.addWidget(self.placeholder)
-        else:
-            for i in reversed(range(self.topCardsLayout.count())):
-                widget = self.topCardsLayout.itemAt(i).widget()
-                if isinstance(widget, QLabel) and not widget.pixmap():
-                    widget.deleteLater()
-    
+        self.topCardsRow.render(topCards)
+
     '''
     Updates the displayed bottom cards of the player in the game UI.
 
@@ -291,26 +584,7 @@ class View(QWidget):
     @author Mike
     '''
     def updateBottomCardButtons(self, bottomCards):
-        for i in reversed(range(self.bottomCardsLayout.count())):
-            self.bottomCardsLayout.itemAt(i).widget().deleteLater()
-
-        for card in bottomCards:
-            button = QLabel()
-            button.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
-            pixmap = QPixmap(r"_internal\palaceData\cards\back.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            button.setPixmap(pixmap)
-            button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.bottomCardsLayout.addWidget(button)
-        if not bottomCards:
-            self.placeholder = QLabel()
-            self.placeholder.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            self.bottomCardsLayout.addWidget(self.placeholder)
-        else:
-            for i in reversed(range(self.topCardsLayout.count())):
-                widget = self.bottomCardsLayout.itemAt(i).widget()
-                if isinstance(widget, QLabel) and not widget.pixmap():
-                    widget.deleteLater()
+        self.bottomCardsRow.render(bottomCards, faceDown=True)
 
     '''
     Updates the displayed top cards of an AI player in the game UI.
@@ -324,41 +598,7 @@ class View(QWidget):
     @author Mike
     '''
     def updateAITopCardButtons(self, topCards, AI_Index):
-        layout = getattr(self, f'AITopCardsLayout{AI_Index}')
-        for i in reversed(range(layout.count())):
-            layout.itemAt(i).widget().deleteLater()
-
-        for card in topCards:
-            button = QLabel()
-            button.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
-            pixmap = QPixmap(f"_internal/palaceData/cards/{card[0].lower()}_of_{card[1].lower()}.png")
-            if AI_Index in [2, 3]:  # Rotate cards for AI2 and AI3
-                transform = QTransform().rotate(90 if AI_Index == 2 else -90)
-                pixmap = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation).scaled(CARD_HEIGHT, CARD_WIDTH, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-                button.setPixmap(pixmap)
-                button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            else:
-                pixmap = pixmap.scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setPixmap(pixmap)
-                button.setDisabled(True)
-                button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(button)
-        if not topCards:
-            if AI_Index in [2, 3]: # Rotate cards for AI2 and AI3
-                self.placeholder = QLabel()
-                self.placeholder.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-                layout.addWidget(self.placeholder)
-            else:
-                self.placeholder = QLabel()
-                self.placeholder.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-                layout.addWidget(self.placeholder)
-        else:
-            for i in reversed(range(layout.count())):
-                widget = layout.itemAt(i).widget()
-                if isinstance(widget, QLabel) and not widget.pixmap():
-                    widget.deleteLater()
+        self.AITopCardRows[AI_Index].render(topCards)
 
     '''
     Updates the displayed bottom cards of an AI player in the game UI.
@@ -372,86 +612,71 @@ class View(QWidget):
     @author Mike
     '''
     def updateAIBottomCardButtons(self, bottomCards, AI_Index):
-        layout = getattr(self, f'AIBottomCardsLayout{AI_Index}')
-        for i in reversed(range(layout.count())):
-            layout.itemAt(i).widget().deleteLater()
-
-        for card in bottomCards:
-            button = QLabel()
-            button.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
-            pixmap = QPixmap(r"_internal\palaceData\cards\back.png")
-            if AI_Index in [2, 3]:  # Rotate cards for AI2 and AI3
-                transform = QTransform().rotate(90 if AI_Index == 2 else -90)
-                pixmap = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation).scaled(CARD_HEIGHT, CARD_WIDTH, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-                button.setPixmap(pixmap)
-                button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            else:
-                pixmap = pixmap.scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                button.setPixmap(pixmap)
-                button.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(button)
-        if not bottomCards:
-            if AI_Index in [2, 3]: # Rotate cards for AI2 and AI3
-                self.placeholder = QLabel()
-                self.placeholder.setFixedSize(BUTTON_HEIGHT, BUTTON_WIDTH)
-                layout.addWidget(self.placeholder)
-            else:
-                self.placeholder = QLabel()
-                self.placeholder.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-                layout.addWidget(self.placeholder)
-        else:
-            for i in reversed(range(self.topCardsLayout.count())):
-                widget = layout.itemAt(i).widget()
-                if isinstance(widget, QLabel) and not widget.pixmap():
-                    widget.deleteLater()
+        self.AIBottomCardRows[AI_Index].render(bottomCards, faceDown=True)
 
     '''
-    Updates the UI elements to reflect the current game state.
+    Updates the UI elements to reflect the current game state. The pile
+    label is drawn by the Controller when the pile changes, not here.
 
     @param self - The instance of the View class
     @param currentPlayer (Player) - The current player
     @param deckSize (int) - The number of cards remaining in the deck
-    @param pile (list) - The current pile of cards
 
     @return None
 
     @author Mike
     '''
-    def updateUI(self, currentPlayer, deckSize, pile):
+    def updateUI(self, currentPlayer, deckSize):
         if self.controller.topCardSelectionPhase:
             self.currentPlayerLabel.setText(f"Select your 3 Top cards...")
             self.confirmButton.setEnabled(len(self.chosenCards) == 3)
         else:
-            self.currentPlayerLabel.setText(f"Current Player: {currentPlayer.name}")
+            self.updateCurrentPlayer(currentPlayer)
+            self.updateDeckLabel(deckSize)
+            self.placeButton.setEnabled(len(self.controller.selectedCards) > 0)
 
-            if deckSize:
-                self.deckLabel.setText(f"Draw Deck:\n\n{deckSize} cards remaining")
-            else:
-                self.deckLabel.setText("Draw Deck:\n\nEmpty")
+    '''
+    Shows whose turn it is.
 
-            if pile:
-                topCard = pile[-1]
-                pixmap = QPixmap(fr"_internal/palaceData/cards/{topCard[0].lower()}_of_{topCard[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                self.pileLabel.setPixmap(pixmap)
+    @param self - The instance of the View class
+    @param currentPlayer (Player) - The current player
 
-            self.placeButton.setEnabled(len(self.controller.selectedCards) > 0)
+    @return None
+
+    @author Mike
+    '''
+    def updateCurrentPlayer(self, currentPlayer):
+        self.currentPlayerLabel.setText(f"Current Player: {currentPlayer.name}")
+
+    '''
+    Shows how many cards are left in the draw deck.
+
+    @param self - The instance of the View class
+    @param deckSize (int) - The number of cards remaining in the deck
+
+    @return None
+
+    @author Mike
+    '''
+    def updateDeckLabel(self, deckSize):
+        if deckSize:
+            self.deckLabel.setText(f"Draw Deck:\n\n{deckSize} cards remaining")
+        else:
+            self.deckLabel.setText("Draw Deck:\n\nEmpty")
 
     '''
     Reveals a card by updating its label with the card's image.
 
     @param self - The instance of the View class
     @param cardLabel (QLabel) - The label to update with the card's image
-    @param card (tuple) - The card to reveal
+    @param card (int) - The card to reveal
 
     @return None
 
     @author Mike
     '''
     def revealCard(self, cardLabel, card):
-        pixmap = QPixmap(fr"_internal/palaceData/cards/{card[0].lower()}_of_{card[1].lower()}.png").scaled(CARD_WIDTH, CARD_HEIGHT, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        cardLabel.setPixmap(pixmap)
+        cardLabel.setPixmap(self.cardImages.pixmap(card))
 
     '''
     Displays the top card selection phase for the player.
@@ -482,11 +707,11 @@ class View(QWidget):
         card = self.controller.players[0].hand[cardIndex]
         if (card, cardIndex) in self.chosenCards:
             self.chosenCards.remove((card, cardIndex))
-            button.setStyleSheet("border: 0px solid black; background-color: transparent;")
+            self.setCardSelected(button, False)
         else:
             if len(self.chosenCards) < 3:
                 self.chosenCards.append((card, cardIndex))
-                button.setStyleSheet("border: 0px solid black; background-color: blue;")
+                self.setCardSelected(button, True)
         self.confirmButton.setEnabled(len(self.chosenCards) == 3)
 
     '''
@@ -501,10 +726,7 @@ class View(QWidget):
     '''
     def confirmTopCardSelection(self):
         player = self.controller.players[0]
-        for card, _ in self.chosenCards:
-            player.topCards.append((card[0], card[1], True, False))
-        for card, cardIndex in sorted(self.chosenCards, key=lambda x: x[1], reverse=True):
-            del player.hand[cardIndex]
+        self.controller.engine.selectTopCards(0, [card for card, _ in self.chosenCards])
         self.updateTopCardButtons(player.topCards)
         self.updatePlayerHand(player.hand)
         self.controller.proceedWithGameSetup()
@@ -515,10 +737,11 @@ class View(QWidget):
         self.deckLabel.setVisible(True)
         self.currentPlayerLabel.setVisible(True)
         self.pickUpPileButton.setVisible(True)
+        self.fastForwardButton.setVisible(True)
+        self.autoPlayButton.setVisible(True)
         self.currentPlayerLabel.setText("Current Player: ")
         self.pileLabel.setText("Pile: Empty")
-        self.pileLabel.setFixedSize(BUTTON_WIDTH, BUTTON_HEIGHT)
-        self.controller.startGameLoop()  
+        self.pileLabel.setFixedSize(*labelSize())
         for index, _ in enumerate(self.controller.players[1:], start=1):
             self.updateAIHand(self.controller.players[index].hand, index)
             if index == 1:
@@ -593,17 +816,5 @@ class View(QWidget):
     @author Mike
     '''
     def setPlayerHandEnabled(self, enabled):
-        for i in range(self.playerHandLayout.count()):
-            widget = self.playerHandLayout.itemAt(i).widget()
-            if widget:
-                widget.setEnabled(enabled)
-
-    # def getCardFront(cardSuit, cardRank, width=CARD_WIDTH, height=CARD_HEIGHT):
-    #     print(cardSuit)
-    #     print(cardRank)
-    #     return QPixmap(f"_internal/palaceData/cards/{cardSuit.lower()}_of_{cardRank.lower()}.png").scaled(
-    #         width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-
-    # def getCardBack(width=CARD_WIDTH, height=CARD_HEIGHT):
-    #     return QPixmap(r"_internal\palaceData\cards\back.png").scaled(
-    #         width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
\ No newline at end of file
+        for label in self.playerHandRow.visibleLabels():
+            label.setEnabled(enabled)
@@ -1,7 +1,17 @@
+import time
+STARTED = time.perf_counter()  # Taken before anything else is imported, for the startup report
+import hashlib
+import json
+import multiprocessing
 import sys
-from PySide6.QtWidgets import QApplication
-import qdarktheme
+from importlib import metadata
+from PySide6.QtWidgets import QApplication, QMessageBox
+from Assets import cachePath, registerBundle, verifyAssets
 from HomeScreen import HomeScreen
+IMPORTED = time.perf_counter()
+
+STYLESHEET_CACHE = cachePath("stylesheet.json")
+STARTUP_BUDGET_MS = 1000  # Time to the first frame of the home screen that --startup-timing warns above
 
 '''
 Dark Mode QMessageBox Button Styling
@@ -36,17 +46,15 @@ DarkNB = ("""
 """)
 
 # Dark Mode Styling
-Dark = qdarktheme.load_stylesheet(
-    theme="dark",
-    custom_colors={
-        "[dark]": {
-            "primary": "#0078D4",
-            "background": "#202124",
-            "border": "#8A8A8A",
-            "background>popup": "#252626",
-        }
-    },
-) + """
+darkColors = {
+    "[dark]": {
+        "primary": "#0078D4",
+        "background": "#202124",
+        "border": "#8A8A8A",
+        "background>popup": "#252626",
+    }
+}
+darkOverrides = """
     QMessageBox QLabel {
         color: #E4E7EB;
     }
@@ -79,28 +87,94 @@ Dark = qdarktheme.load_stylesheet(
     }
 """
 
+'''
+Gets the dark stylesheet. Generating it with qdarktheme takes a noticeable
+part of startup, so the result is cached on disk, keyed by the installed
+qdarktheme version, the custom colors and the overrides, and qdarktheme is
+only imported when the cache is missing or stale.
+
+@param stylesheetPath (str) - Where the generated stylesheet is kept
+
+@return (str) - The stylesheet to set on the application
+
+@author Mike
+'''
+def loadStylesheet(stylesheetPath=STYLESHEET_CACHE):
+    try:
+        version = metadata.version("pyqtdarktheme")
+    except metadata.PackageNotFoundError:
+        version = None
+    key = hashlib.sha256(json.dumps([version, darkColors, darkOverrides], sort_keys=True).encode()).hexdigest()
+    if version is not None:
+        try:
+            with open(stylesheetPath) as cacheFile:
+                cache = json.load(cacheFile)
+            if cache.get("key") == key:
+                return cache["stylesheet"]
+        except (OSError, ValueError):
+            pass
+
+    import qdarktheme
+    stylesheet = qdarktheme.load_stylesheet(theme="dark", custom_colors=darkColors) + darkOverrides
+    if version is not None:
+        try:
+            with open(stylesheetPath, "w") as cacheFile:
+                json.dump({"key": key, "stylesheet": stylesheet}, cacheFile)
+        except OSError:
+            pass  # Without a writable cache directory the stylesheet is generated every time
+    return stylesheet
+
+'''
+Prints how long each stage of startup took and the time to the first
+frame of the home screen, with a warning if it is over budget.
+
+@param stages (list) - The name, start and end perf_counter time of each stage
+
+@return None
+
+@author Mike
+'''
+def reportStartup(stages):
+    for name, start, end in stages:
+        print(f"{name:<22}{(end - start) * 1000:8.1f} ms")
+    totalMs = (stages[-1][2] - STARTED) * 1000
+    print(f"{'Time to first frame':<22}{totalMs:8.1f} ms")
+    if totalMs > STARTUP_BUDGET_MS:
+        print(f"Startup is over its {STARTUP_BUDGET_MS} ms budget")
+
 '''
 The main function initializes the application, sets up the home screen, 
-and starts the event loop.
+and starts the event loop. Pass --scene-view to draw games with the
+QGraphicsScene backend, --frame-stats to show frame times while cards
+move, and --startup-timing to report how long startup took.
 
 @return None
 
 @author Mike
 '''
 def main():
-    global scalingFactorWidth
-    global scalingFactorHeight
     app = QApplication(sys.argv)
-    app.setStyleSheet(Dark)
-    screen = app.primaryScreen()
-    screenSize = screen.size()
-    screenWidth = screenSize.width()
-    screenHeight = screenSize.height()
-    scalingFactorWidth = screenWidth / 1920
-    scalingFactorHeight = screenHeight / 1080
-    homeScreen = HomeScreen()
+    appCreated = time.perf_counter()
+    app.setStyleSheet(loadStylesheet())
+    styled = time.perf_counter()
+    registerBundle()
+    try:
+        verifyAssets()
+    except FileNotFoundError as error:
+        print(error)
+        QMessageBox.critical(None, "Palace", f"The game's files are incomplete, please reinstall.\n\n{error}")
+        sys.exit(1)
+    homeScreen = HomeScreen('scene' if '--scene-view' in sys.argv else 'widgets', '--frame-stats' in sys.argv)
+    if '--startup-timing' in sys.argv:
+        shown = time.perf_counter()
+        homeScreen.onFirstPaint = lambda: reportStartup([("Imports", STARTED, IMPORTED),
+                                                         ("QApplication", IMPORTED, appCreated),
+                                                         ("Stylesheet", appCreated, styled),
+                                                         ("Home screen", styled, shown),
+                                                         ("First paint", shown, time.perf_counter())])
     homeScreen.show()
     sys.exit(app.exec())
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # The impossible AI searches on a process pool, which needs this when frozen
     main()
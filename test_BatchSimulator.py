@@ -0,0 +1,13 @@
+import pytest
+from BatchSimulator import BatchSimulator, compareWithEngine
+
+@pytest.mark.parametrize("seats, seed", [
+    (['easy', 'medium'], 0),
+    (['medium', 'hard', 'easy'], 7),
+    (['impossible', 'medium'], 3),
+])
+def test_batch_matches_the_engine(seats, seed):
+    gameIndices = range(0, 24)
+    batch = BatchSimulator(seats, seed, gameIndices, rotate=True, maxTurns=3000)
+    batch.run()
+    assert compareWithEngine(batch, seats, seed, gameIndices, True, len(gameIndices)) == []
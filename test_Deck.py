@@ -0,0 +1,27 @@
+import random
+from Card import DECK_SIZE
+from Deck import Deck
+
+def test_draw_and_deal_follow_the_draw_order():
+    deck = Deck([4, 9, 17, 30, 51])
+    assert deck.draw() == 4
+    assert list(deck.deal(3)) == [9, 17, 30]
+    assert len(deck) == 1
+    assert list(deck.deal(3)) == [51]
+    assert len(deck) == 0
+
+def test_shuffle_keeps_only_the_cards_left_to_draw():
+    deck = Deck()
+    assert len(deck) == DECK_SIZE
+    dealt = list(deck.deal(10))
+    deck.shuffle(random.Random(3))
+    assert len(deck) == DECK_SIZE - 10
+    remaining = list(deck.deal(len(deck)))
+    assert sorted(remaining) == list(range(10, DECK_SIZE))
+    assert not set(dealt) & set(remaining)
+
+def test_same_seed_gives_the_same_order():
+    first, second = Deck(), Deck()
+    first.shuffle(random.Random(11))
+    second.shuffle(random.Random(11))
+    assert list(first.deal(DECK_SIZE)) == list(second.deal(DECK_SIZE))
@@ -0,0 +1,32 @@
+from array import array
+from Card import TWO, TEN, makeCard
+from EndgameSolver import EndgameSolver, PICK_UP
+from Pile import Pile
+
+FIVE = 3
+KING = 11
+ACE = 12
+
+def solve(hand, opponentHand, pileCards, bottomCards=(), opponentBottomCards=()):
+    solver = EndgameSolver(timeBudget=None, nodeBudget=200000)
+    pile = Pile()
+    for card in pileCards:
+        pile.append(card)
+    move = solver.chooseMove(array('B', hand), array('B'), array('B', bottomCards), array('B', opponentHand),
+                             array('B'), array('B', opponentBottomCards), pile, False)
+    return move, solver.lastValue
+
+def test_playing_the_last_card_wins():
+    move, value = solve([makeCard(ACE, 0)], [makeCard(FIVE, 0), makeCard(FIVE, 1)], [makeCard(KING, 0)])
+    assert move == (ACE, 1)
+    assert value == 1.0
+
+def test_stuck_against_a_last_two_loses():
+    move, value = solve([makeCard(FIVE, 0)], [makeCard(TWO, 0)], [makeCard(KING, 0)])
+    assert move == PICK_UP
+    assert value == 0.0
+
+def test_ten_then_the_last_card_wins():
+    move, value = solve([makeCard(TEN, 0), makeCard(FIVE, 0)], [makeCard(TWO, 0)], [makeCard(KING, 0)])
+    assert move == (TEN, 1)
+    assert value == 1.0
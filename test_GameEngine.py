@@ -0,0 +1,118 @@
+import random
+from AIPlayer import AIPlayer
+from Card import TWO, SEVEN, TEN, makeCard
+from Deck import Deck
+from GameEngine import GameEngine, PICK_UP
+from Player import Player, HAND, BOTTOM_CARDS
+
+THREE = 1
+FIVE = 3
+EIGHT = 6
+KING = 11
+
+def makeEngine(hands, bottoms=None, pile=(), deck=()):
+    players = []
+    for index, hand in enumerate(hands):
+        player = Player(f"P{index}")
+        player.dealCards(hand, bottoms[index] if bottoms else [makeCard(KING, index)])
+        players.append(player)
+    engine = GameEngine(players, seed=0)
+    engine.deck = Deck(deck)
+    for card in pile:
+        engine.pile.append(card)
+    return engine
+
+def test_ten_clears_the_pile_and_keeps_the_turn():
+    engine = makeEngine([[makeCard(TEN, 0), makeCard(THREE, 0)], [makeCard(FIVE, 0)]],
+                        pile=[makeCard(EIGHT, 0), makeCard(KING, 1)])
+    result = engine.apply([makeCard(TEN, 0)])
+    assert result.bombed and not result.fourOfAKind
+    assert list(result.clearedCards) == [makeCard(EIGHT, 0), makeCard(KING, 1), makeCard(TEN, 0)]
+    assert not engine.pile
+    assert not result.turnChanged
+    assert engine.currentPlayerIndex == 0
+    assert engine.bombCounts == [1, 0]
+
+def test_four_of_a_kind_bombs_across_plays():
+    engine = makeEngine([[makeCard(FIVE, 2), makeCard(FIVE, 3), makeCard(THREE, 0)], [makeCard(EIGHT, 0)]],
+                        pile=[makeCard(FIVE, 0), makeCard(FIVE, 1)])
+    result = engine.apply([makeCard(FIVE, 2), makeCard(FIVE, 3)])
+    assert result.fourOfAKind and result.bombed
+    assert not engine.pile
+    assert engine.currentPlayerIndex == 0
+
+def test_a_broken_run_does_not_bomb():
+    engine = makeEngine([[makeCard(FIVE, 2), makeCard(FIVE, 3), makeCard(THREE, 1)], [makeCard(EIGHT, 0)]],
+                        pile=[makeCard(FIVE, 0), makeCard(FIVE, 1), makeCard(THREE, 0)])
+    result = engine.apply([makeCard(FIVE, 2), makeCard(FIVE, 3)])
+    assert not result.fourOfAKind and not result.bombed
+    assert engine.pile.run == 2
+    assert engine.currentPlayerIndex == 1
+
+def test_seven_switches_the_next_player_for_one_turn():
+    engine = makeEngine([[makeCard(SEVEN, 0), makeCard(THREE, 0)], [makeCard(EIGHT, 0), makeCard(FIVE, 0)]])
+    result = engine.apply([makeCard(SEVEN, 0)])
+    assert result.turnChanged
+    assert engine.players[1].sevenSwitch
+    assert not engine.isCardPlayable(makeCard(EIGHT, 0))
+    assert engine.isCardPlayable(makeCard(FIVE, 0))
+    assert PICK_UP in engine.legalMoves()
+    assert [makeCard(EIGHT, 0)] not in engine.legalMoves()
+    engine.apply(PICK_UP)
+    assert not engine.players[1].sevenSwitch
+
+def test_two_resets_and_keeps_the_turn():
+    engine = makeEngine([[makeCard(TWO, 0), makeCard(THREE, 0)], [makeCard(FIVE, 0)]], pile=[makeCard(KING, 0)])
+    engine.players[0].sevenSwitch = True
+    result = engine.apply([makeCard(TWO, 0)])
+    assert not result.turnChanged and not result.bombed
+    assert not engine.players[0].sevenSwitch
+    assert engine.isCardPlayable(makeCard(THREE, 0))
+
+def test_failed_blind_flip_picks_up_the_pile():
+    bottom = makeCard(THREE, 0)
+    engine = makeEngine([[], [makeCard(FIVE, 0)]], bottoms=[[bottom, makeCard(FIVE, 1)], [makeCard(EIGHT, 1)]],
+                        pile=[makeCard(KING, 0)])
+    result = engine.apply([bottom])
+    assert result.blindFailed and result.pickedUp
+    assert sorted(engine.players[0].hand) == sorted([makeCard(KING, 0), bottom])
+    assert list(engine.players[0].bottomCards) == [makeCard(FIVE, 1)]
+    assert {(0, BOTTOM_CARDS), (0, HAND)} <= result.changedZones
+    assert engine.currentPlayerIndex == 1
+    assert engine.knownCards[0] == {makeCard(KING, 0), bottom}
+
+def test_successful_blind_flip_wins_with_the_last_card():
+    bottom = makeCard(KING, 2)
+    engine = makeEngine([[], [makeCard(FIVE, 0)]], bottoms=[[bottom], [makeCard(EIGHT, 1)]],
+                        pile=[makeCard(FIVE, 1)])
+    result = engine.apply([bottom])
+    assert not result.blindFailed
+    assert result.gameOver
+    assert engine.winner == 0
+
+def test_playing_draws_back_up_to_three():
+    engine = makeEngine([[makeCard(FIVE, 0), makeCard(EIGHT, 0), makeCard(KING, 0)], [makeCard(THREE, 0)]],
+                        deck=[makeCard(THREE, 1), makeCard(THREE, 2)])
+    result = engine.apply([makeCard(FIVE, 0)])
+    assert result.drawnCards == [makeCard(THREE, 1)]
+    assert len(engine.players[0].hand) == 3
+    assert len(engine.deck) == 1
+
+def test_snapshot_is_independent():
+    engine = makeEngine([[makeCard(FIVE, 0), makeCard(THREE, 0)], [makeCard(EIGHT, 0)]])
+    copy = engine.snapshot()
+    copy.apply([makeCard(FIVE, 0)])
+    assert list(engine.players[0].hand) == [makeCard(FIVE, 0), makeCard(THREE, 0)]
+    assert not engine.pile
+
+def test_snapshot_gives_each_ai_its_own_random_source_and_helpers():
+    players = [AIPlayer("AI0", 'impossible', rng=random.Random(1)), AIPlayer("AI1", 'medium', rng=random.Random(2))]
+    engine = GameEngine(players, seed=0)
+    engine.setupGame()
+    first, second = engine.snapshot(), engine.snapshot()
+    for live, copied, other in zip(engine.players, first.players, second.players):
+        assert copied.rng is not live.rng and copied.rng is not other.rng
+    assert first.players[0].solver is not players[0].solver
+    assert first.players[0].searcher is not players[0].searcher
+    assert first.players[0].searcher.rng is not players[0].searcher.rng
+    assert first.players[0].solver.table is players[0].solver.table
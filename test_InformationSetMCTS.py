@@ -0,0 +1,72 @@
+import random
+from Card import DECK_SIZE
+from InformationSetMCTS import (InformationSet, InformationSetMCTS, abstractMoves, concreteMove, determinize,
+                                shutdownExecutors, executors)
+from Simulator import createGame
+
+def startedGame(seed, turns=0):
+    engine, _ = createGame(['impossible', 'medium'], seed, 0, False)
+    for _ in range(turns):
+        engine.apply(engine.chooseAIMove())
+    return engine
+
+def test_information_set_hides_the_other_hands():
+    engine = startedGame(1, turns=6)
+    viewer = engine.currentPlayerIndex
+    infoSet = InformationSet(engine, viewer)
+    unseen = set(infoSet.unseen)
+    assert not unseen & set(engine.players[viewer].hand)
+    assert not unseen & set(engine.pile)
+    for index, player in enumerate(engine.players):
+        assert set(player.bottomCards) <= unseen
+        if index != viewer:
+            assert set(player.hand) - engine.knownCards[index] <= unseen
+
+def test_determinize_matches_the_visible_game():
+    engine = startedGame(2, turns=6)
+    infoSet = InformationSet(engine, engine.currentPlayerIndex)
+    deal = determinize(infoSet, random.Random(0))
+    assert deal.currentPlayerIndex == engine.currentPlayerIndex
+    assert list(deal.pile) == list(engine.pile)
+    assert len(deal.deck) == len(engine.deck)
+    cards = list(deal.deck.deal(len(deal.deck))) + list(deal.pile) + list(engine.discarded)
+    for real, dealt in zip(engine.players, deal.players):
+        assert len(dealt.hand) == len(real.hand)
+        assert len(dealt.bottomCards) == len(real.bottomCards)
+        assert list(dealt.topCards) == list(real.topCards)
+        cards += list(dealt.hand) + list(dealt.topCards) + list(dealt.bottomCards)
+    assert sorted(cards) == list(range(DECK_SIZE))
+
+def test_every_abstract_move_is_legal():
+    engine = startedGame(3, turns=4)
+    rng = random.Random(0)
+    legal = engine.legalMoves()
+    for move in abstractMoves(engine):
+        assert concreteMove(engine, move, rng) in legal
+
+def test_search_is_reproducible_and_legal():
+    engine = startedGame(4, turns=4)
+    moves = abstractMoves(engine)
+    first = InformationSetMCTS(budgetMs=None, workers=1, rollouts=60, seed=9)
+    second = InformationSetMCTS(budgetMs=None, workers=1, rollouts=60, seed=9)
+    move = first.chooseMove(engine)
+    assert move in moves
+    assert move == second.chooseMove(engine)
+    assert first.lastRollouts == (60 if len(moves) > 1 else 0)
+
+def test_disabled_search_chooses_nothing():
+    engine = startedGame(5)
+    assert InformationSetMCTS(rollouts=0).chooseMove(engine) is None
+    assert InformationSetMCTS(budgetMs=0).chooseMove(engine) is None
+
+def test_pooled_search_splits_the_rollouts():
+    engine = startedGame(6, turns=2)
+    while len(abstractMoves(engine)) == 1:
+        engine.apply(engine.chooseAIMove())
+    searcher = InformationSetMCTS(budgetMs=None, workers=2, rollouts=41, seed=1)
+    try:
+        assert searcher.chooseMove(engine) in abstractMoves(engine)
+        assert searcher.lastRollouts == 41
+    finally:
+        shutdownExecutors()
+    assert not executors
@@ -0,0 +1,120 @@
+import asyncio
+from GameEngine import PICK_UP
+from LobbyServer import LobbyServer, LobbyClient, DEFAULT_HOST, TOP_CARDS, PLAYING
+
+async def receiveType(client, kind):
+    while True:
+        message = await asyncio.wait_for(client.receive(), 5)
+        assert message is not None, f"Connection closed while waiting for {kind}"
+        if message["type"] == kind:
+            return message
+
+async def receivePlaying(client):
+    state = await receiveType(client, "state")
+    while state["phase"] != PLAYING:
+        state = await receiveType(client, "state")
+    return state
+
+async def playRoundTrip():
+    server = LobbyServer()
+    port = await server.start(DEFAULT_HOST, 0)
+    host, guest = LobbyClient(), LobbyClient()
+    try:
+        await host.connect(DEFAULT_HOST, port)
+        await host.host("Host", 2)
+        hosted = await receiveType(host, "hosted")
+        assert hosted["seat"] == 0
+
+        await guest.connect(DEFAULT_HOST, port)
+        await guest.join(hosted["table"], "Guest")
+        assert (await receiveType(guest, "joined"))["seat"] == 1
+        states = [await receiveType(host, "state"), await receiveType(guest, "state")]
+        assert all(state["phase"] == TOP_CARDS for state in states)
+        assert all(len(state["hand"]) == 6 for state in states)
+
+        await host.send({"type": "top", "cards": states[0]["hand"][:2]})
+        assert (await receiveType(host, "error"))["message"].startswith("Choose 3")
+
+        for client, state in zip((host, guest), states):
+            await client.send({"type": "top", "cards": state["hand"][:3]})
+        state = await receivePlaying(host)
+        assert state["current"] == 0
+        guestStart = await receivePlaying(guest)
+        assert "moves" not in guestStart
+
+        await guest.send({"type": "move", "move": PICK_UP})
+        assert (await receiveType(guest, "error"))["message"] == "That move is not allowed now"
+        await host.send({"type": "move", "move": [255]})
+        assert (await receiveType(host, "error"))["message"] == "That move is not allowed now"
+
+        move = state["moves"][-1]
+        await host.send({"type": "move", "move": move})
+        after = await receiveType(guest, "state")
+        assert after["handSizes"][0] + len(after["topCards"][0]) + after["deckSize"] < \
+            len(state["hand"]) + len(state["topCards"][0]) + state["deckSize"]
+        assert server.stats()["moves"] == 1
+    finally:
+        await host.close()
+        await guest.close()
+        await server.stop()
+
+def test_host_join_and_illegal_moves():
+    asyncio.run(playRoundTrip())
+
+async def startTable(server, port):
+    host, guest = LobbyClient(), LobbyClient()
+    await host.connect(DEFAULT_HOST, port)
+    await host.host("Host", 2)
+    hosted = await receiveType(host, "hosted")
+    await guest.connect(DEFAULT_HOST, port)
+    await guest.join(hosted["table"], "Guest")
+    await receiveType(guest, "joined")
+    states = [await receiveType(host, "state"), await receiveType(guest, "state")]
+    return host, guest, hosted["table"], states
+
+async def playMalformedMessages():
+    server = LobbyServer()
+    port = await server.start(DEFAULT_HOST, 0)
+    host, guest, _, states = await startTable(server, port)
+    try:
+        for cards in ([[1], [2], [3]], [True, False, True], [1.0, 2.0, 3.0]):
+            await host.send({"type": "top", "cards": cards})
+            assert (await receiveType(host, "error"))["message"].startswith("Choose 3")
+        for client, state in zip((host, guest), states):
+            await client.send({"type": "top", "cards": state["hand"][:3]})
+        state = await receivePlaying(host)
+        await receivePlaying(guest)
+        for move in ([[1]], [True], -1.0):
+            await host.send({"type": "move", "move": move})
+            assert (await receiveType(host, "error"))["message"] == "That move is not allowed now"
+        await host.send({"type": "move", "move": state["moves"][-1]})
+        assert (await receiveType(guest, "state"))["phase"] == PLAYING
+    finally:
+        await host.close()
+        await guest.close()
+        await server.stop()
+
+async def playJoinAfterFullTable():
+    server = LobbyServer()
+    port = await server.start(DEFAULT_HOST, 0)
+    host, guest, tableId, _ = await startTable(server, port)
+    late = LobbyClient()
+    try:
+        await late.connect(DEFAULT_HOST, port)
+        await late.join(tableId, "Late")
+        assert (await receiveType(late, "error"))["message"] == f"Table {tableId} is full"
+        await late.host("Late", 2)
+        hosted = await receiveType(late, "hosted")
+        assert hosted["table"] != tableId
+        assert hosted["seat"] == 0
+    finally:
+        await late.close()
+        await host.close()
+        await guest.close()
+        await server.stop()
+
+def test_malformed_cards_are_rejected_without_closing_the_table():
+    asyncio.run(playMalformedMessages())
+
+def test_a_full_table_does_not_keep_the_connection():
+    asyncio.run(playJoinAfterFullTable())
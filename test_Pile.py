@@ -0,0 +1,24 @@
+from Card import makeCard
+from Pile import Pile
+from Rules import EMPTY_PILE
+
+def test_run_counts_the_top_rank():
+    pile = Pile()
+    for card in (makeCard(3, 0), makeCard(5, 0), makeCard(5, 1), makeCard(5, 2)):
+        pile.append(card)
+    assert pile.topRank == 5
+    assert pile.run == 3
+    assert pile.cardsToBomb() == 1
+
+def test_take_hands_over_the_cards_and_empties_the_pile():
+    pile = Pile()
+    cards = [makeCard(3, 0), makeCard(5, 0), makeCard(5, 1)]
+    for card in cards:
+        pile.append(card)
+    taken = pile.take()
+    assert list(taken) == cards
+    assert not pile
+    assert pile.topRank == EMPTY_PILE
+    assert pile.run == 0
+    pile.append(makeCard(9, 0))
+    assert list(taken) == cards  # The taken buffer is not shared with the pile any more
@@ -0,0 +1,39 @@
+from Card import TWO, SEVEN, NUM_RANKS, makeCard
+from Pile import Pile
+from Player import Player, RankIndex
+
+FIVE = 3
+KING = 11
+
+def test_rank_index_counts_suits_and_masks_ranks():
+    index = RankIndex([makeCard(FIVE, 0), makeCard(FIVE, 3), makeCard(KING, 1)])
+    assert index.count(FIVE) == 2
+    assert index.count(KING) == 1
+    assert index.count(SEVEN) == 0
+    assert index.mask == 1 << FIVE | 1 << KING
+    assert index.cardsOfRank(FIVE) == [makeCard(FIVE, 0), makeCard(FIVE, 3)]
+
+def test_rank_index_drops_a_rank_with_its_last_suit():
+    index = RankIndex([makeCard(FIVE, 0), makeCard(FIVE, 1)])
+    index.remove(makeCard(FIVE, 0))
+    assert index.mask == 1 << FIVE
+    index.remove(makeCard(FIVE, 1))
+    assert index.mask == 0
+    assert index.lowestRank() == -1
+
+def test_lowest_rank_respects_the_mask():
+    index = RankIndex([makeCard(TWO, 0), makeCard(FIVE, 2), makeCard(KING, 0)])
+    assert index.lowestRank() == TWO
+    assert index.lowestRank(((1 << NUM_RANKS) - 1) & ~(1 << TWO)) == FIVE
+    assert index.lowestRank(1 << SEVEN) == -1
+
+def test_player_keeps_the_hand_index_in_sync():
+    player = Player("P0")
+    player.dealCards([makeCard(FIVE, 0), makeCard(KING, 0)], [makeCard(SEVEN, 0)])
+    pile = Pile()
+    player.playCard(makeCard(FIVE, 0), pile)
+    assert player.handRanks.count(FIVE) == 0
+    player.pickUpPile(pile)
+    assert player.handRanks.count(FIVE) == 1
+    assert sorted(player.hand) == sorted(card for rank in range(NUM_RANKS)
+                                         for card in player.handRanks.cardsOfRank(rank))
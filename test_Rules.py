@@ -0,0 +1,35 @@
+from Card import TWO, SEVEN, TEN, NUM_RANKS, makeCard
+from Rules import PLAYABLE, EMPTY_PILE, isCardPlayable
+
+EIGHT = 6
+NINE = 7
+KING = 11
+
+def test_two_and_ten_play_on_anything():
+    for sevenSwitch in (False, True):
+        for topRank in range(NUM_RANKS + 1):
+            assert PLAYABLE[sevenSwitch][topRank][TWO]
+            assert PLAYABLE[sevenSwitch][topRank][TEN]
+
+def test_seven_and_eight_follow_the_top_rank():
+    assert PLAYABLE[False][SEVEN][SEVEN]
+    assert PLAYABLE[False][SEVEN][EIGHT]
+    assert not PLAYABLE[False][EIGHT][SEVEN]
+    assert not PLAYABLE[False][NINE][EIGHT]
+    assert not PLAYABLE[False][KING][SEVEN]
+
+def test_seven_switch_allows_seven_or_lower():
+    assert PLAYABLE[True][KING][SEVEN]
+    assert PLAYABLE[True][SEVEN][SEVEN]
+    assert not PLAYABLE[True][SEVEN][EIGHT]
+    assert not PLAYABLE[True][EMPTY_PILE][EIGHT]
+
+def test_empty_pile_takes_any_card():
+    assert all(PLAYABLE[False][EMPTY_PILE])
+
+def test_isCardPlayable_reads_the_top_card():
+    pile = [makeCard(EIGHT, 0)]
+    assert isCardPlayable(makeCard(EIGHT, 1), pile, False)
+    assert not isCardPlayable(makeCard(SEVEN, 1), pile, False)
+    assert isCardPlayable(makeCard(SEVEN, 1), pile, True)
+    assert isCardPlayable(makeCard(TWO, 1), [], True)
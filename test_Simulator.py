@@ -0,0 +1,33 @@
+import pytest
+from Simulator import SimulationStats, simulate, playChunk, wilsonInterval, meanInterval, seatOrderFor, CHUNK_SIZE
+
+def test_wilson_interval_brackets_the_rate():
+    rate, low, high = wilsonInterval(30, 100)
+    assert rate == 0.3
+    assert low == pytest.approx(0.2189, abs=1e-4)
+    assert high == pytest.approx(0.3958, abs=1e-4)
+    assert wilsonInterval(0, 0) == (0.0, 0.0, 0.0)
+
+def test_mean_interval_of_constant_samples_has_no_width():
+    assert meanInterval(20, 80, 5) == (4.0, 0.0)
+
+def test_rotation_changes_the_first_seat():
+    assert seatOrderFor(0, 3, True) == [0, 1, 2]
+    assert seatOrderFor(4, 3, True) == [1, 2, 0]
+    assert seatOrderFor(4, 3, False) == [0, 1, 2]
+
+def test_results_do_not_depend_on_the_worker_count():
+    difficulties = ['easy', 'hard']
+    numGames = CHUNK_SIZE + 10
+    inProcess = simulate(difficulties, numGames, workers=1, seed=5, maxTurns=3000)
+    pooled = simulate(difficulties, numGames, workers=2, seed=5, maxTurns=3000)
+    assert vars(inProcess) == vars(pooled)
+    assert inProcess.games == numGames
+    assert sum(inProcess.wins) + inProcess.unfinished == numGames
+
+def test_merged_chunks_match_one_chunk():
+    difficulties = ['medium', 'easy', 'hard']
+    merged = SimulationStats(len(difficulties))
+    merged.merge(playChunk(difficulties, 2, 0, 6, True, 3000))
+    merged.merge(playChunk(difficulties, 2, 6, 12, True, 3000))
+    assert vars(merged) == vars(playChunk(difficulties, 2, 0, 12, True, 3000))